@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Feedback Analysis Cache for GestureBridge AI
+Reuses prior AI analyses for identical or near-identical feedback comments
+using exact keys plus MinHash/LSH fuzzy lookup
+"""
+
+import os
+import random
+import re
+import sys
+import threading
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from cache import TTLCache
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_NON_WORD = re.compile(r'[^a-z0-9 ]+')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_comment(comment: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    comment = _NON_WORD.sub(' ', (comment or '').lower())
+    return _SPACES.sub(' ', comment).strip()
+
+
+def rating_bucket(rating) -> str:
+    try:
+        rating = int(rating)
+    except (TypeError, ValueError):
+        return 'unknown'
+    if rating <= 2:
+        return 'low'
+    if rating == 3:
+        return 'mid'
+    return 'high'
+
+
+class MinHasher:
+    """MinHash signatures over character shingles"""
+
+    def __init__(self, num_perm: int = 32, shingle_size: int = 3, seed: int = 7):
+        rng = random.Random(seed)
+        self.shingle_size = shingle_size
+        self.params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def shingles(self, text: str) -> Set[int]:
+        padded = f" {text} "
+        if len(padded) <= self.shingle_size:
+            return {zlib.crc32(padded.encode())}
+        return {
+            zlib.crc32(padded[i:i + self.shingle_size].encode())
+            for i in range(len(padded) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        shingles = self.shingles(text)
+        return tuple(
+            min((a * s + b) % _MERSENNE_PRIME for s in shingles)
+            for a, b in self.params
+        )
+
+    @staticmethod
+    def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+        return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+class FeedbackAnalysisCache:
+    """Exact and fuzzy cache of feedback analyses keyed by comment, type and rating bucket"""
+
+    def __init__(self, maxsize: int = 5000, ttl: Optional[float] = 7 * 24 * 3600,
+                 threshold: float = 0.8, num_perm: int = 32, bands: int = 8):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm)
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl, on_evict=self._on_evict)
+        self._buckets: Dict[Tuple, Set[Tuple]] = {}
+        self._signatures: Dict[Tuple, Tuple[int, ...]] = {}
+        self._lock = threading.RLock()
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(feedback: Dict) -> Tuple[str, str, str]:
+        return (
+            normalize_comment(feedback.get('comment', '')),
+            feedback.get('type') or 'general',
+            rating_bucket(feedback.get('rating'))
+        )
+
+    def _band_keys(self, key: Tuple, signature: Tuple[int, ...]) -> List[Tuple]:
+        # Only compare entries with the same feedback type and rating bucket
+        return [
+            (key[1], key[2], band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def _on_evict(self, key: Tuple, value) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_key in self._band_keys(key, signature):
+            members = self._buckets.get(band_key)
+            if members:
+                members.discard(key)
+                if not members:
+                    del self._buckets[band_key]
+
+    def get(self, feedback: Dict) -> Optional[Dict]:
+        """Return a cached analysis for this feedback, or None"""
+        key = self.make_key(feedback)
+        if not key[0]:
+            return None
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self.exact_hits += 1
+                return analysis
+
+            signature = self.hasher.signature(key[0])
+            best_key, best_score = None, self.threshold
+            candidates = set()
+            for band_key in self._band_keys(key, signature):
+                candidates.update(self._buckets.get(band_key, ()))
+            for candidate in candidates:
+                score = MinHasher.similarity(signature, self._signatures[candidate])
+                if score >= best_score:
+                    best_key, best_score = candidate, score
+
+            if best_key is not None:
+                analysis = self._entries.get(best_key)
+                if analysis is not None:
+                    self.fuzzy_hits += 1
+                    return analysis
+
+            self.misses += 1
+            return None
+
+    def put(self, feedback: Dict, analysis: Dict) -> None:
+        key = self.make_key(feedback)
+        if not key[0]:
+            return
+        with self._lock:
+            self._entries.set(key, analysis)
+            if key not in self._signatures:
+                signature = self.hasher.signature(key[0])
+                self._signatures[key] = signature
+                for band_key in self._band_keys(key, signature):
+                    self._buckets.setdefault(band_key, set()).add(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.exact_hits = self.fuzzy_hits = self.misses = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.exact_hits + self.fuzzy_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'exact_hits': self.exact_hits,
+                'fuzzy_hits': self.fuzzy_hits,
+                'misses': self.misses,
+                'evictions': self._entries.evictions,
+                'hit_rate': round((self.exact_hits + self.fuzzy_hits) / lookups, 4) if lookups else 0.0
+            }
+
+
+# Global instance
+feedback_analysis_cache = FeedbackAnalysisCache()
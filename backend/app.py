@@ -10,11 +10,15 @@ from flask_jwt_extended import JWTManager
 
 from config import Config
 from database import db
-from routes.auth import auth_bp
+from feedback_analysis import start_feedback_analysis_worker
+from stats_engine import stats_engine
+from routes.auth import auth_bp, add_role_claims
 from routes.streaming import streaming_bp
 from routes.feedback import feedback_bp
 from routes.run_gui import gui_bp
 from routes.chat import chat_bp
+from routes.monitoring import monitoring_bp
+from routes.suggestions import suggestions_bp
 
 # ✅ Create Flask app before using @app.route
 app = Flask(__name__, static_folder='../frontend', static_url_path='/')
@@ -22,17 +26,26 @@ app.config.from_object(Config)
 
 # ✅ Setup extensions
 jwt = JWTManager(app)
+jwt.additional_claims_loader(add_role_claims)
 CORS(app)
 
 # ✅ Connect to MongoDB
 db.connect()
 
+# ✅ Analyze submitted feedback in the background
+start_feedback_analysis_worker(db)
+
+# ✅ Periodically reconcile incremental statistics counters
+stats_engine.start_reconciliation(Config.STATS_RECONCILE_INTERVAL)
+
 # ✅ Register routes
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(streaming_bp, url_prefix='/api/streaming')
 app.register_blueprint(feedback_bp, url_prefix='/api/feedback')
 app.register_blueprint(gui_bp, url_prefix='/api/gui')
 app.register_blueprint(chat_bp, url_prefix='/api/chat')
+app.register_blueprint(monitoring_bp, url_prefix='/api/monitoring')
+app.register_blueprint(suggestions_bp, url_prefix='/api/suggestions')
 
 # ✅ Home route serving frontend index.html
 @app.route('/')
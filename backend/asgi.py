@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+ASGI entry point for GestureBridge AI
+Serves the high-fan-out routes (streaming, history, analytics) with async
+handlers on motor, so one process can hold many concurrent sessions without
+a thread per request. Streamed chat answers are relayed from a worker thread
+so a client disconnect stops the LLM stream. Every other endpoint is served by the Flask app,
+mounted through a WSGI adapter, and frame recognition runs in an executor.
+
+Usage:
+    uvicorn asgi:app --app-dir backend --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import contextlib
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from asgiref.wsgi import WsgiToAsgi
+from bson import ObjectId
+from bson.errors import InvalidId
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import PyJWTError
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse as StarletteJSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.http import http_date
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from async_database import async_db
+from config import Config
+from pagination import InvalidCursor, parse_per_page
+from routes.chat import STREAM_HEADERS, chatbot_events, open_chatbot_stream
+from stats_engine import AsyncStatisticsEngine
+
+logger = logging.getLogger(__name__)
+
+async_stats_engine = AsyncStatisticsEngine(async_db)
+
+# Created in lifespan; None falls back to the loop's default thread pool
+recognition_executor = None
+chat_stream_executor = None
+
+
+def create_recognition_executor():
+    """Executor for CPU-bound frame decoding and recognition"""
+    workers = Config.RECOGNITION_WORKERS or os.cpu_count() or 1
+    if Config.RECOGNITION_EXECUTOR == 'process':
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='recognition')
+
+
+def create_chat_stream_executor():
+    """One thread per streamed chat answer; the LLM gateway bounds concurrent streams anyway"""
+    return ThreadPoolExecutor(max_workers=Config.LLM_MAX_CONCURRENCY * 2, thread_name_prefix='chat-stream')
+
+
+class FlaskApp:
+    """WSGI callable that imports the Flask app (and its sync database) on load()"""
+
+    def __init__(self):
+        self.app = None
+
+    def load(self):
+        if self.app is None:
+            from app import app as flask_app
+            self.app = flask_app
+        return self.app
+
+    def __call__(self, environ, start_response):
+        return self.load()(environ, start_response)
+
+
+flask_app = FlaskApp()
+
+
+def _json_default(value):
+    # Serialize like Flask's jsonify so both servers return identical payloads
+    if isinstance(value, datetime):
+        return http_date(value)
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JSONResponse(StarletteJSONResponse):
+    def render(self, content) -> bytes:
+        return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def jwt_identity(request: Request):
+    """Identity of a Flask-JWT-Extended access token in the Authorization header
+
+    Decoded by flask_jwt_extended in the Flask app's context, so the JWT_*
+    settings (algorithm, identity claim, audience, leeway) match the Flask routes.
+    """
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        return None
+    app = flask_app.load()
+    with app.app_context():
+        try:
+            claims = decode_token(header[len('Bearer '):])
+        except (PyJWTError, JWTExtendedException):
+            return None
+    if claims.get('type', 'access') != 'access':
+        return None
+    return claims.get(app.config['JWT_IDENTITY_CLAIM'])
+
+
+def jwt_required(handler):
+    """Async counterpart of flask_jwt_extended.jwt_required; passes user_id to the handler"""
+    @functools.wraps(handler)
+    async def wrapper(request: Request):
+        user_id = jwt_identity(request)
+        if not user_id:
+            return JSONResponse({'msg': 'Missing or invalid Authorization header'}, status_code=401)
+        try:
+            return await handler(request, user_id)
+        except (InvalidCursor, InvalidId) as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+        except Exception as e:
+            logger.error(f"Error in {handler.__name__}: {str(e)}")
+            return JSONResponse({'error': str(e)}, status_code=500)
+    return wrapper
+
+
+async def json_body(request: Request):
+    try:
+        return await request.json()
+    except ValueError:
+        return {}
+
+
+# Streaming
+
+@jwt_required
+async def start_streaming(request: Request, user_id):
+    """Start a new streaming session"""
+    data = await json_body(request)
+    language = data.get('language', 'ASL')
+    quality = data.get('quality', 'medium')
+
+    session_data = {
+        'session_id': f"stream_{user_id}_{datetime.now().timestamp()}",
+        'language': language,
+        'quality': quality,
+        'device_type': data.get('device_type'),
+        'browser': request.headers.get('User-Agent'),
+        'ip_address': request.client.host if request.client else None
+    }
+
+    await async_db.get_model('streaming_sessions').create_session(user_id, session_data)
+    await async_stats_engine.record_session(user_id, language)
+    await async_db.get_model('analytics').log_event(user_id, {
+        'event_type': 'streaming',
+        'event_name': 'session_start',
+        'properties': {
+            'session_id': session_data['session_id'],
+            'language': language,
+            'quality': quality
+        }
+    })
+
+    return JSONResponse({
+        'success': True,
+        'session_id': session_data['session_id'],
+        'language': language,
+        'quality': quality,
+        'message': 'Streaming session started successfully'
+    })
+
+
+@jwt_required
+async def process_frame(request: Request, user_id):
+    """Process a single video frame for sign language recognition"""
+    from routes.streaming import recognize_frame
+
+    data = await json_body(request)
+    session_id = data.get('session_id')
+
+    streaming_model = async_db.get_model('streaming_sessions')
+    session = await streaming_model.get_session(session_id, streaming_model.FRAME_FIELDS)
+
+    if not session or str(session['user_id']) != user_id:
+        return JSONResponse({'error': 'Invalid session ID or unauthorized'}, status_code=400)
+
+    if session['status'] != 'active':
+        return JSONResponse({'error': 'Session is not active'}, status_code=400)
+
+    # Frame decoding and recognition are CPU-bound, keep them off the event loop
+    loop = asyncio.get_running_loop()
+    translation_result = await loop.run_in_executor(
+        recognition_executor, recognize_frame, data.get('frame'), session['language']
+    )
+    refined = translation_result.get('refined_translation', translation_result['translation'])
+
+    await streaming_model.record_frame(session_id, user_id, {
+        'text': translation_result['translation'],
+        'refined_text': refined,
+        'confidence': translation_result['confidence'],
+        'timestamp': data.get('timestamp')
+    })
+    await async_stats_engine.record_translation(user_id, session['language'], translation_result['confidence'])
+    await async_db.get_model('analytics').log_event(user_id, {
+        'event_type': 'streaming',
+        'event_name': 'frame_processed',
+        'properties': {
+            'session_id': session_id,
+            'confidence': translation_result['confidence'],
+            'language': session['language']
+        }
+    })
+
+    return JSONResponse({
+        'success': True,
+        'translation': translation_result['translation'],
+        'refined_translation': refined,
+        'confidence': translation_result['confidence'],
+        'language': session['language'],
+        'frame_count': session['statistics']['total_frames'] + 1
+    })
+
+
+@jwt_required
+async def stop_streaming(request: Request, user_id):
+    """Stop a streaming session"""
+    from routes.streaming import summarize_session
+
+    session_id = request.path_params['session_id']
+    streaming_model = async_db.get_model('streaming_sessions')
+    session = await streaming_model.get_session(session_id, streaming_model.STOP_FIELDS)
+
+    if not session:
+        return JSONResponse({'error': 'Invalid session ID'}, status_code=400)
+    if str(session['user_id']) != user_id:
+        return JSONResponse({'error': 'Unauthorized'}, status_code=403)
+    if session['status'] != 'active':
+        return JSONResponse({'error': 'Session is already stopped'}, status_code=400)
+
+    final_stats = summarize_session(session)
+    await streaming_model.end_session(session_id, final_stats)
+    await async_db.get_model('analytics').log_event(user_id, {
+        'event_type': 'streaming',
+        'event_name': 'session_end',
+        'properties': {
+            'session_id': session_id,
+            'duration': final_stats['duration_seconds'],
+            'total_frames': final_stats['total_frames'],
+            'total_translations': final_stats['total_translations'],
+            'average_confidence': final_stats['average_confidence']
+        }
+    })
+
+    return JSONResponse({'success': True, 'session_summary': final_stats})
+
+
+@jwt_required
+async def get_user_sessions(request: Request, user_id):
+    """Get streaming sessions for the current user"""
+    params = request.query_params
+    cursor = params.get('cursor')
+    status = params.get('status', 'active')
+
+    result = await async_db.get_model('streaming_sessions').get_user_sessions(
+        user_id, status, cursor, parse_per_page(params.get('per_page')),
+        params.get('include_total', 'false').lower() == 'true'
+    )
+    await async_db.get_model('analytics').log_event(user_id, {
+        'event_type': 'streaming',
+        'event_name': 'view_sessions',
+        'properties': {
+            'status': status,
+            'has_cursor': bool(cursor),
+            'returned_sessions': len(result['sessions'])
+        }
+    })
+
+    return JSONResponse({'success': True, **result})
+
+
+@jwt_required
+async def get_session_translations(request: Request, user_id):
+    """Get translations recorded during a streaming session"""
+    session_id = request.path_params['session_id']
+    streaming_model = async_db.get_model('streaming_sessions')
+    session = await streaming_model.get_session(session_id, streaming_model.OWNER_FIELDS)
+
+    if not session:
+        return JSONResponse({'error': 'Invalid session ID'}, status_code=400)
+    if str(session['user_id']) != user_id:
+        return JSONResponse({'error': 'Unauthorized'}, status_code=403)
+
+    result = await streaming_model.get_session_translations(
+        session_id, request.query_params.get('cursor'),
+        parse_per_page(request.query_params.get('per_page'), default=50)
+    )
+    return JSONResponse({'success': True, 'session_id': session_id, **result})
+
+
+# History
+
+@jwt_required
+async def get_history(request: Request, user_id):
+    """Get the current user's translation history"""
+    params = request.query_params
+    include_total = params.get('include_total', 'false').lower() == 'true'
+    result = await async_db.get_model('translations').get_user_translations(
+        user_id, params.get('cursor'), parse_per_page(params.get('per_page')), include_total
+    )
+
+    history = {
+        'history': result['translations'],
+        'next_cursor': result['next_cursor'],
+        'has_more': result['has_more'],
+        'per_page': result['per_page']
+    }
+    if include_total:
+        history['total'] = result['total']
+    return JSONResponse(history)
+
+
+@jwt_required
+async def get_translation_detail(request: Request, user_id):
+    """Get one translation from the current user's history"""
+    translation = await async_db.get_model('translations').get_translation(
+        request.path_params['translation_id'], user_id
+    )
+    if not translation:
+        return JSONResponse({'error': 'Translation not found'}, status_code=404)
+    return JSONResponse(translation)
+
+
+# Analytics
+
+@jwt_required
+async def get_analytics_rollups(request: Request, user_id):
+    """Get per-minute analytics event counts for dashboards"""
+    try:
+        minutes = min(int(request.query_params.get('minutes', 60)), 7 * 24 * 60)
+    except ValueError:
+        return JSONResponse({'error': 'minutes must be an integer'}, status_code=400)
+    end = datetime.utcnow()
+    rollups = await async_db.get_model('analytics').get_rollups(
+        end - timedelta(minutes=minutes), end, request.query_params.get('event_type')
+    )
+    return JSONResponse({'success': True, 'rollups': rollups})
+
+
+# Chat
+
+async def stream_chat(request: Request):
+    """Stream a chatbot answer as Server-Sent Events, like the Flask /api/chat/stream
+
+    The blocking LLM stream is read in a worker thread that hands events to
+    the response through a queue. When the client disconnects, Starlette
+    cancels the response and the worker stops at the next chunk, closing
+    the LLM stream from the thread that reads it. A disconnect during the
+    first-token wait is only seen once open_chatbot_stream returns, and the
+    stream is closed straight away.
+    """
+    if not jwt_identity(request):
+        return JSONResponse({'msg': 'Missing or invalid Authorization header'}, status_code=401)
+    data = await json_body(request)
+    message = (data.get('message') or '').strip()
+    if not message:
+        return JSONResponse({'error': 'Message cannot be empty'}, status_code=400)
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    disconnected = threading.Event()
+
+    def relay():
+        chunks = open_chatbot_stream(message)
+        # The client may have hung up while the first token was awaited
+        if disconnected.is_set():
+            getattr(chunks, 'close', lambda: None)()
+            return
+        events = chatbot_events(message, chunks)
+        try:
+            for event in events:
+                if disconnected.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+        finally:
+            events.close()
+
+    def relayed(future):
+        # Runs on the loop once the worker is done: end the response even if it failed
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Error relaying chat stream: {future.exception()}")
+        queue.put_nowait(None)
+
+    async def body():
+        try:
+            loop.run_in_executor(chat_stream_executor, relay).add_done_callback(relayed)
+            while (event := await queue.get()) is not None:
+                yield event
+        finally:
+            disconnected.set()
+
+    return StreamingResponse(body(), media_type='text/event-stream', headers=STREAM_HEADERS)
+
+
+routes = [
+    Route('/api/streaming/start', start_streaming, methods=['POST']),
+    Route('/api/streaming/process_frame', process_frame, methods=['POST']),
+    Route('/api/streaming/stop/{session_id}', stop_streaming, methods=['POST']),
+    Route('/api/streaming/sessions', get_user_sessions, methods=['GET']),
+    Route('/api/streaming/sessions/{session_id}/translations', get_session_translations, methods=['GET']),
+    Route('/api/inference/history', get_history, methods=['GET']),
+    Route('/api/inference/history/{translation_id}', get_translation_detail, methods=['GET']),
+    Route('/api/feedback/analytics', get_analytics_rollups, methods=['GET']),
+    Route('/api/chat/stream', stream_chat, methods=['POST']),
+    # Everything else (auth, feedback, chat, gui, frontend) is served by Flask
+    Mount('/', app=WsgiToAsgi(flask_app)),
+]
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    global recognition_executor, chat_stream_executor
+    await async_db.connect()
+    flask_app.load()
+    recognition_executor = create_recognition_executor()
+    chat_stream_executor = create_chat_stream_executor()
+    yield
+    recognition_executor.shutdown(wait=False)
+    chat_stream_executor.shutdown(wait=False)
+    await async_db.get_model('analytics').flush_rollups()
+    await async_db.get_model('user_lexicons').flush_words()
+    async_db.close()
+
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host=Config.HOST, port=Config.PORT)
@@ -0,0 +1,84 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+import sys
+import os
+import logging
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config import Config
+from database import client_options, read_preference
+from monitoring import async_pool_metrics
+
+logger = logging.getLogger(__name__)
+
+class AsyncDatabase:
+    """motor counterpart of Database for the ASGI routes
+
+    Must be connected from inside the running event loop (e.g. an ASGI
+    startup handler) because motor binds the client to that loop.
+    """
+
+    def __init__(self):
+        self.client = None
+        self.db = None
+        self.models = {}
+
+    async def connect(self):
+        """Establish connection to MongoDB"""
+        try:
+            self.client = AsyncIOMotorClient(Config.MONGO_URI, event_listeners=[async_pool_metrics], **client_options())
+            # Test the connection
+            await self.client.server_info()
+            self.db = self.client.get_default_database()
+
+            # Initialize models
+            self._initialize_models()
+
+            logger.info("Successfully connected to MongoDB (async)!")
+            return True
+        except Exception as e:
+            logger.error(f"Unexpected error while connecting to MongoDB (async): {str(e)}")
+            raise
+
+    def _initialize_models(self):
+        """Initialize async database models"""
+        from async_models import (
+            AsyncUserModel, AsyncTranslationModel, AsyncFeedbackModel,
+            AsyncStreamingSessionModel, AsyncAnalyticsModel, AsyncLanguageModel, AsyncUserLexiconModel
+        )
+
+        self.models['users'] = AsyncUserModel(self)
+        self.models['translations'] = AsyncTranslationModel(self)
+        self.models['feedback'] = AsyncFeedbackModel(self)
+        self.models['streaming_sessions'] = AsyncStreamingSessionModel(self)
+        self.models['analytics'] = AsyncAnalyticsModel(self)
+        self.models['languages'] = AsyncLanguageModel(self)
+        self.models['user_lexicons'] = AsyncUserLexiconModel(self)
+
+    def get_model(self, model_name):
+        """Get a database model"""
+        if model_name not in self.models:
+            raise ValueError(f"Model '{model_name}' not found")
+        return self.models[model_name]
+
+    def close(self):
+        """Close the MongoDB connection"""
+        if self.client:
+            self.client.close()
+            logger.info("MongoDB connection closed successfully (async)")
+
+    def get_collection(self, collection_name, analytics=False, primary=False):
+        """Get a MongoDB collection (see Database.get_collection)"""
+        if self.db is None:
+            raise ConnectionError("Database connection not established")
+        if primary:
+            return self.db.get_collection(collection_name, read_preference=read_preference('primary'))
+        if analytics:
+            return self.db.get_collection(
+                collection_name, read_preference=read_preference(Config.MONGO_ANALYTICS_READ_PREFERENCE)
+            )
+        return self.db[collection_name]
+
+# Global async database instance
+async_db = AsyncDatabase()
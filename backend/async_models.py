@@ -0,0 +1,276 @@
+"""
+Async Models for GestureBridge AI
+motor versions of the I/O methods used by the ASGI routes. Document
+builders, projections and index declarations are inherited from models.py,
+but each model sets up only the motor collections it reads and writes: the
+batched writer threads and caches of the sync models are not created.
+Methods not overridden here are synchronous-only and must not be called on
+these models.
+"""
+
+import logging
+import threading
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+
+from models import (
+    BaseModel, UserModel, TranslationModel, FeedbackModel, StreamingSessionModel,
+    AnalyticsModel, LanguageModel, UserLexiconModel, summarize_statistics
+)
+from pagination import keyset_page_async, cached_total_async
+
+logger = logging.getLogger(__name__)
+
+async def count_words(db, user_id, text):
+    """Count a committed translation's words towards the user's personal suggestions"""
+    if user_id and isinstance(text, str) and 'user_lexicons' in db.models:
+        await db.get_model('user_lexicons').record_text(user_id, text)
+
+class AsyncUserModel(UserModel):
+    """Async user model"""
+
+    def __init__(self, db):
+        BaseModel.__init__(self, db)
+        self.collection = db.get_collection('users')
+
+    async def get_user_by_id(self, user_id, projection=None):
+        user = await self.collection.find_one({'_id': ObjectId(user_id)}, projection)
+        return self.to_dict(user)
+
+    async def get_user_by_email(self, email, projection=None):
+        user = await self.collection.find_one({'email': email}, projection)
+        return self.to_dict(user)
+
+    async def increment_statistics(self, user_id, increments):
+        result = await self.collection.update_one(
+            {'_id': ObjectId(user_id)},
+            {'$inc': {f'statistics.{key}': value for key, value in increments.items()}}
+        )
+        return result.modified_count > 0
+
+    async def get_statistics(self, user_id):
+        user = await self.collection.find_one({'_id': ObjectId(user_id)}, {'statistics': 1})
+        if not user:
+            return None
+        return summarize_statistics(user.get('statistics', {}))
+
+class AsyncTranslationModel(TranslationModel):
+    """Async translation model"""
+
+    def __init__(self, db):
+        BaseModel.__init__(self, db)
+        self.collection = db.get_collection('translations')
+
+    async def create_translation(self, user_id, translation_data):
+        record = self._build_translation(user_id, translation_data)
+        result = await self.collection.insert_one(record)
+        await self._count_translation(record)
+        await count_words(self.db, user_id, record.get('output_data') or record.get('input_text'))
+        return result.inserted_id
+
+    async def _count_translation(self, record):
+        """$inc the statistics counters of the translation's user and language"""
+        if 'users' not in self.db.models:
+            return
+        confidence = float(record.get('confidence') or 0.0)
+        increments = {'total_translations': 1, 'confidence_sum': confidence}
+        try:
+            if record.get('user_id'):
+                await self.db.get_model('users').increment_statistics(record['user_id'], increments)
+            if record.get('language'):
+                await self.db.get_model('languages').increment_statistics(record['language'], increments)
+        except Exception as e:
+            logger.error(f"Error recording translation statistics: {str(e)}")
+
+    async def get_translation(self, translation_id, user_id, projection=None):
+        """Get one of the user's translations by ID"""
+        translation = await self.collection.find_one(
+            {'_id': ObjectId(translation_id), 'user_id': ObjectId(user_id)}, projection
+        )
+        return self.to_dict(translation)
+
+    async def get_user_translations(self, user_id, cursor=None, per_page=10, include_total=False, projection=None):
+        query = {'user_id': ObjectId(user_id)}
+        page = await keyset_page_async(self.collection, query, cursor, per_page, projection)
+
+        result = {
+            'translations': [self.to_dict(t) for t in page['items']],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'per_page': per_page
+        }
+        if include_total:
+            result['total'] = await cached_total_async(self.collection, query)
+        return result
+
+class AsyncFeedbackModel(FeedbackModel):
+    """Async feedback model"""
+
+    def __init__(self, db):
+        BaseModel.__init__(self, db)
+        self.collection = db.get_collection('feedback')
+
+    async def create_feedback(self, user_id, feedback_data):
+        result = await self.collection.insert_one(self._build_feedback(user_id, feedback_data))
+        return result.inserted_id
+
+    async def get_feedback_by_id(self, feedback_id, projection=None):
+        feedback = await self.collection.find_one({'_id': ObjectId(feedback_id)}, projection)
+        return self.to_dict(feedback)
+
+    async def get_user_feedback(self, user_id, cursor=None, per_page=10, include_total=False, projection=None):
+        query = {'user_id': ObjectId(user_id)}
+        page = await keyset_page_async(self.collection, query, cursor, per_page, projection)
+
+        result = {
+            'feedback': [self.to_dict(f) for f in page['items']],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'per_page': per_page
+        }
+        if include_total:
+            result['total'] = await cached_total_async(self.collection, query)
+        return result
+
+class AsyncStreamingSessionModel(StreamingSessionModel):
+    """Async streaming session model"""
+
+    def __init__(self, db):
+        BaseModel.__init__(self, db)
+        self.collection = db.get_collection('streaming_sessions')
+        self.translations_collection = db.get_collection('session_translations')
+
+    async def create_session(self, user_id, session_data):
+        result = await self.collection.insert_one(self._build_session(user_id, session_data))
+        return result.inserted_id
+
+    async def get_session(self, session_id, projection=None):
+        return await self.collection.find_one({'session_id': session_id}, projection)
+
+    async def record_frame(self, session_id, user_id, translation):
+        await self.translations_collection.insert_one(self._build_frame(session_id, user_id, translation))
+        previous = await self.collection.find_one_and_update(
+            {'session_id': session_id}, self._frame_update(translation),
+            projection={'last_text': 1}, return_document=ReturnDocument.BEFORE
+        )
+        await count_words(self.db, user_id, self._committed_text(previous, translation))
+        return previous is not None
+
+    async def get_session_translations(self, session_id, cursor=None, per_page=50):
+        page = await keyset_page_async(self.translations_collection, {'session_id': session_id}, cursor, per_page)
+        return {
+            'translations': [self.to_dict(t) for t in page['items']],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'per_page': per_page
+        }
+
+    async def get_user_sessions(self, user_id, status='active', cursor=None, per_page=10, include_total=False):
+        query = self._sessions_query(user_id, status)
+        page = await keyset_page_async(self.collection, query, cursor, per_page, projection={'translations': 0})
+
+        result = {
+            'sessions': [self.to_dict(session) for session in page['items']],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'per_page': per_page
+        }
+        if include_total:
+            result['total'] = await cached_total_async(self.collection, query)
+        return result
+
+    async def end_session(self, session_id, final_stats):
+        previous = await self.collection.find_one_and_update(
+            {'session_id': session_id},
+            {'$set': self._end_session_update(final_stats)},
+            projection={'user_id': 1, 'last_text': 1}, return_document=ReturnDocument.BEFORE
+        )
+        if previous:
+            await count_words(self.db, previous['user_id'], previous.get('last_text'))
+        return previous is not None
+
+class AsyncAnalyticsModel(AnalyticsModel):
+    """Async analytics model"""
+
+    def __init__(self, db):
+        BaseModel.__init__(self, db)
+        self.collection = db.get_collection('analytics')
+        self.rollups = db.get_collection('analytics_rollups')
+        # Dashboard reads may be served by secondaries
+        self.rollups_reader = db.get_collection('analytics_rollups', analytics=True)
+        # Buffered from the event loop only, the lock is never contended
+        self._rollup_buffer = {}
+        self._rollup_lock = threading.Lock()
+        self._last_flush = datetime.utcnow()
+
+    async def log_event(self, user_id, event_data):
+        event = self._build_event(user_id, event_data)
+        result = await self.collection.insert_one(event)
+        if self._count_rollup(event):
+            await self.flush_rollups()
+        return result.inserted_id
+
+    async def flush_rollups(self):
+        operations = self._drain_rollups()
+        if operations:
+            await self.rollups.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    async def get_rollups(self, start, end, event_type=None):
+        await self.flush_rollups()
+        cursor = self.rollups_reader.find(self._rollups_query(start, end, event_type), {'_id': 0}).sort('minute', ASCENDING)
+        return [
+            {**r, 'minute': r['minute'].isoformat()}
+            async for r in cursor
+        ]
+
+class AsyncLanguageModel(LanguageModel):
+    """Async language model"""
+
+    def __init__(self, db):
+        BaseModel.__init__(self, db)
+        self.collection = db.get_collection('languages')
+
+    async def get_supported_languages(self):
+        languages = await self.collection.find({'is_active': True}).to_list(None)
+        return [self.to_dict(lang) for lang in languages]
+
+    async def increment_statistics(self, code, increments):
+        result = await self.collection.update_one(
+            {'code': code},
+            {'$inc': increments}
+        )
+        return result.modified_count > 0
+
+class AsyncUserLexiconModel(UserLexiconModel):
+    """Async user lexicon model
+
+    Only counts words; the UserLexicon overlays served to the suggestion
+    routes are loaded by the sync model from the flushed counts.
+    """
+
+    def __init__(self, db):
+        BaseModel.__init__(self, db)
+        self.collection = db.get_collection('user_words')
+        self._buffer = {}
+        self._lock = threading.Lock()
+        self._last_flush = datetime.utcnow()
+
+    async def record_text(self, user_id, text):
+        words, due = self._buffer_words(str(user_id), text)
+        if due:
+            await self.flush_words()
+        return len(words)
+
+    async def flush_words(self):
+        counts, operations = self._drain_words()
+        if not operations:
+            return 0
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            self._restore_words(counts, e)
+            return 0
+        return len(operations)
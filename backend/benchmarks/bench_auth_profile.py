@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Profile Benchmark for GestureBridge AI
+Measures p50/p99 latency of GET /api/auth/profile with the user cache
+bypassed (one users lookup per request, the previous behaviour) and enabled
+
+Usage:
+    MONGO_URI=mongodb://localhost:27017/gesturebridge_bench python backend/benchmarks/bench_auth_profile.py
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from werkzeug.security import generate_password_hash
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from database import db
+from routes.auth import auth_bp, add_role_claims
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(client, headers, requests, before_request=None):
+    samples = []
+    for _ in range(requests):
+        if before_request:
+            before_request()
+        started = time.perf_counter()
+        response = client.get('/api/auth/profile', headers=headers)
+        samples.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.get_json()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=100)
+    args = parser.parse_args()
+
+    db.connect()
+    users_model = db.get_model('users')
+    user = users_model.get_user_by_username('bench_profile', {'_id': 1})
+    user_id = user['_id'] if user else str(users_model.create_user(
+        'bench_profile', 'bench_profile@example.com', generate_password_hash('bench')
+    ))
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    JWTManager(app).additional_claims_loader(add_role_claims)
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+
+    with app.test_client() as client:
+        run(client, headers, args.warmup)
+        uncached = run(client, headers, args.requests, before_request=lambda: users_model.invalidate_user(user_id))
+        cached = run(client, headers, args.requests)
+
+    print(f"\n{'mode':<10} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for name, samples in (('uncached', uncached), ('cached', cached)):
+        print(f"{name:<10} {percentile(samples, 50):>9.3f} {percentile(samples, 99):>9.3f} {statistics.fmean(samples):>9.3f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Keystroke Savings Benchmark for GestureBridge AI
+Splits the suggestion corpus into training and held-out lines, builds a
+lexicon and n-gram model from the training lines only, then simulates
+fingerspelling every held-out word letter by letter until it appears among
+the top 1 or top 5 suggestions (selecting it costs one keystroke).
+
+Reports keystroke savings (1 - keystrokes / letters) and per-call latency for
+frequency-only completions and for completions reranked by the n-gram model.
+
+Usage:
+    python backend/benchmarks/bench_keystroke_savings.py
+    python backend/benchmarks/bench_keystroke_savings.py corpus/*.txt --holdout-every 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from lexicon import Lexicon, read_word_counts, tokenize
+from ngram import ORDER, NgramModel, count_ngrams, corpus_paths, lexicon_checksum, rank_completions, read_lines
+from scripts.build_lexicon import merge
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def keystrokes(word, context, suggest, limit, latencies):
+    """Keystrokes to enter word: letters typed until it is suggested, plus one to select it"""
+    for typed in range(len(word)):
+        started = time.perf_counter()
+        suggestions = suggest(context, word[:typed], limit)
+        latencies.append((time.perf_counter() - started) * 1e6)
+        if word in suggestions:
+            return typed + 1
+    return len(word)
+
+
+def evaluate(lines, suggest, limit):
+    letters = typed = 0
+    latencies = []
+    for line in lines:
+        words = tokenize(line)
+        for i, word in enumerate(words):
+            letters += len(word)
+            typed += keystrokes(word, words[max(0, i - ORDER + 1):i], suggest, limit, latencies)
+    return 1 - typed / letters, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', nargs='*', help='plain-text files (default: data/corpus/*.txt)')
+    parser.add_argument('--base', default=os.path.join(Config.DATA_DIR, 'base_vocabulary.txt'))
+    parser.add_argument('--holdout-every', type=int, default=10, help='every Nth line is held out')
+    args = parser.parse_args()
+
+    lines = [line for line in read_lines(args.corpus or corpus_paths()) if line.strip()]
+    held_out = lines[::args.holdout_every]
+    training = [line for i, line in enumerate(lines) if i % args.holdout_every]
+
+    corpus_counts = {}
+    for line in training:
+        for word in tokenize(line):
+            corpus_counts[word] = corpus_counts.get(word, 0) + 1
+    lexicon = Lexicon.build(merge([(corpus_counts, 1.0), (read_word_counts(args.base), 1.0)]),
+                            Config.LEXICON_TOP_K, Config.LEXICON_PREFIX_LENGTH)
+    model = NgramModel.build(count_ngrams(training, lexicon), len(lexicon), lexicon_checksum(lexicon))
+    print(f"{len(training)} training lines, {len(held_out)} held-out lines, "
+          f"{len(lexicon):,} words, {len(model):,} n-grams")
+
+    methods = {
+        'frequency': lambda context, prefix, limit: lexicon.complete(prefix, limit),
+        'n-gram': lambda context, prefix, limit: rank_completions(lexicon, model, context, prefix, limit),
+    }
+    print(f"\n{'method':<10} {'top-1 saved':>12} {'top-5 saved':>12} {'p50 us':>8} {'p99 us':>8} {'mean us':>8}")
+    for name, suggest in methods.items():
+        top1, _ = evaluate(held_out, suggest, 1)
+        top5, latencies = evaluate(held_out, suggest, 5)
+        print(f"{name:<10} {top1:>11.1%} {top5:>11.1%} {percentile(latencies, 50):>8.1f} "
+              f"{percentile(latencies, 99):>8.1f} {statistics.fmean(latencies):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
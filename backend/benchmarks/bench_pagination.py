@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Pagination Benchmark for GestureBridge AI
+Compares skip/limit against keyset pagination over a synthetic translation
+history of one million documents for a single user
+
+Usage:
+    MONGO_URI=mongodb://localhost:27017/gesturebridge_bench python backend/benchmarks/bench_pagination.py
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, MongoClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pagination import encode_cursor, keyset_page
+
+
+def seed(collection, user_id, total, batch_size=10000):
+    """Insert a synthetic translation history, newest document last"""
+    start = datetime.utcnow() - timedelta(seconds=total)
+    for offset in range(0, total, batch_size):
+        collection.insert_many([
+            {
+                'user_id': user_id,
+                'type': 'stream',
+                'output_data': random.choice(['Hello', 'Thank you', 'Please', 'Yes', 'No']),
+                'language': 'ASL',
+                'confidence': round(random.uniform(0.85, 0.99), 3),
+                'created_at': start + timedelta(seconds=offset + i)
+            }
+            for i in range(min(batch_size, total - offset))
+        ], ordered=False)
+        print(f"  seeded {min(offset + batch_size, total):,}/{total:,}", end='\r')
+    print()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--documents', type=int, default=1_000_000)
+    parser.add_argument('--per-page', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--reseed', action='store_true', help='drop and regenerate the synthetic collection')
+    args = parser.parse_args()
+
+    client = MongoClient(os.getenv('MONGO_URI', 'mongodb://localhost:27017/gesturebridge_bench'))
+    collection = client.get_database()['bench_translations']
+    user_id = ObjectId('000000000000000000000001')
+
+    if args.reseed or collection.estimated_document_count() < args.documents:
+        collection.drop()
+        print(f"Seeding {args.documents:,} translations...")
+        seed(collection, user_id, args.documents)
+    collection.create_index([('user_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)])
+
+    query = {'user_id': user_id}
+    sort = [('created_at', DESCENDING), ('_id', DESCENDING)]
+    pages = [p for p in (1, 10, 100, 1000, 10000, 50000, 99999) if p * args.per_page <= args.documents]
+
+    print(f"\n{'page':>8} {'skip/limit ms':>15} {'keyset ms':>12}")
+    for page in pages:
+        skip = (page - 1) * args.per_page
+
+        def skip_page():
+            list(collection.find(query).sort(sort).skip(skip).limit(args.per_page))
+            collection.count_documents(query)
+
+        # Position a cursor at the start of the page (not timed)
+        cursor = None
+        if skip:
+            previous = next(collection.find(query, {'created_at': 1}).sort(sort).skip(skip - 1).limit(1))
+            cursor = encode_cursor(previous)
+
+        def keyset():
+            keyset_page(collection, query, cursor, args.per_page)
+
+        print(f"{page:>8} {timed(skip_page, args.repeat):>15.2f} {timed(keyset, args.repeat):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Load Test for GestureBridge AI
+Compares requests/sec and latency percentiles of the WSGI server
+(python backend/app.py) and the ASGI server (uvicorn asgi:app) for
+/api/streaming/process_frame and /api/inference/history
+
+Usage:
+    python backend/app.py                                      # WSGI on :5000
+    uvicorn asgi:app --app-dir backend --port 8000             # ASGI on :8000
+    python backend/benchmarks/load_test.py --target wsgi=http://localhost:5000 \\
+        --target asgi=http://localhost:8000 --concurrency 100 --duration 30
+
+The Flask app does not register the inference blueprint, so history is only
+measured where the server answers it (non-2xx responses are reported).
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+# 1x1 JPEG; the recognition placeholder does not depend on frame content
+FRAME = (
+    'data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAgGBgcGBQgHBwcJCQgKDBQNDAsLDBkSEw8UHRof'
+    'Hh0aHBwgJC4nICIsIxwcKDcpLDAxNDQ0Hyc5PTgyPC4zNDL/wAALCAABAAEBAREA/8QAFAABAAAAAAAAAAAAAAAAAAAACf/E'
+    'ABQQAQAAAAAAAAAAAAAAAAAAAAD/2gAIAQEAAD8AKp//2Q=='
+)
+
+
+async def authenticate(client, base_url):
+    """Register a throwaway user and return its bearer header"""
+    name = f"load_{uuid.uuid4().hex[:10]}"
+    response = await client.post(f"{base_url}/api/auth/register", json={
+        'username': name, 'email': f"{name}@example.com", 'password': 'load-test-password'
+    })
+    response.raise_for_status()
+    return {'Authorization': f"Bearer {response.json()['access_token']}"}
+
+
+async def start_session(client, base_url, headers):
+    response = await client.post(f"{base_url}/api/streaming/start", json={'language': 'ASL'}, headers=headers)
+    response.raise_for_status()
+    return response.json()['session_id']
+
+
+async def worker(client, request, deadline, latencies, failures):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await request()
+            if response.status_code >= 300:
+                failures.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            failures.append(type(e).__name__)
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_scenario(name, base_url, endpoint, concurrency, duration):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        headers = await authenticate(client, base_url)
+        if endpoint == 'process_frame':
+            session_id = await start_session(client, base_url, headers)
+
+            def request():
+                return client.post(f"{base_url}/api/streaming/process_frame", headers=headers, json={
+                    'session_id': session_id, 'frame': FRAME, 'timestamp': time.time()
+                })
+        else:
+            def request():
+                return client.get(f"{base_url}/api/inference/history", headers=headers, params={'per_page': 20})
+
+        latencies, failures = [], []
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client, request, deadline, latencies, failures) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        'server': name,
+        'endpoint': endpoint,
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'mean': statistics.fmean(latencies) if latencies else 0.0,
+        'failures': len(failures),
+        'failure_codes': sorted(set(map(str, failures)))[:5]
+    }
+
+
+async def main_async(args):
+    targets = [target.split('=', 1) for target in args.target]
+    print(f"{'server':<8} {'endpoint':<14} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'failed':>7}")
+    for endpoint in args.endpoints:
+        for name, base_url in targets:
+            result = await run_scenario(name, base_url.rstrip('/'), endpoint, args.concurrency, args.duration)
+            print(f"{result['server']:<8} {result['endpoint']:<14} {result['requests']:>9} {result['rps']:>9.1f} "
+                  f"{result['p50']:>9.1f} {result['p99']:>9.1f} {result['failures']:>7} {' '.join(result['failure_codes'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', action='append', required=True, help='name=base_url, may be repeated')
+    parser.add_argument('--endpoints', nargs='+', default=['process_frame', 'history'], choices=['process_frame', 'history'])
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=20, help='seconds per scenario')
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Chat Response Cache Replay for GestureBridge AI
+Replays a log of chat questions (one per line) through the chat response
+cache in front of the LLM gateway and reports, for each similarity
+threshold, how many questions were answered from the cache and how many
+LLM calls and tokens that saved. Similar hits can be printed with the
+cached question they matched, to check the threshold does not merge
+different questions.
+
+The local stub backend is used unless --live is given, so no API key is
+needed and nothing is billed.
+
+Usage:
+    python backend/benchmarks/replay_chat_cache.py
+    python backend/benchmarks/replay_chat_cache.py questions.log --threshold 0.7 0.8 --show-matches
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chat_cache import ChatResponseCache
+from llm_gateway import LLMGateway, StubBackend, TokenBucket, llm_gateway
+
+DEFAULT_LOG = os.path.join(os.path.dirname(__file__), 'chat_questions.txt')
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def replay(questions, gateway, threshold, show_matches=False):
+    cache = ChatResponseCache(maxsize=len(questions) or 1, ttl=None, threshold=threshold)
+    tokens = llm_calls = 0
+    latencies = []
+    for question in questions:
+        similar_hits = cache.similar_hits
+        started = time.perf_counter()
+        response = cache.get(question)
+        latencies.append((time.perf_counter() - started) * 1e6)
+        if response is None:
+            result = gateway.complete_result('chat', [{'role': 'user', 'content': question}])
+            cache.put(question, result.text)
+            llm_calls += 1
+            tokens += result.total_tokens
+        elif show_matches and cache.similar_hits > similar_hits:
+            matched, score = cache.nearest(question, limit=1)[0]
+            print(f"  {score:.2f}  {question!r} -> {matched!r}")
+    return cache.get_stats(), llm_calls, tokens, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('log', nargs='?', default=DEFAULT_LOG, help='question log, one question per line')
+    parser.add_argument('--threshold', type=float, nargs='+', default=[0.6, 0.7, 0.8, 0.9])
+    parser.add_argument('--live', action='store_true', help='call the configured LLM backend')
+    parser.add_argument('--show-matches', action='store_true', help='print every similar (non-exact) hit')
+    args = parser.parse_args()
+
+    with open(args.log, encoding='utf-8') as f:
+        questions = [line.strip() for line in f if line.strip()]
+    gateway = llm_gateway if args.live else LLMGateway(StubBackend(), rate_limiter=TokenBucket(600000))
+    print(f"{len(questions)} questions, {len(set(questions))} distinct, backend {gateway.backend.name}")
+
+    print(f"\n{'threshold':>9} {'hit rate':>9} {'exact':>6} {'similar':>8} {'LLM calls':>10} {'tokens':>7} "
+          f"{'p50 us':>7} {'p99 us':>7} {'mean us':>8}")
+    for threshold in args.threshold:
+        if args.show_matches:
+            print(f"similar hits at {threshold}:")
+        stats, llm_calls, tokens, latencies = replay(questions, gateway, threshold, args.show_matches)
+        print(f"{threshold:>9.2f} {stats['hit_rate']:>9.1%} {stats['exact_hits']:>6} {stats['similar_hits']:>8} "
+              f"{llm_calls:>10} {tokens:>7} {percentile(latencies, 50):>7.1f} {percentile(latencies, 99):>7.1f} "
+              f"{statistics.fmean(latencies):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
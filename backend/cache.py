@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+In-memory caches for GestureBridge AI
+Thread-safe LRU cache with optional per-entry TTL and hit/miss statistics,
+and a Redis-backed variant for entries shared between worker processes
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache with optional time-to-live, safe to share between request threads"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def _evict(self, key: Hashable) -> None:
+        _, value = self._data.pop(key)
+        self.evictions += 1
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                    return value
+                self._evict(key)
+            if count:
+                self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if key in self._data:
+                self._data.pop(key)
+            self._data[key] = (expires_at, value)
+            while len(self._data) > self.maxsize:
+                self._evict(next(iter(self._data)))
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Return the cached value or compute, store and return it"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._data:
+                self._evict(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._data):
+                self._evict(key)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class RedisCache(TTLCache):
+    """TTLCache shared across worker processes through Redis
+
+    Values must be JSON serializable. Each process keeps recently used
+    entries in its own LRU for local_ttl seconds in front of Redis; Redis
+    holds them for ttl seconds and, with an allkeys-lru maxmemory policy,
+    evicts the least recently used when full. Redis errors are logged and
+    treated as misses, so the cache degrades to per-process.
+    """
+
+    def __init__(self, client, namespace: str, maxsize: int = 1024, ttl: Optional[float] = None,
+                 local_ttl: float = 5.0):
+        super().__init__(maxsize, local_ttl)
+        self.client = client
+        self.namespace = namespace
+        self.shared_ttl = ttl
+        self.shared_hits = 0
+        self.errors = 0
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{json.dumps(key)}"
+
+    def _error(self, e: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+        logger.warning(f"Redis cache {self.namespace} unavailable: {str(e)}")
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        value = super().get(key, _MISSING, count=False)
+        if value is _MISSING:
+            try:
+                raw = self.client.get(self._key(key))
+            except redis.RedisError as e:
+                self._error(e)
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                super().set(key, value)
+                with self._lock:
+                    self.shared_hits += 1
+        with self._lock:
+            if count:
+                if value is _MISSING:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+        return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        super().set(key, value)
+        ttl = self.shared_ttl if ttl is None else ttl
+        try:
+            self.client.set(self._key(key), json.dumps(value), ex=int(ttl) if ttl else None)
+        except redis.RedisError as e:
+            self._error(e)
+
+    def invalidate(self, key: Hashable) -> None:
+        super().invalidate(key)
+        try:
+            self.client.delete(self._key(key))
+        except redis.RedisError as e:
+            self._error(e)
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        with self._lock:
+            return {**stats, 'backend': 'redis', 'shared_hits': self.shared_hits, 'errors': self.errors}
+
+
+def create_shared_cache(namespace: str, maxsize: int = 1024, ttl: Optional[float] = None) -> TTLCache:
+    """RedisCache when REDIS_URL is set and redis is installed, otherwise a per-process TTLCache"""
+    if Config.REDIS_URL and redis is not None:
+        try:
+            return RedisCache(redis.Redis.from_url(Config.REDIS_URL), f'gesturebridge:{namespace}', maxsize, ttl)
+        except Exception as e:
+            logger.warning(f"Redis cache unavailable, using local cache: {str(e)}")
+    return TTLCache(maxsize, ttl)
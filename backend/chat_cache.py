@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Chat Response Cache for GestureBridge AI
+Reuses assistant answers for repeated or reworded support questions.
+Questions are TF-IDF vectorized (stop words dropped, IDF over the cached
+questions) and looked up by cosine similarity through an inverted index, so
+only cached questions sharing a term with the new one are scored. Entries
+live in a TTLCache, which provides LRU eviction and per-entry expiry and
+keeps the index in step through its eviction hook.
+"""
+
+import math
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from analysis_cache import normalize_comment
+from cache import TTLCache
+from config import Config
+
+STOP_WORDS = frozenset("""
+a about am an and any are as at be been but by can could do does doing for from get had has have he her
+hi how i if in into is it its just me my of on or our please should so some that the their them then there
+these they this to us was we were what when where which who why will with would you your
+""".split())
+
+
+def question_terms(question: str) -> Dict[str, float]:
+    """Sublinear term frequencies (1 + log tf) of the question's content words"""
+    counts: Dict[str, int] = {}
+    for word in normalize_comment(question).split():
+        if word not in STOP_WORDS:
+            counts[word] = counts.get(word, 0) + 1
+    return {word: 1 + math.log(count) for word, count in counts.items()}
+
+
+class ChatResponseCache:
+    """Exact and nearest-neighbour cache of chat answers keyed by normalized question"""
+
+    def __init__(self, maxsize: int = 1000, ttl: Optional[float] = 24 * 3600, threshold: float = 0.8):
+        self.threshold = threshold
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl, on_evict=self._on_evict)
+        self._terms: Dict[str, Dict[str, float]] = {}
+        # Inverted index: term -> cached questions containing it
+        self._postings: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def _on_evict(self, key: str, value) -> None:
+        for term in self._terms.pop(key, ()):
+            members = self._postings.get(term)
+            if members:
+                members.discard(key)
+                if not members:
+                    del self._postings[term]
+
+    def _idf(self, term: str) -> float:
+        """Smoothed inverse document frequency over the cached questions"""
+        return math.log((1 + len(self._terms)) / (1 + len(self._postings.get(term, ())))) + 1
+
+    def _norm(self, terms: Dict[str, float], idf: Dict[str, float]) -> float:
+        return math.sqrt(sum((tf * idf[term]) ** 2 for term, tf in terms.items()))
+
+    def nearest(self, question: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """Most similar cached questions with their cosine similarity, best first"""
+        terms = question_terms(question)
+        with self._lock:
+            candidates: Set[str] = set()
+            for term in terms:
+                candidates.update(self._postings.get(term, ()))
+            if not candidates:
+                return []
+            idf = {term: self._idf(term) for term in terms}
+            for key in candidates:
+                for term in self._terms[key]:
+                    if term not in idf:
+                        idf[term] = self._idf(term)
+            query_norm = self._norm(terms, idf)
+            scored = []
+            for key in candidates:
+                cached = self._terms[key]
+                dot = sum(tf * cached[term] * idf[term] ** 2 for term, tf in terms.items() if term in cached)
+                scored.append((key, dot / (query_norm * self._norm(cached, idf))))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def get(self, question: str) -> Optional[str]:
+        """Return the cached answer to this or a similar enough question, or None"""
+        key = normalize_comment(question)
+        if not key:
+            return None
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self.exact_hits += 1
+                return response
+
+            for candidate, score in self.nearest(question):
+                if score < self.threshold:
+                    break
+                # Expired entries are dropped here, so fall through to the next candidate
+                response = self._entries.get(candidate)
+                if response is not None:
+                    self.similar_hits += 1
+                    return response
+
+            self.misses += 1
+            return None
+
+    def put(self, question: str, response: str) -> None:
+        key = normalize_comment(question)
+        if not key or not response:
+            return
+        with self._lock:
+            self._entries.set(key, response)
+            if key not in self._terms:
+                terms = question_terms(question)
+                self._terms[key] = terms
+                for term in terms:
+                    self._postings.setdefault(term, set()).add(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.exact_hits = self.similar_hits = self.misses = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.exact_hits + self.similar_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'exact_hits': self.exact_hits,
+                'similar_hits': self.similar_hits,
+                'misses': self.misses,
+                'evictions': self._entries.evictions,
+                'hit_rate': round((self.exact_hits + self.similar_hits) / lookups, 4) if lookups else 0.0
+            }
+
+
+# Global instance
+chat_response_cache = ChatResponseCache(Config.CHAT_CACHE_SIZE, Config.CHAT_CACHE_TTL, Config.CHAT_CACHE_SIMILARITY)
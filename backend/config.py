@@ -6,14 +6,34 @@ load_dotenv()
 class Config:
     # MongoDB Configuration
     MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/gesturebridge')
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 100))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 300000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+    MONGO_TIMEOUT_MS = int(os.getenv('MONGO_TIMEOUT_MS', 10000))  # per operation, user-facing queries
+    MONGO_ANALYTICS_TIMEOUT_MS = int(os.getenv('MONGO_ANALYTICS_TIMEOUT_MS', 120000))  # aggregations and rebuilds
+    MONGO_READ_PREFERENCE = os.getenv('MONGO_READ_PREFERENCE', 'primary')
+    MONGO_ANALYTICS_READ_PREFERENCE = os.getenv('MONGO_ANALYTICS_READ_PREFERENCE', 'secondaryPreferred')
+
+    # Batched translation writes
+    TRANSLATION_BATCH_SIZE = int(os.getenv('TRANSLATION_BATCH_SIZE', 100))
+    TRANSLATION_FLUSH_INTERVAL = float(os.getenv('TRANSLATION_FLUSH_INTERVAL', 1.0))  # seconds
+    TRANSLATION_WRITE_CONCERN = os.getenv('TRANSLATION_WRITE_CONCERN', '1')  # w: 0, 1, majority
+    TRANSLATION_WRITE_JOURNAL = os.getenv('TRANSLATION_WRITE_JOURNAL', 'false').lower() == 'true'
+    TRANSLATION_WRITE_RETRIES = int(os.getenv('TRANSLATION_WRITE_RETRIES', 3))
     
     # JWT Configuration
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600))
+    JWT_ROLE_CLAIMS = os.getenv('JWT_ROLE_CLAIMS', 'true').lower() == 'true'  # embed the role in access tokens
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 30))  # seconds
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 10000))
     
     # Server Configuration
     PORT = int(os.getenv('PORT', 5000))
     HOST = os.getenv('HOST', '0.0.0.0')
+    RECOGNITION_EXECUTOR = os.getenv('RECOGNITION_EXECUTOR', 'thread')  # thread, process
+    RECOGNITION_WORKERS = int(os.getenv('RECOGNITION_WORKERS', 0))  # 0 = one per CPU
     
     # ML Model Configuration
     MODEL_PATH = os.getenv('MODEL_PATH', 'backend/model/saved_model')
@@ -33,3 +53,56 @@ class Config:
     # OpenAI Configuration
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+
+    # LLM Gateway Configuration
+    LLM_BACKEND = os.getenv('LLM_BACKEND', 'openai')  # openai, stub
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL')
+    LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', 30))
+    LLM_MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', 20))
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 3))
+    LLM_RATE_LIMIT_PER_MINUTE = int(os.getenv('LLM_RATE_LIMIT_PER_MINUTE', 60))
+    LLM_FEATURE_BUDGETS = os.getenv('LLM_FEATURE_BUDGETS', 'chat=200000,feedback=100000,streaming=100000,training=50000')
+
+    # Cache Configuration
+    REDIS_URL = os.getenv('REDIS_URL')
+
+    # Word suggestions
+    DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    LEXICON_PATH = os.getenv('LEXICON_PATH', os.path.join(DATA_DIR, 'lexicon.bin'))
+    LEXICON_WORDS_PATH = os.getenv('LEXICON_WORDS_PATH', os.path.join(DATA_DIR, 'word_frequencies.txt'))
+    LEXICON_TOP_K = int(os.getenv('LEXICON_TOP_K', 10))  # completions cached per prefix
+    LEXICON_PREFIX_LENGTH = int(os.getenv('LEXICON_PREFIX_LENGTH', 3))  # prefixes looked up in O(1)
+    NGRAM_PATH = os.getenv('NGRAM_PATH', os.path.join(DATA_DIR, 'ngrams.bin'))  # context reranking
+    SUGGESTION_MAX_EDIT_COST = float(os.getenv('SUGGESTION_MAX_EDIT_COST', 1.0))  # fingerspelling corrections
+    SUGGESTION_CACHE_SIZE = int(os.getenv('SUGGESTION_CACHE_SIZE', 4096))  # words per process
+    SUGGESTION_CACHE_TTL = int(os.getenv('SUGGESTION_CACHE_TTL', 3600))  # seconds, in Redis when REDIS_URL is set
+    SUGGESTION_HTTP_MAX_AGE = int(os.getenv('SUGGESTION_HTTP_MAX_AGE', 300))  # Cache-Control for GET /word
+    USER_LEXICON_SIZE = int(os.getenv('USER_LEXICON_SIZE', 500))  # most used words kept per user
+    USER_LEXICON_CACHE_SIZE = int(os.getenv('USER_LEXICON_CACHE_SIZE', 1000))  # users kept in memory
+    USER_LEXICON_TTL = int(os.getenv('USER_LEXICON_TTL', 3600))  # seconds before an overlay is reloaded
+    USER_LEXICON_MIN_COUNT = int(os.getenv('USER_LEXICON_MIN_COUNT', 2))  # uses before a word is boosted
+    SUGGESTION_BATCH_LIMIT = int(os.getenv('SUGGESTION_BATCH_LIMIT', 50))  # prefixes per batch request
+
+    # Chat assistant
+    CHAT_INTENTS_PATH = os.getenv('CHAT_INTENTS_PATH', os.path.join(DATA_DIR, 'chat_intents.json'))  # offline answers
+    CHAT_CACHE_SIZE = int(os.getenv('CHAT_CACHE_SIZE', 1000))  # cached assistant answers
+    CHAT_CACHE_TTL = int(os.getenv('CHAT_CACHE_TTL', 86400))  # seconds an answer is reused
+    CHAT_CACHE_SIMILARITY = float(os.getenv('CHAT_CACHE_SIMILARITY', 0.8))  # TF-IDF cosine for a reworded question
+
+    # Feedback Configuration
+    FEEDBACK_ANALYSIS_WORKER = os.getenv('FEEDBACK_ANALYSIS_WORKER', 'true').lower() == 'true'
+    FEEDBACK_ANALYSIS_BATCH_SIZE = int(os.getenv('FEEDBACK_ANALYSIS_BATCH_SIZE', 10))
+    FEEDBACK_ANALYSIS_POLL_INTERVAL = float(os.getenv('FEEDBACK_ANALYSIS_POLL_INTERVAL', 5))
+    FEEDBACK_STATS_CACHE_TTL = int(os.getenv('FEEDBACK_STATS_CACHE_TTL', 30))  # seconds
+
+    # Indexes
+    DROP_REDUNDANT_INDEXES = os.getenv('DROP_REDUNDANT_INDEXES', 'true').lower() == 'true'
+
+    # Analytics
+    ANALYTICS_RETENTION_DAYS = int(os.getenv('ANALYTICS_RETENTION_DAYS', 30))
+    ANALYTICS_RETENTION_BY_TYPE = os.getenv('ANALYTICS_RETENTION_BY_TYPE', 'streaming=7')  # days per event type
+    ANALYTICS_ROLLUP_RETENTION_DAYS = int(os.getenv('ANALYTICS_ROLLUP_RETENTION_DAYS', 400))
+
+    # Statistics
+    STATS_RECONCILE_INTERVAL = int(os.getenv('STATS_RECONCILE_INTERVAL', 3600))  # seconds, 0 disables
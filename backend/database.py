@@ -1,5 +1,6 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, timeout
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
 import sys
 import os
 import logging
@@ -8,9 +9,39 @@ import logging
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from config import Config
+from monitoring import pool_metrics
 
 logger = logging.getLogger(__name__)
 
+READ_PREFERENCES = {
+    'primary': Primary,
+    'primaryPreferred': PrimaryPreferred,
+    'secondary': Secondary,
+    'secondaryPreferred': SecondaryPreferred,
+    'nearest': Nearest
+}
+
+def read_preference(name):
+    """Read preference instance for a mode name such as 'secondaryPreferred'"""
+    if name not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference '{name}'")
+    return READ_PREFERENCES[name]()
+
+def client_options():
+    """Pool sizing, timeouts and read preference shared by the sync and async clients"""
+    return {
+        'maxPoolSize': Config.MONGO_MAX_POOL_SIZE,
+        'minPoolSize': Config.MONGO_MIN_POOL_SIZE,
+        'maxIdleTimeMS': Config.MONGO_MAX_IDLE_TIME_MS,
+        'serverSelectionTimeoutMS': Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        'timeoutMS': Config.MONGO_TIMEOUT_MS or None,
+        'read_preference': read_preference(Config.MONGO_READ_PREFERENCE)
+    }
+
+def analytics_timeout():
+    """Context manager giving long analytics operations their own per-operation timeout"""
+    return timeout(Config.MONGO_ANALYTICS_TIMEOUT_MS / 1000 if Config.MONGO_ANALYTICS_TIMEOUT_MS else None)
+
 class Database:
     def __init__(self):
         self.client = None
@@ -28,13 +59,15 @@ class Database:
     def connect(self):
         """Establish connection to MongoDB"""
         try:
-            self.client = MongoClient(Config.MONGO_URI, serverSelectionTimeoutMS=5000)
+            self.client = MongoClient(Config.MONGO_URI, event_listeners=[pool_metrics], **client_options())
             # Test the connection
             self.client.server_info()
             self.db = self.client.get_database()
             
             # Initialize models
             self._initialize_models()
+            self.models['analytics'].ensure_timeseries()
+            self.ensure_indexes()
             
             logger.info("Successfully connected to MongoDB!")
             return True
@@ -54,7 +87,7 @@ class Database:
             # Import models from the same directory
             from models import (
                 UserModel, TranslationModel, FeedbackModel,
-                StreamingSessionModel, AnalyticsModel, LanguageModel
+                StreamingSessionModel, AnalyticsModel, LanguageModel, UserLexiconModel
             )
             
             self.models['users'] = UserModel(self)
@@ -63,6 +96,7 @@ class Database:
             self.models['streaming_sessions'] = StreamingSessionModel(self)
             self.models['analytics'] = AnalyticsModel(self)
             self.models['languages'] = LanguageModel(self)
+            self.models['user_lexicons'] = UserLexiconModel(self)
             
             logger.info("Database models initialized successfully")
         except Exception as e:
@@ -79,15 +113,33 @@ class Database:
         """Close the MongoDB connection"""
         if self.client:
             try:
+                # Write buffered translations before the client goes away
+                if 'translations' in self.models:
+                    self.models['translations'].writer.close()
+                    self.models['streaming_sessions'].frame_writer.close()
+                if 'user_lexicons' in self.models:
+                    self.models['user_lexicons'].flush_words()
                 self.client.close()
                 logger.info("MongoDB connection closed successfully")
             except Exception as e:
                 logger.error(f"Error closing MongoDB connection: {str(e)}")
 
-    def get_collection(self, collection_name):
-        """Get a MongoDB collection"""
+    def get_collection(self, collection_name, analytics=False, primary=False):
+        """Get a MongoDB collection
+
+        analytics=True returns a handle using MONGO_ANALYTICS_READ_PREFERENCE,
+        for read-only dashboards that tolerate slightly stale reads.
+        primary=True always reads from the primary, for reads whose results
+        are written back (a lagging secondary would undo recent writes).
+        """
         if self.db is None:
             raise ConnectionError("Database connection not established")
+        if primary:
+            return self.db.get_collection(collection_name, read_preference=read_preference('primary'))
+        if analytics:
+            return self.db.get_collection(
+                collection_name, read_preference=read_preference(Config.MONGO_ANALYTICS_READ_PREFERENCE)
+            )
         return self.db[collection_name]
 
     def create_indexes(self):
@@ -100,6 +152,15 @@ class Database:
             logger.error(f"Error creating database indexes: {str(e)}")
             raise
 
+    def ensure_indexes(self):
+        """Apply model index declarations without failing startup"""
+        try:
+            from indexes import ensure_indexes
+            return ensure_indexes(self)
+        except Exception as e:
+            logger.error(f"Error ensuring database indexes: {str(e)}")
+            return None
+
     def initialize_default_data(self):
         """Initialize default data in the database"""
         try:
@@ -177,9 +238,9 @@ class Database:
             stats = {}
             
             # Get collection stats
-            collections = ['users', 'translations', 'feedback', 'streaming_sessions', 'analytics', 'languages']
+            collections = ['users', 'translations', 'feedback', 'streaming_sessions', 'session_translations', 'analytics', 'analytics_rollups', 'languages']
             for collection_name in collections:
-                collection = self.get_collection(collection_name)
+                collection = self.get_collection(collection_name, analytics=True)
                 stats[collection_name] = {
                     'count': collection.count_documents({}),
                     'size': collection.estimated_document_count()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Feedback Analysis for GestureBridge AI
+ChatGPT-based feedback analysis and the background worker that runs it
+off the request path
+"""
+
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+from typing import Dict, List, Optional
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from analysis_cache import feedback_analysis_cache
+from config import Config
+from llm_gateway import llm_gateway
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_SYSTEM_PROMPT = "You are an AI assistant that analyzes user feedback for a sign language translation app. Provide structured analysis in JSON format."
+
+
+def _fallback_analysis(analysis_text: str) -> Dict:
+    return {
+        'sentiment': 'neutral',
+        'insights': [analysis_text],
+        'suggestions': ['Review feedback manually'],
+        'priority': 'medium'
+    }
+
+
+def _request_analysis(feedback_data: Dict) -> Dict:
+    """Ask ChatGPT to analyze one feedback entry, LLM errors are raised"""
+    feedback_type = feedback_data.get('type', 'general')
+    rating = feedback_data.get('rating', 3)
+    comment = feedback_data.get('comment', '')
+    category = feedback_data.get('category', 'general')
+
+    prompt = f"""Analyze this user feedback for GestureBridge AI sign language translation app:
+
+Feedback Type: {feedback_type}
+Rating: {rating}/5
+Category: {category}
+Comment: {comment}
+
+Please provide:
+1. Sentiment analysis (positive, negative, neutral)
+2. Key insights from the feedback
+3. Specific suggestions for improvement
+4. Priority level (low, medium, high)
+
+Format the response as JSON with keys: sentiment, insights, suggestions, priority"""
+
+    analysis_text = llm_gateway.complete(
+        'feedback',
+        messages=[
+            {"role": "system", "content": FEEDBACK_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=300,
+        temperature=0.3
+    )
+
+    # Try to parse as JSON, fallback to text analysis
+    try:
+        analysis = json.loads(analysis_text)
+    except ValueError:
+        return _fallback_analysis(analysis_text)
+
+    feedback_analysis_cache.put(feedback_data, analysis)
+    return analysis
+
+
+def analyze_feedback_with_chatgpt(feedback_data):
+    """
+    Analyze user feedback using ChatGPT to provide insights and suggestions
+    """
+    try:
+        if not llm_gateway.is_enabled():
+            return {
+                'analysis': 'Feedback analysis requires OpenAI API key',
+                'suggestions': ['Set up OpenAI API key for automated feedback analysis'],
+                'sentiment': 'neutral'
+            }
+
+        cached = feedback_analysis_cache.get(feedback_data)
+        if cached is not None:
+            return cached
+
+        return _request_analysis(feedback_data)
+
+    except Exception as e:
+        print(f"Feedback analysis error: {e}")
+        return {
+            'analysis': f'Error analyzing feedback: {str(e)}',
+            'suggestions': ['Manual review recommended'],
+            'sentiment': 'neutral'
+        }
+
+
+def analyze_feedback_batch(feedback_items: List[Dict]) -> List[Dict]:
+    """
+    Analyze several feedback documents with a single ChatGPT call
+
+    Returns one analysis per item, in order. LLM errors are raised so the
+    caller can retry the batch later.
+    """
+    if not llm_gateway.is_enabled():
+        return [analyze_feedback_with_chatgpt(item) for item in feedback_items]
+
+    # Reuse analyses of identical or near-identical comments
+    results = [feedback_analysis_cache.get(item) for item in feedback_items]
+    pending = [i for i, analysis in enumerate(results) if analysis is None]
+    if not pending:
+        return results
+    if len(pending) == 1:
+        results[pending[0]] = _request_analysis(feedback_items[pending[0]])
+        return results
+
+    uncached = [feedback_items[i] for i in pending]
+    entries = []
+    for index, item in enumerate(uncached):
+        entries.append(
+            f"[{index}] Type: {item.get('type', 'general')} | Rating: {item.get('rating', 3)}/5 | "
+            f"Category: {item.get('category', 'general')} | Comment: {item.get('comment', '')}"
+        )
+
+    prompt = f"""Analyze each of these {len(uncached)} user feedback items for GestureBridge AI sign language translation app:
+
+{chr(10).join(entries)}
+
+For each item provide sentiment (positive, negative, neutral), key insights, specific suggestions for improvement and priority level (low, medium, high).
+
+Format the response as a JSON array with one object per item, in the same order, each with keys: index, sentiment, insights, suggestions, priority"""
+
+    analysis_text = llm_gateway.complete(
+        'feedback',
+        messages=[
+            {"role": "system", "content": FEEDBACK_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=min(300 * len(uncached), 2000),
+        temperature=0.3
+    )
+
+    try:
+        analyses = json.loads(analysis_text)
+    except ValueError:
+        analyses = None
+
+    if not isinstance(analyses, list) or len(analyses) != len(uncached):
+        # The model did not follow the batch format, analyze individually
+        for i in pending:
+            results[i] = _request_analysis(feedback_items[i])
+        return results
+
+    for i, analysis in zip(pending, analyses):
+        if isinstance(analysis, dict):
+            analysis.pop('index', None)
+            feedback_analysis_cache.put(feedback_items[i], analysis)
+            results[i] = analysis
+        else:
+            results[i] = _fallback_analysis(str(analysis))
+    return results
+
+
+class FeedbackAnalysisWorker:
+    """Background thread that analyzes pending feedback in batches"""
+
+    def __init__(self, database, batch_size: int = 10, poll_interval: float = 5.0,
+                 lease_seconds: int = 300, max_attempts: int = 3):
+        self.database = database
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the worker thread if it is not already running"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='feedback-analysis', daemon=True)
+        self._thread.start()
+        logger.info("Feedback analysis worker started")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def notify(self) -> None:
+        """Wake the worker immediately, e.g. after new feedback was submitted"""
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logger.error(f"Feedback analysis worker error: {str(e)}")
+                processed = 0
+            if processed < self.batch_size:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def run_once(self) -> int:
+        """Claim and analyze one batch of pending feedback, returns how many were analyzed
+
+        A failed batch counts as 0, so the worker waits a poll interval
+        before claiming the requeued feedback again.
+        """
+        feedback_model = self.database.get_model('feedback')
+        batch = feedback_model.claim_pending_analysis(self.batch_size, self.worker_id, self.lease_seconds)
+        if not batch:
+            return 0
+
+        try:
+            analyses = analyze_feedback_batch(batch)
+        except Exception as e:
+            logger.warning(f"Feedback batch analysis failed: {str(e)}")
+            for feedback in batch:
+                attempts = feedback.get('analysis_attempts', 0)
+                feedback_model.update_feedback(feedback['_id'], {
+                    'analysis_status': 'failed' if attempts >= self.max_attempts else 'pending',
+                    'analysis_error': str(e)
+                })
+            return 0
+
+        for feedback, analysis in zip(batch, analyses):
+            feedback_model.update_feedback(feedback['_id'], {
+                'ai_analysis': analysis,
+                'analysis_status': 'completed',
+                'analysis_error': None
+            })
+        return len(batch)
+
+
+def start_feedback_analysis_worker(database) -> Optional[FeedbackAnalysisWorker]:
+    """Create and start the global feedback analysis worker"""
+    global feedback_analysis_worker
+    if not Config.FEEDBACK_ANALYSIS_WORKER:
+        return None
+    feedback_analysis_worker = FeedbackAnalysisWorker(
+        database,
+        batch_size=Config.FEEDBACK_ANALYSIS_BATCH_SIZE,
+        poll_interval=Config.FEEDBACK_ANALYSIS_POLL_INTERVAL
+    )
+    feedback_analysis_worker.start()
+    return feedback_analysis_worker
+
+
+def notify_feedback_analysis_worker() -> None:
+    if feedback_analysis_worker:
+        feedback_analysis_worker.notify()
+
+
+# Global instance, started by the app once the database is connected
+feedback_analysis_worker: Optional[FeedbackAnalysisWorker] = None
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Fingerspelling confusions for GestureBridge AI
+Edit costs for matching recognized letter sequences against the lexicon,
+derived from the rule cascade of the sign recognizer (sign_model/final_pred.py).
+
+The classifier first predicts one of eight letter groups, then separates the
+letters of a group with landmark rules. Letters in the same group are easier
+to confuse than letters of different groups, and pairs separated by a single
+distance threshold (C/O, G/H, Y/J, U/V, ...) are the easiest of all. Groups
+that the cascade has explicit correction rules for, such as [gh] vs [pqz],
+are confused more often than unrelated groups.
+"""
+
+from itertools import combinations
+from typing import Dict, Tuple
+
+# Letter groups predicted by the CNN, in class index order
+CLASSIFIER_GROUPS = ('aemnst', 'bdfikruvw', 'co', 'gh', 'l', 'pqz', 'x', 'yj')
+
+# Letters the subgroup rules separate with a single landmark threshold
+THRESHOLD_PAIRS = ('co', 'gh', 'yj', 'pq', 'qz', 'uv', 'ur', 'vr', 'mn', 'ae', 'as', 'bf')
+
+# Group pairs with a correction rule in the cascade (the "[gh][pqz]" style comments)
+CORRECTED_GROUP_PAIRS = (
+    ('aemnst', 'co'), ('aemnst', 'x'), ('aemnst', 'pqz'),
+    ('bdfikruvw', 'gh'), ('bdfikruvw', 'pqz'), ('bdfikruvw', 'yj'), ('bdfikruvw', 'x'), ('bdfikruvw', 'l'),
+    ('gh', 'l'), ('gh', 'pqz'), ('l', 'x'), ('l', 'co'), ('l', 'pqz'), ('l', 'yj'),
+    ('pqz', 'yj'), ('x', 'yj'), ('co', 'x')
+)
+
+THRESHOLD_COST = 0.25
+SAME_GROUP_COST = 0.5
+CORRECTED_GROUP_COST = 0.75
+
+
+class EditCosts:
+    """Uniform Levenshtein costs, the interface Lexicon.fuzzy_complete expects
+
+    substitution: a typed letter recognized in place of the intended one
+    insertion: an intended letter missing from the typed text
+    deletion: a typed letter that is not in the intended word
+    The previous letter of the intended word or typed text is passed along.
+    """
+
+    def substitution(self, typed: str, intended: str) -> float:
+        return 0.0 if typed == intended else 1.0
+
+    def insertion(self, intended: str, previous: str) -> float:
+        return 1.0
+
+    def deletion(self, typed: str, previous: str) -> float:
+        return 1.0
+
+
+class FingerspellingCosts(EditCosts):
+    """Substitution costs from recognizer confusions
+
+    A letter held across several frames is often recognized twice, and the
+    second letter of a double letter is often missed, so both cost less
+    than other missing or extra letters.
+    """
+
+    repeat_cost = 0.5
+
+    def __init__(self):
+        self.costs: Dict[Tuple[str, str], float] = {}
+        group_of = {letter: group for group in CLASSIFIER_GROUPS for letter in group}
+        corrected = {frozenset(pair) for pair in CORRECTED_GROUP_PAIRS}
+        for a, b in combinations(sorted(group_of), 2):
+            if a + b in THRESHOLD_PAIRS or b + a in THRESHOLD_PAIRS:
+                cost = THRESHOLD_COST
+            elif group_of[a] == group_of[b]:
+                cost = SAME_GROUP_COST
+            elif frozenset((group_of[a], group_of[b])) in corrected:
+                cost = CORRECTED_GROUP_COST
+            else:
+                continue
+            self.costs[a, b] = self.costs[b, a] = cost
+
+    def substitution(self, typed: str, intended: str) -> float:
+        if typed == intended:
+            return 0.0
+        return self.costs.get((typed, intended), 1.0)
+
+    def insertion(self, intended: str, previous: str) -> float:
+        return self.repeat_cost if intended == previous else 1.0
+
+    def deletion(self, typed: str, previous: str) -> float:
+        return self.repeat_cost if typed == previous else 1.0
+
+
+fingerspelling_costs = FingerspellingCosts()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Index Management for GestureBridge AI
+Applies the indexes each model declares in INDEXES, idempotently, and drops
+indexes made redundant by them
+
+Usage:
+    python backend/indexes.py [--dry-run]
+"""
+
+import argparse
+import logging
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pymongo.errors import OperationFailure
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Single-field indexes from earlier releases that no route query uses
+RETIRED_INDEXES = {
+    'users': ['created_at_1', 'last_login_1'],
+    'translations': ['created_at_1', 'language_1', 'type_1'],
+    'feedback': ['type_1', 'status_1', 'created_at_1', 'translation_id_1',
+                 'analysis_status_1_analysis_claimed_at_1'],
+    'streaming_sessions': ['status_1', 'created_at_1']
+}
+
+
+def index_keys(spec) -> List[Tuple[str, int]]:
+    """Key pattern of an IndexModel document or an index_information entry"""
+    key = spec['key']
+    return list(key.items()) if isinstance(key, dict) else list(key)
+
+
+def declared_indexes(database) -> Dict[str, List]:
+    """Collect IndexModel declarations from all registered models"""
+    declared: Dict[str, List] = {}
+    for model in database.models.values():
+        for collection_name, indexes in getattr(model, 'INDEXES', {}).items():
+            declared.setdefault(collection_name, []).extend(indexes)
+    return declared
+
+
+def is_prefix(keys: Sequence[Tuple[str, int]], of: Sequence[Tuple[str, int]]) -> bool:
+    return len(keys) < len(of) and list(keys) == list(of[:len(keys)])
+
+
+def find_covering_index(indexes: Sequence, equality: Sequence[str] = (),
+                        sort: Sequence[str] = (), ranges: Sequence[str] = ()) -> Optional[str]:
+    """
+    Name of an index that serves a query without a collection scan or an
+    in-memory sort: equality fields first (any order), then the sort fields
+    in order, then at most one range field
+    """
+    for index in indexes:
+        document = index.document if hasattr(index, 'document') else index
+        fields = [field for field, _ in index_keys(document)]
+        if set(fields[:len(equality)]) != set(equality):
+            continue
+        rest = fields[len(equality):]
+        if list(sort) != rest[:len(sort)]:
+            continue
+        rest = rest[len(sort):]
+        # Keyset pages range over their own sort fields
+        if ranges and not set(ranges) <= set(sort) and rest[:1] != list(ranges[:1]):
+            continue
+        return document['name']
+    return None
+
+
+def _redundant(name: str, info: Dict, declared_keys: List[List[Tuple[str, int]]], collection_name: str) -> bool:
+    if name in RETIRED_INDEXES.get(collection_name, []):
+        return True
+    if info.get('unique') or 'expireAfterSeconds' in info or 'partialFilterExpression' in info:
+        return False
+    keys = index_keys(info)
+    return any(is_prefix(keys, other) for other in declared_keys)
+
+
+def ensure_indexes(database, drop_redundant: Optional[bool] = None, dry_run: bool = False) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Create missing declared indexes and drop redundant ones
+
+    Safe to run on every boot and from several workers at once: existing
+    indexes are left alone, indexes whose options changed are rebuilt, and
+    undeclared indexes are only dropped when a declared compound index
+    already covers them (or they are listed in RETIRED_INDEXES).
+    """
+    if drop_redundant is None:
+        drop_redundant = Config.DROP_REDUNDANT_INDEXES
+
+    report = {}
+    for collection_name, indexes in declared_indexes(database).items():
+        collection = database.get_collection(collection_name)
+        existing = collection.index_information()
+        created, rebuilt, dropped, unmanaged = [], [], [], []
+
+        declared_names = set()
+        for index in indexes:
+            name = index.document['name']
+            declared_names.add(name)
+            current = existing.get(name)
+            if current is None:
+                created.append(name)
+                if not dry_run:
+                    collection.create_indexes([index])
+                continue
+            wanted = {k: v for k, v in index.document.items() if k not in ('key', 'name')}
+            if any(current.get(k) != v for k, v in wanted.items()):
+                rebuilt.append(name)
+                if not dry_run:
+                    collection.drop_index(name)
+                    collection.create_indexes([index])
+
+        declared_keys = [index_keys(index.document) for index in indexes]
+        for name, info in existing.items():
+            if name == '_id_' or name in declared_names:
+                continue
+            if drop_redundant and _redundant(name, info, declared_keys, collection_name):
+                dropped.append(name)
+                if not dry_run:
+                    try:
+                        collection.drop_index(name)
+                    except OperationFailure as e:
+                        # Another worker dropped it first
+                        logger.debug(f"Index {collection_name}.{name} already dropped: {str(e)}")
+            else:
+                unmanaged.append(name)
+
+        for name in unmanaged:
+            logger.warning(f"Index {collection_name}.{name} is not declared by any model")
+        report[collection_name] = {'created': created, 'rebuilt': rebuilt, 'dropped': dropped}
+
+    logger.info(f"Database indexes ensured: {report}")
+    return report
+
+
+if __name__ == "__main__":
+    from pymongo import MongoClient
+    from database import db
+
+    parser = argparse.ArgumentParser(description='Apply GestureBridge AI index declarations')
+    parser.add_argument('--dry-run', action='store_true', help='only report what would change')
+    args = parser.parse_args()
+
+    # Database.connect() would already apply the declarations
+    db.client = MongoClient(Config.MONGO_URI)
+    db.db = db.client.get_database()
+    db._initialize_models()
+    for collection_name, changes in ensure_indexes(db, dry_run=args.dry_run).items():
+        print(f"{collection_name}: {changes}")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Intent Matcher for GestureBridge AI
+Answers chat messages offline from the intents in data/chat_intents.json.
+Every keyword of every intent is compiled into one Aho-Corasick automaton,
+so a message is matched in a single pass whatever the number of intents;
+each intent is scored by the total weight of its keywords found in the
+message and the best scoring intent answers.
+"""
+
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config import Config
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "'"
+
+
+class AhoCorasick:
+    """Multi-pattern substring search over a trie with failure links"""
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        # Node 0 is the root; goto[node] maps a character to the next node
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append(index)
+
+        # Breadth-first, so a node's failure target is final before its children are visited
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text: str):
+        """Yield (pattern index, end position) of every occurrence, in one pass over text"""
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for index in self.output[node]:
+                yield index, position + 1
+
+
+class IntentMatcher:
+    """Scores intents by the weighted keywords a message contains
+
+    Keywords match whole words; a keyword ending in '*' also matches longer
+    words ('error*' matches 'errors'). Ties go to the intent listed first.
+    """
+
+    def __init__(self, intents: List[Dict], default_response: str):
+        self.intents = intents
+        self.default_response = default_response
+        patterns: List[str] = []
+        # Per pattern: (intent index, weight, whether the match must end a word)
+        self._targets: List[Tuple[int, float, bool]] = []
+        for intent_index, intent in enumerate(intents):
+            for keyword, weight in intent['keywords'].items():
+                keyword = keyword.lower()
+                prefix = keyword.endswith('*')
+                patterns.append(keyword.rstrip('*'))
+                self._targets.append((intent_index, float(weight), not prefix))
+        self.automaton = AhoCorasick(patterns)
+
+    @classmethod
+    def load(cls, path: str) -> 'IntentMatcher':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['intents'], data['default_response'])
+
+    def scores(self, message: str) -> Dict[str, float]:
+        """Total keyword weight per matched intent; each keyword counts once"""
+        text = message.lower()
+        matched = set()
+        for index, end in self.automaton.find(text):
+            start = end - len(self.automaton.patterns[index])
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if self._targets[index][2] and end < len(text) and _is_word_char(text[end]):
+                continue
+            matched.add(index)
+
+        totals: Dict[int, float] = {}
+        for index in matched:
+            intent_index, weight, _ = self._targets[index]
+            totals[intent_index] = totals.get(intent_index, 0.0) + weight
+        return {self.intents[i]['name']: total for i, total in sorted(totals.items())}
+
+    def match(self, message: str) -> Optional[Dict]:
+        """The best scoring intent, None if no keyword matched"""
+        scores = self.scores(message)
+        if not scores:
+            return None
+        # max keeps the first of equal scores, i.e. the intent listed first
+        best = max(scores, key=scores.get)
+        return next(intent for intent in self.intents if intent['name'] == best)
+
+    def respond(self, message: str) -> str:
+        intent = self.match(message)
+        return intent['response'] if intent else self.default_response
+
+
+def load_intent_matcher(path: Optional[str] = None) -> IntentMatcher:
+    return IntentMatcher.load(path or Config.CHAT_INTENTS_PATH)
+
+
+# Global instance
+intent_matcher = load_intent_matcher()
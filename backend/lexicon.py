@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Lexicon for GestureBridge AI
+Prefix index over a ranked word list: a trie laid out in flat arrays, with
+the most frequent completions of every node cached on the node, plus a hash
+table mapping every short prefix straight to its node. Serialized to a
+binary file that is memory-mapped, so loading is lazy and shared between
+worker processes through the page cache.
+
+Usage:
+    python backend/lexicon.py                       # rebuild data/lexicon.bin
+    python backend/lexicon.py --words counts.txt --top-k 10 --prefix-length 3 --output lexicon.bin
+
+Build the ranked word counts from a text corpus with scripts/build_lexicon.py.
+"""
+
+import argparse
+import heapq
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config import Config
+from fingerspelling import EditCosts
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'GBLX'
+VERSION = 2
+# magic, version, top_k, prefix length, node count, word count, prefix slots, word blob length
+HEADER = struct.Struct('<4sHHIIIIQ')
+ALIGNMENT = 8
+# Prefixes whose UTF-8 encoding fits in 8 bytes are their own 64-bit key
+MAX_KEY_BYTES = 8
+FIBONACCI = 0x9E3779B97F4A7C15
+MASK64 = (1 << 64) - 1
+TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)*")
+# Extra cost of completing a fuzzy match rather than matching a whole word
+COMPLETION_COST = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.lower())
+
+
+def read_word_counts(path: str) -> Dict[str, int]:
+    """Read a "word count" per line file, ignoring blank lines and # comments"""
+    counts: Dict[str, int] = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            word, _, count = line.rpartition(' ')
+            word = word.strip().lower()
+            if word:
+                counts[word] = counts.get(word, 0) + int(count)
+    return counts
+
+
+def prefix_key(prefix: str) -> int:
+    """Exact 64-bit key of a short prefix, 0 if it is too long to have one"""
+    encoded = prefix.encode('utf-8')
+    if not encoded or len(encoded) > MAX_KEY_BYTES:
+        return 0
+    return int.from_bytes(encoded, 'little')
+
+
+def _slot(key: int, shift: int) -> int:
+    return ((key * FIBONACCI) & MASK64) >> shift
+
+
+class Lexicon:
+    """Read-only trie with per-node top-k completions
+
+    Words are numbered by rank (most frequent first), so a node's top-k list
+    is simply the k smallest word IDs in its subtree. Children of a node are
+    stored contiguously and sorted by character, found by binary search.
+    Prefixes up to prefix_length characters skip the walk and are looked up
+    in an open-addressing table keyed by their UTF-8 bytes.
+
+    Sections are arrays when built in memory and memoryviews over the file
+    when loaded, both support the same indexing and slicing.
+    """
+
+    def __init__(self, counts, word_offsets, word_blob, labels, child_start, child_count,
+                 word_ids, top, prefix_keys, prefix_nodes, top_k: int, prefix_length: int):
+        self.counts = counts
+        self.word_offsets = word_offsets
+        self.word_blob = word_blob
+        self.labels = labels
+        self.child_start = child_start
+        self.child_count = child_count
+        self.word_ids = word_ids
+        self.top = top
+        self.prefix_keys = prefix_keys
+        self.prefix_nodes = prefix_nodes
+        self.top_k = top_k
+        self.prefix_length = prefix_length
+        self._prefix_shift = 64 - max(len(prefix_keys).bit_length() - 1, 0)
+        self._mmap = None
+        # Words are decoded from the blob on first use
+        self._words: List[Optional[str]] = [None] * len(counts)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __contains__(self, word: str) -> bool:
+        node = self._find(word.lower())
+        return node >= 0 and self.word_ids[node] >= 0
+
+    @property
+    def node_count(self) -> int:
+        return len(self.child_start)
+
+    def word(self, word_id: int) -> str:
+        word = self._words[word_id]
+        if word is None:
+            word = self._words[word_id] = str(
+                self.word_blob[self.word_offsets[word_id]:self.word_offsets[word_id + 1]], 'utf-8'
+            )
+        return word
+
+    @classmethod
+    def build(cls, frequencies: Dict[str, int], top_k: int = 10, prefix_length: int = 3) -> 'Lexicon':
+        ranked = sorted(frequencies.items(), key=lambda item: (-item[1], item[0]))
+
+        # Nested dict trie, each node is {char: child} plus the word ID under None
+        root: Dict = {}
+        for word_id, (word, _) in enumerate(ranked):
+            node = root
+            for char in word:
+                node = node.setdefault(char, {})
+            node[None] = word_id
+
+        # Breadth-first layout keeps each node's children contiguous
+        nodes, prefixes = [root], ['']
+        labels, child_start, child_count, word_ids = array('I', [0]), array('I'), array('I'), array('i')
+        for index, node in enumerate(nodes):
+            chars = sorted(char for char in node if char is not None)
+            child_start.append(len(nodes))
+            child_count.append(len(chars))
+            word_ids.append(node.get(None, -1))
+            for char in chars:
+                labels.append(ord(char))
+                nodes.append(node[char])
+                parent = prefixes[index]
+                prefixes.append(parent + char if parent is not None and len(parent) < prefix_length else None)
+
+        # Children always follow their parent, so a reverse pass sees them first
+        top_lists: List[List[int]] = [[] for _ in nodes]
+        for index in range(len(nodes) - 1, -1, -1):
+            candidates = [word_ids[index]] if word_ids[index] >= 0 else []
+            start = child_start[index]
+            for child in range(start, start + child_count[index]):
+                candidates.extend(top_lists[child])
+            top_lists[index] = heapq.nsmallest(top_k, candidates)
+
+        top = array('i', [-1]) * (len(nodes) * top_k)
+        for index, ids in enumerate(top_lists):
+            top[index * top_k:index * top_k + len(ids)] = array('i', ids)
+
+        # Power-of-two table at most half full
+        indexed = [(prefix_key(prefix), index) for index, prefix in enumerate(prefixes) if prefix]
+        indexed = [(key, index) for key, index in indexed if key]
+        slots = 1
+        while slots < 2 * len(indexed):
+            slots *= 2
+        shift = 64 - (slots.bit_length() - 1)
+        prefix_keys, prefix_nodes = array('Q', [0]) * slots, array('i', [-1]) * slots
+        for key, index in indexed:
+            slot = _slot(key, shift)
+            while prefix_keys[slot]:
+                slot = (slot + 1) & (slots - 1)
+            prefix_keys[slot], prefix_nodes[slot] = key, index
+
+        encoded = [word.encode('utf-8') for word, _ in ranked]
+        word_offsets = array('Q', [0])
+        for data in encoded:
+            word_offsets.append(word_offsets[-1] + len(data))
+
+        return cls(array('Q', (count for _, count in ranked)), word_offsets, b''.join(encoded),
+                   labels, child_start, child_count, word_ids, top, prefix_keys, prefix_nodes,
+                   top_k, prefix_length)
+
+    def _lookup_prefix(self, prefix: str) -> Optional[int]:
+        """Node index from the prefix table, None if the prefix is not indexed"""
+        if len(prefix) > self.prefix_length:
+            return None
+        key = prefix_key(prefix)
+        if not key:
+            return None
+        slot = _slot(key, self._prefix_shift)
+        mask = len(self.prefix_keys) - 1
+        while True:
+            stored = self.prefix_keys[slot]
+            if stored == key:
+                return self.prefix_nodes[slot]
+            if not stored:
+                return -1
+            slot = (slot + 1) & mask
+
+    def _find(self, prefix: str) -> int:
+        """Node index of a prefix, -1 if no word starts with it"""
+        if not prefix:
+            return 0
+        node = self._lookup_prefix(prefix)
+        if node is not None:
+            return node
+        node = 0
+        for char in prefix:
+            start = self.child_start[node]
+            end = start + self.child_count[node]
+            code = ord(char)
+            i = bisect_left(self.labels, code, start, end)
+            if i == end or self.labels[i] != code:
+                return -1
+            node = i
+        return node
+
+    def word_id(self, word: str) -> int:
+        """Rank of a word, -1 if it is not in the lexicon"""
+        node = self._find(word.lower())
+        return self.word_ids[node] if node >= 0 else -1
+
+    def completion_ids(self, prefix: str, limit: int = 5, per_child: int = 0) -> List[int]:
+        """IDs of the most frequent words starting with prefix, best first
+
+        With per_child set, that many cached completions of every child are
+        appended as well, for callers that rerank a wider candidate set than
+        the most frequent words.
+        """
+        node = self._find(prefix.lower())
+        if node < 0:
+            return []
+        base = node * self.top_k
+        ids = [word_id for word_id in self.top[base:base + min(limit, self.top_k)].tolist() if word_id >= 0]
+        if per_child:
+            seen = set(ids)
+            start = self.child_start[node]
+            for child in range(start, start + self.child_count[node]):
+                base = child * self.top_k
+                for word_id in self.top[base:base + min(per_child, self.top_k)].tolist():
+                    if word_id >= 0 and word_id not in seen:
+                        seen.add(word_id)
+                        ids.append(word_id)
+        return ids
+
+    def complete(self, prefix: str, limit: int = 5) -> List[str]:
+        """Most frequent words starting with prefix, best first"""
+        return [self.word(word_id) for word_id in self.completion_ids(prefix, limit)]
+
+    def fuzzy_complete(self, typed: str, costs: Optional[EditCosts] = None, max_cost: float = 1.0,
+                       limit: int = 5) -> List[str]:
+        """Words and completions within a weighted edit distance of typed, best first
+
+        Walks the trie carrying one row of the edit distance table per node
+        (a Levenshtein automaton evaluated on the fly), abandoning a branch as
+        soon as every cell of its row exceeds max_cost. A node whose prefix
+        matches all of typed contributes its own word at that cost and its
+        cached completions at COMPLETION_COST more; ties go to the more
+        frequent word.
+        """
+        typed = typed.lower()
+        costs = costs or EditCosts()
+        deletions = [costs.deletion(char, typed[i - 1] if i else '') for i, char in enumerate(typed)]
+        n = len(typed)
+        # Substitution costs of a trie character against every typed character
+        substitutions: Dict[str, List[float]] = {}
+
+        root_row = [0.0]
+        for cost in deletions:
+            root_row.append(root_row[-1] + cost)
+
+        best: Dict[int, float] = {}
+
+        def offer(word_id: int, cost: float):
+            if word_id >= 0 and cost < best.get(word_id, float('inf')):
+                best[word_id] = cost
+
+        stack = [(0, '', root_row)]
+        while stack:
+            node, previous, row = stack.pop()
+            if row[n] <= max_cost:
+                offer(self.word_ids[node], row[n])
+                base = node * self.top_k
+                for word_id in self.top[base:base + min(limit, self.top_k)].tolist():
+                    offer(word_id, row[n] + COMPLETION_COST)
+
+            start = self.child_start[node]
+            for child in range(start, start + self.child_count[node]):
+                char = chr(self.labels[child])
+                substitution = substitutions.get(char)
+                if substitution is None:
+                    substitution = substitutions[char] = [costs.substitution(t, char) for t in typed]
+                insertion = costs.insertion(char, previous)
+                new_row = [row[0] + insertion]
+                for i in range(1, n + 1):
+                    new_row.append(min(
+                        row[i - 1] + substitution[i - 1],
+                        row[i] + insertion,
+                        new_row[i - 1] + deletions[i - 1]
+                    ))
+                if min(new_row) <= max_cost:
+                    stack.append((child, char, new_row))
+
+        ranked = sorted(best.items(), key=lambda item: (item[1], item[0]))
+        return [self.word(word_id) for word_id, _ in ranked[:limit]]
+
+    def frequency(self, word: str) -> int:
+        node = self._find(word.lower())
+        if node < 0 or self.word_ids[node] < 0:
+            return 0
+        return self.counts[self.word_ids[node]]
+
+    def _sections(self):
+        return (('Q', self.counts), ('Q', self.word_offsets), ('I', self.labels), ('I', self.child_start),
+                ('I', self.child_count), ('i', self.word_ids), ('i', self.top), ('Q', self.prefix_keys),
+                ('i', self.prefix_nodes))
+
+    def save(self, path: str) -> None:
+        """Write the file, every section aligned so it can be cast in place"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.top_k, self.prefix_length, self.node_count,
+                                len(self), len(self.prefix_keys), len(self.word_blob)))
+            for _, section in self._sections():
+                data = bytes(section) if isinstance(section, memoryview) else section.tobytes()
+                f.write(data)
+                f.write(b'\0' * (-len(data) % ALIGNMENT))
+            f.write(bytes(self.word_blob))
+        # Readers mapping the old file keep their pages
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'Lexicon':
+        """Memory-map a lexicon file; pages are read on first access"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        magic, version, top_k, prefix_length, node_count, word_count, slots, blob_length = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} lexicon file")
+
+        offset = HEADER.size + (-HEADER.size % ALIGNMENT)
+        sections = []
+        for typecode, length in (('Q', word_count), ('Q', word_count + 1), ('I', node_count), ('I', node_count),
+                                 ('I', node_count), ('i', node_count), ('i', node_count * top_k),
+                                 ('Q', slots), ('i', slots)):
+            size = length * array(typecode).itemsize
+            sections.append(view[offset:offset + size].cast(typecode))
+            offset += size + (-size % ALIGNMENT)
+        word_blob = view[offset:offset + blob_length]
+
+        counts, word_offsets, labels, child_start, child_count, word_ids, top, prefix_keys, prefix_nodes = sections
+        lexicon = cls(counts, word_offsets, word_blob, labels, child_start, child_count, word_ids, top,
+                      prefix_keys, prefix_nodes, top_k, prefix_length)
+        lexicon._mmap = mapped
+        return lexicon
+
+
+class UserLexicon:
+    """One user's most used words, with the top completions of every prefix
+
+    Holds at most max_words words, so a completion is one dict lookup and
+    an update only re-sorts the short lists of the updated word's prefixes,
+    however long the user's history is. Counts only grow, so a word that
+    fell out of a prefix list returns to it when its own count increases.
+    """
+
+    def __init__(self, counts: Dict[str, int], top_k: int = 10, max_words: int = 500):
+        self.top_k = top_k
+        self.max_words = max_words
+        self.counts = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:max_words])
+        self._prefixes: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        for word in self.counts:
+            self._index(word)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def _rank(self, word: str):
+        return -self.counts[word], word
+
+    def _index(self, word: str) -> None:
+        for end in range(1, len(word) + 1):
+            top = self._prefixes.setdefault(word[:end], [])
+            if word not in top:
+                top.append(word)
+            top.sort(key=self._rank)
+            del top[self.top_k:]
+
+    def _evict(self, word: str) -> None:
+        del self.counts[word]
+        for end in range(1, len(word) + 1):
+            prefix = word[:end]
+            top = self._prefixes.get(prefix)
+            if top and word in top:
+                top.remove(word)
+                # Refill from the remaining words, bounded by max_words
+                for other in self.counts:
+                    if other.startswith(prefix) and other not in top:
+                        top.append(other)
+                top.sort(key=self._rank)
+                del top[self.top_k:]
+
+    def add(self, word: str, count: int = 1) -> None:
+        with self._lock:
+            if word not in self.counts and len(self.counts) >= self.max_words:
+                least = min(self.counts, key=lambda other: (self.counts[other], other))
+                if self.counts[least] > count:
+                    return
+                self._evict(least)
+            self.counts[word] = self.counts.get(word, 0) + count
+            self._index(word)
+
+    def complete(self, prefix: str, limit: int = 5) -> List[Tuple[str, int]]:
+        """(word, count) of the user's most used words starting with prefix"""
+        with self._lock:
+            return [(word, self.counts[word]) for word in self._prefixes.get(prefix.lower(), [])[:limit]]
+
+
+def build_lexicon_file(words_path: str, output_path: str, top_k: int = 10, prefix_length: int = 3) -> Lexicon:
+    lexicon = Lexicon.build(read_word_counts(words_path), top_k, prefix_length)
+    lexicon.save(output_path)
+    return lexicon
+
+
+def load_lexicon(path: Optional[str] = None, words_path: Optional[str] = None) -> Lexicon:
+    """Map the prebuilt lexicon, rebuilding it first if it is missing, outdated or older than the word list"""
+    path = path or Config.LEXICON_PATH
+    words_path = words_path or Config.LEXICON_WORDS_PATH
+    stale = not os.path.exists(path) or (
+        os.path.exists(words_path) and os.path.getmtime(words_path) > os.path.getmtime(path)
+    )
+    if not stale:
+        try:
+            return Lexicon.load(path)
+        except ValueError as e:
+            logger.warning(str(e))
+    logger.info(f"Building lexicon {path} from {words_path}")
+    build_lexicon_file(words_path, path, Config.LEXICON_TOP_K, Config.LEXICON_PREFIX_LENGTH)
+    return Lexicon.load(path)
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--words', default=Config.LEXICON_WORDS_PATH, help='"word count" per line')
+    parser.add_argument('--output', default=Config.LEXICON_PATH)
+    parser.add_argument('--top-k', type=int, default=Config.LEXICON_TOP_K, help='completions cached per node')
+    parser.add_argument('--prefix-length', type=int, default=Config.LEXICON_PREFIX_LENGTH,
+                        help='prefixes up to this length are looked up in O(1)')
+    args = parser.parse_args(argv)
+
+    lexicon = build_lexicon_file(args.words, args.output, args.top_k, args.prefix_length)
+    print(f"Wrote {len(lexicon):,} words, {lexicon.node_count:,} nodes, {len(lexicon.prefix_keys):,} prefix slots "
+          f"to {args.output} ({os.path.getsize(args.output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+LLM Gateway for GestureBridge AI
+Single entry point for chat-completion calls: one pooled HTTP client,
+shared rate limiting, retries with jitter, per-feature budgets and latency metrics
+"""
+
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config import Config
+from monitoring import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class LLMError(Exception):
+    """Base error raised by the LLM gateway"""
+
+
+class LLMUnavailable(LLMError):
+    """No LLM backend is configured"""
+
+
+class LLMRateLimited(LLMError):
+    """The shared rate limit could not be acquired in time"""
+
+
+class LLMBudgetExceeded(LLMError):
+    """A feature has used up its daily token budget"""
+
+
+class RetryableLLMError(LLMError):
+    """Transient backend failure that is safe to retry"""
+
+
+@dataclass
+class LLMResult:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+def estimate_tokens(messages: List[Dict]) -> int:
+    """Rough prompt size, about four characters per token"""
+    return sum(len(m.get('content') or '') for m in messages) // 4 + 1
+
+
+class TokenBucket:
+    """In-process token bucket shared by all threads of a worker"""
+
+    def __init__(self, rate_per_minute: int, capacity: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity or max(rate_per_minute, 1))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens if available, otherwise return seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens: float = 1, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self._reserve(tokens)
+            if wait == 0.0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise LLMRateLimited("LLM rate limit exceeded")
+            time.sleep(wait)
+
+
+class RedisTokenBucket(TokenBucket):
+    """Token bucket stored in Redis so the limit is shared across worker processes
+
+    While Redis is unreachable each worker falls back to its own in-process
+    bucket, so LLM calls keep working under a per-worker limit.
+    """
+
+    _SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) * 2 + 1)
+return tostring(wait)
+"""
+
+    def __init__(self, client, rate_per_minute: int, capacity: Optional[int] = None,
+                 key: str = 'gesturebridge:llm:bucket'):
+        super().__init__(rate_per_minute, capacity)
+        self.key = key
+        self._script = client.register_script(self._SCRIPT)
+        self.degraded = False
+        self.errors = 0
+
+    def _reserve(self, tokens: float) -> float:
+        try:
+            wait = float(self._script(keys=[self.key], args=[self.rate, self.capacity, time.time(), tokens]))
+        except redis.RedisError as e:
+            self.errors += 1
+            if not self.degraded:
+                self.degraded = True
+                logger.warning(f"Redis rate limiter unavailable, using local bucket: {str(e)}")
+            return super()._reserve(tokens)
+        if self.degraded:
+            self.degraded = False
+            logger.info("Redis rate limiter reachable again")
+        return wait
+
+
+class FeatureBudgets:
+    """Daily token budgets per feature (chat, feedback, streaming, training)"""
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = limits
+        self.used: Dict[str, int] = {}
+        self.day = date.today()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def parse(spec: str) -> Dict[str, int]:
+        """Parse 'chat=1000,feedback=500' into a dict"""
+        limits = {}
+        for item in (spec or '').split(','):
+            if '=' in item:
+                name, value = item.split('=', 1)
+                limits[name.strip()] = int(value)
+        return limits
+
+    def _roll_over(self) -> None:
+        today = date.today()
+        if today != self.day:
+            self.day = today
+            self.used = {}
+
+    def check(self, feature: str) -> None:
+        with self._lock:
+            self._roll_over()
+            limit = self.limits.get(feature)
+            if limit is not None and self.used.get(feature, 0) >= limit:
+                raise LLMBudgetExceeded(f"Daily LLM budget exhausted for '{feature}'")
+
+    def record(self, feature: str, tokens: int) -> None:
+        with self._lock:
+            self._roll_over()
+            self.used[feature] = self.used.get(feature, 0) + tokens
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            self._roll_over()
+            return {
+                feature: {'used': self.used.get(feature, 0), 'limit': self.limits.get(feature)}
+                for feature in set(self.limits) | set(self.used)
+            }
+
+
+class OpenAIBackend:
+    """OpenAI chat completions over a single pooled HTTP client"""
+
+    name = 'openai'
+
+    def __init__(self, api_key: str, model: str, base_url: Optional[str] = None,
+                 max_connections: int = 20, timeout: float = 30.0):
+        import httpx
+        import openai
+
+        self._openai = openai
+        self.model = model
+        self.client = openai.OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            max_retries=0,  # retries are handled by the gateway
+            http_client=httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                ),
+                timeout=timeout
+            )
+        )
+
+    def complete(self, messages: List[Dict], max_tokens: int, temperature: float) -> LLMResult:
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+        except (self._openai.RateLimitError, self._openai.APIConnectionError,
+                self._openai.APITimeoutError, self._openai.InternalServerError) as e:
+            raise RetryableLLMError(str(e)) from e
+
+        usage = response.usage
+        return LLMResult(
+            text=(response.choices[0].message.content or '').strip(),
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0
+        )
+
+    def stream(self, messages: List[Dict], max_tokens: int, temperature: float):
+        """Yield text deltas as they arrive and return the usage as an LLMResult
+
+        Closing the generator closes the HTTP response, which ends the
+        generation upstream.
+        """
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                stream_options={'include_usage': True}
+            )
+        except (self._openai.RateLimitError, self._openai.APIConnectionError,
+                self._openai.APITimeoutError, self._openai.InternalServerError) as e:
+            raise RetryableLLMError(str(e)) from e
+
+        usage = None
+        try:
+            for chunk in response:
+                usage = chunk.usage or usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            response.close()
+        return LLMResult(
+            text='',
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0
+        )
+
+
+class StubBackend:
+    """Local backend for offline development and tests"""
+
+    name = 'stub'
+
+    def __init__(self, responder: Optional[Callable[[List[Dict]], str]] = None, token_delay: float = 0.0):
+        self.responder = responder
+        self.token_delay = token_delay
+        self.calls: List[Dict] = []
+
+    def complete(self, messages: List[Dict], max_tokens: int, temperature: float) -> LLMResult:
+        self.calls.append({'messages': messages, 'max_tokens': max_tokens, 'temperature': temperature})
+        if self.responder:
+            text = self.responder(messages)
+        else:
+            user_messages = [m['content'] for m in messages if m.get('role') == 'user']
+            text = f"[stub] {user_messages[-1][:200] if user_messages else ''}"
+        prompt_tokens = sum(len(m.get('content', '').split()) for m in messages)
+        return LLMResult(text=text, prompt_tokens=prompt_tokens, completion_tokens=len(text.split()))
+
+    def stream(self, messages: List[Dict], max_tokens: int, temperature: float):
+        """The complete() response one word at a time, token_delay seconds apart"""
+        result = self.complete(messages, max_tokens, temperature)
+        words = result.text.split(' ')
+        for i, word in enumerate(words):
+            time.sleep(self.token_delay)
+            yield word if i == len(words) - 1 else f"{word} "
+        return result
+
+
+class LLMStream:
+    """Text deltas of a streaming completion, from LLMGateway.stream()
+
+    Holds one of the gateway's concurrency slots until it is exhausted or
+    closed, so readers must close it in a finally block. Closing it early
+    closes the backend stream, so generation stops and only the tokens
+    produced so far are recorded against the budget.
+    """
+
+    def __init__(self, gateway: 'LLMGateway', feature: str, chunks, first: Optional[str],
+                 prompt_tokens: int, started: float):
+        self.gateway = gateway
+        self.feature = feature
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = 0
+        self.closed = False
+        self._chunks = chunks
+        self._pending = [first] if first is not None else []
+        self._started = started
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        if self.closed:
+            raise StopIteration
+        if self._pending:
+            delta = self._pending.pop()
+        else:
+            try:
+                delta = next(self._chunks)
+            except StopIteration as e:
+                self._finish('completed', e.value)
+                raise
+            except Exception:
+                self._chunks.close()
+                self._finish('errors')
+                raise
+        self.completion_tokens += 1
+        return delta
+
+    def close(self) -> None:
+        # Called explicitly by the reader; not from __del__, which the garbage
+        # collector may run on another thread while this one is iterating
+        if not self.closed:
+            self._chunks.close()
+            self._finish('cancelled')
+
+    def _finish(self, outcome: str, result: Optional[LLMResult] = None) -> None:
+        self.closed = True
+        if result is not None and result.total_tokens:
+            self.prompt_tokens, self.completion_tokens = result.prompt_tokens, result.completion_tokens
+        self.gateway._end_stream(self.feature, outcome, self.prompt_tokens + self.completion_tokens, self._started)
+
+
+class LLMGateway:
+    """Rate-limited, budgeted access to the configured LLM backend"""
+
+    def __init__(self, backend=None, rate_limiter: Optional[TokenBucket] = None,
+                 max_concurrency: int = 8, max_retries: int = 3,
+                 budgets: Optional[Dict[str, int]] = None,
+                 retry_base_delay: float = 0.5, retry_max_delay: float = 8.0,
+                 acquire_timeout: float = 30.0):
+        self.backend = backend
+        self.rate_limiter = rate_limiter or TokenBucket(60)
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.acquire_timeout = acquire_timeout
+        self.budgets = FeatureBudgets(budgets or {})
+        self._concurrency = threading.BoundedSemaphore(max_concurrency)
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._first_token: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._metrics_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> 'LLMGateway':
+        backend = None
+        if Config.LLM_BACKEND == 'stub':
+            backend = StubBackend()
+        elif Config.OPENAI_API_KEY:
+            try:
+                backend = OpenAIBackend(
+                    api_key=Config.OPENAI_API_KEY,
+                    model=Config.OPENAI_MODEL,
+                    base_url=Config.OPENAI_BASE_URL,
+                    max_connections=Config.LLM_MAX_CONNECTIONS,
+                    timeout=Config.LLM_TIMEOUT
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize OpenAI backend: {str(e)}")
+
+        rate_limiter = None
+        if Config.REDIS_URL and redis is not None:
+            try:
+                rate_limiter = RedisTokenBucket(
+                    redis.Redis.from_url(Config.REDIS_URL),
+                    Config.LLM_RATE_LIMIT_PER_MINUTE
+                )
+            except Exception as e:
+                logger.warning(f"Redis rate limiter unavailable, using local bucket: {str(e)}")
+
+        return cls(
+            backend=backend,
+            rate_limiter=rate_limiter or TokenBucket(Config.LLM_RATE_LIMIT_PER_MINUTE),
+            max_concurrency=Config.LLM_MAX_CONCURRENCY,
+            max_retries=Config.LLM_MAX_RETRIES,
+            budgets=FeatureBudgets.parse(Config.LLM_FEATURE_BUDGETS),
+            acquire_timeout=Config.LLM_TIMEOUT
+        )
+
+    def configure_backend(self, backend) -> None:
+        """Swap the backend, e.g. to a StubBackend in tests"""
+        self.backend = backend
+
+    def is_enabled(self) -> bool:
+        return self.backend is not None
+
+    def _count(self, feature: str, name: str) -> None:
+        with self._metrics_lock:
+            counters = self._counters.setdefault(feature, {})
+            counters[name] = counters.get(name, 0) + 1
+
+    def _observe(self, feature: str, latency_ms: float, histograms: Optional[Dict] = None) -> None:
+        histograms = self._histograms if histograms is None else histograms
+        with self._metrics_lock:
+            histogram = histograms.setdefault(feature, LatencyHistogram())
+        histogram.observe(latency_ms)
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt)))
+
+    def complete(self, feature: str, messages: List[Dict], max_tokens: int = 300,
+                 temperature: float = 0.7) -> str:
+        """Run a chat completion for a feature and return the response text"""
+        return self.complete_result(feature, messages, max_tokens, temperature).text
+
+    def complete_result(self, feature: str, messages: List[Dict], max_tokens: int = 300,
+                        temperature: float = 0.7) -> LLMResult:
+        if self.backend is None:
+            raise LLMUnavailable("No LLM backend configured")
+
+        self.budgets.check(feature)
+        self._count(feature, 'requests')
+
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(timeout=self.acquire_timeout)
+            if not self._concurrency.acquire(timeout=self.acquire_timeout):
+                self._count(feature, 'rejected')
+                raise LLMRateLimited("Too many concurrent LLM requests")
+            started = time.perf_counter()
+            try:
+                result = self.backend.complete(messages, max_tokens, temperature)
+            except RetryableLLMError as e:
+                self._observe(feature, (time.perf_counter() - started) * 1000)
+                if attempt >= self.max_retries:
+                    self._count(feature, 'errors')
+                    raise
+                self._count(feature, 'retries')
+                logger.warning(f"LLM call for '{feature}' failed (attempt {attempt + 1}): {str(e)}")
+            except Exception:
+                self._count(feature, 'errors')
+                raise
+            else:
+                self._observe(feature, (time.perf_counter() - started) * 1000)
+                self.budgets.record(feature, result.total_tokens)
+                return result
+            finally:
+                self._concurrency.release()
+
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def stream(self, feature: str, messages: List[Dict], max_tokens: int = 300,
+               temperature: float = 0.7) -> LLMStream:
+        """Start a streaming chat completion for a feature
+
+        Waits for the first token, retrying transient failures like
+        complete(), so errors surface before anything is sent to the client.
+        The returned stream must be exhausted or closed to free its slot.
+        """
+        if self.backend is None:
+            raise LLMUnavailable("No LLM backend configured")
+
+        self.budgets.check(feature)
+        self._count(feature, 'requests')
+        self._count(feature, 'streams')
+
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(timeout=self.acquire_timeout)
+            if not self._concurrency.acquire(timeout=self.acquire_timeout):
+                self._count(feature, 'rejected')
+                raise LLMRateLimited("Too many concurrent LLM requests")
+            started = time.perf_counter()
+            chunks = self.backend.stream(messages, max_tokens, temperature)
+            try:
+                first = next(chunks, None)
+            except RetryableLLMError as e:
+                self._concurrency.release()
+                self._observe(feature, (time.perf_counter() - started) * 1000)
+                if attempt >= self.max_retries:
+                    self._count(feature, 'errors')
+                    raise
+                self._count(feature, 'retries')
+                logger.warning(f"LLM stream for '{feature}' failed (attempt {attempt + 1}): {str(e)}")
+            except Exception:
+                self._concurrency.release()
+                self._count(feature, 'errors')
+                raise
+            else:
+                self._observe(feature, (time.perf_counter() - started) * 1000, self._first_token)
+                return LLMStream(self, feature, chunks, first, estimate_tokens(messages), started)
+
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def _end_stream(self, feature: str, outcome: str, tokens: int, started: float) -> None:
+        self._concurrency.release()
+        self._observe(feature, (time.perf_counter() - started) * 1000)
+        if outcome != 'completed':
+            self._count(feature, outcome)
+        self.budgets.record(feature, tokens)
+
+    def get_metrics(self) -> Dict:
+        with self._metrics_lock:
+            features = set(self._histograms) | set(self._counters)
+            return {
+                'backend': self.backend.name if self.backend else None,
+                'budgets': self.budgets.snapshot(),
+                'features': {
+                    feature: {
+                        'counters': dict(self._counters.get(feature, {})),
+                        'latency': self._histograms[feature].snapshot() if feature in self._histograms else None,
+                        'first_token_latency': (self._first_token[feature].snapshot()
+                                                if feature in self._first_token else None)
+                    }
+                    for feature in features
+                }
+            }
+
+
+# Global instance
+llm_gateway = LLMGateway.from_config()
@@ -7,10 +7,9 @@ import logging
 from sklearn.model_selection import train_test_split
 from datetime import datetime
 from .model import SignLanguageModel
-import openai
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from config import Config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_gateway import llm_gateway
 
 # Set up logging
 logging.basicConfig(
@@ -135,12 +134,10 @@ def generate_synthetic_data_with_chatgpt(num_samples=100, language='ASL'):
         List of synthetic text samples
     """
     try:
-        if not Config.OPENAI_API_KEY:
+        if not llm_gateway.is_enabled():
             logger.warning("OpenAI API key not found, skipping synthetic data generation")
             return []
 
-        openai.api_key = Config.OPENAI_API_KEY
-
         synthetic_data = []
 
         # Generate data in batches to avoid token limits
@@ -160,8 +157,8 @@ Please provide realistic, varied examples including:
 Format each example as a simple sentence or phrase on a new line.
 Make them natural and conversational."""
 
-            response = openai.ChatCompletion.create(
-                model=Config.OPENAI_MODEL,
+            generated_text = llm_gateway.complete(
+                'training',
                 messages=[
                     {"role": "system", "content": f"You are a helpful assistant generating training data for {language} sign language recognition."},
                     {"role": "user", "content": prompt}
@@ -169,8 +166,6 @@ Make them natural and conversational."""
                 max_tokens=500,
                 temperature=0.7
             )
-
-            generated_text = response.choices[0].message.content.strip()
             lines = [line.strip() for line in generated_text.split('\n') if line.strip()]
 
             synthetic_data.extend(lines)
@@ -1,13 +1,31 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from bson import ObjectId
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 import logging
+import threading
+
+from cache import TTLCache
+from config import Config
+from database import analytics_timeout
+from lexicon import UserLexicon, tokenize
+from pagination import keyset_page, cached_total
+from translation_writer import create_translation_writer
 
 logger = logging.getLogger(__name__)
 
+def count_words(db, user_id, text):
+    """Count a committed translation's words towards the user's personal suggestions"""
+    if user_id and isinstance(text, str) and 'user_lexicons' in db.models:
+        db.get_model('user_lexicons').record_text(user_id, text)
+
 class BaseModel:
     """Base model class with common functionality"""
     
+    # Indexes per collection, kept next to the queries that use them and
+    # applied by indexes.ensure_indexes on startup
+    INDEXES = {}
+    
     def __init__(self, db):
         self.db = db
     
@@ -26,9 +44,23 @@ class BaseModel:
 class UserModel(BaseModel):
     """User model for managing user data"""
     
+    INDEXES = {
+        'users': [
+            # Login, registration and profile uniqueness checks
+            IndexModel([('email', ASCENDING)], unique=True),
+            IndexModel([('username', ASCENDING)], unique=True)
+        ]
+    }
+    
+    # Projections for the fields each route actually reads
+    PUBLIC_FIELDS = {'username': 1, 'email': 1, 'role': 1, 'created_at': 1}
+    LOGIN_FIELDS = {**PUBLIC_FIELDS, 'password': 1}
+    
     def __init__(self, db):
         super().__init__(db)
         self.collection = db.get_collection('users')
+        # Public fields of recently seen users, for JWT-protected routes
+        self._user_cache = TTLCache(maxsize=Config.USER_CACHE_SIZE, ttl=Config.USER_CACHE_TTL)
     
     def create_user(self, username, email, password_hash, additional_data=None):
         """Create a new user"""
@@ -54,6 +86,9 @@ class UserModel(BaseModel):
                 'total_translations': 0,
                 'total_sessions': 0,
                 'accuracy_rating': 0.0,
+                'confidence_sum': 0.0,
+                'rating_sum': 0,
+                'rating_count': 0,
                 'favorite_language': 'ASL'
             },
             'created_at': datetime.utcnow(),
@@ -66,16 +101,52 @@ class UserModel(BaseModel):
         result = self.collection.insert_one(user_data)
         return result.inserted_id
     
-    def get_user_by_id(self, user_id):
-        """Get user by ID"""
-        user = self.collection.find_one({'_id': ObjectId(user_id)})
+    def get_user_by_id(self, user_id, projection=None):
+        """Get user by ID, optionally limited to the projected fields"""
+        user = self.collection.find_one({'_id': ObjectId(user_id)}, projection)
+        return self.to_dict(user)
+    
+    def get_user_by_email(self, email, projection=None):
+        """Get user by email, optionally limited to the projected fields"""
+        user = self.collection.find_one({'email': email}, projection)
         return self.to_dict(user)
     
-    def get_user_by_email(self, email):
-        """Get user by email"""
-        user = self.collection.find_one({'email': email})
+    def get_user_by_username(self, username, projection=None):
+        """Get user by username, optionally limited to the projected fields"""
+        user = self.collection.find_one({'username': username}, projection)
         return self.to_dict(user)
     
+    def get_cached_user(self, user_id):
+        """Get the public fields of a user, served from a short-lived cache"""
+        user = self._user_cache.get(str(user_id))
+        if user is None:
+            user = self.get_user_by_id(user_id, self.PUBLIC_FIELDS)
+            if user is None:
+                return None
+            self._user_cache.set(str(user_id), user)
+        return dict(user)
+    
+    def cache_user(self, user):
+        """Prime the cache with a user document that was already fetched"""
+        self._user_cache.set(str(user['_id']), {
+            key: user[key] for key in ('_id', *self.PUBLIC_FIELDS) if key in user
+        })
+    
+    def get_role(self, user_id):
+        """Get a user's role via the cache, None if the user does not exist"""
+        user = self.get_cached_user(user_id)
+        return user.get('role', 'user') if user else None
+    
+    def invalidate_user(self, user_id):
+        self._user_cache.invalidate(str(user_id))
+    
+    def get_cache_stats(self):
+        return self._user_cache.get_stats()
+    
+    def list_users(self, projection=None):
+        """Get all users, optionally limited to the projected fields"""
+        return [self.to_dict(user) for user in self.collection.find({}, projection or self.PUBLIC_FIELDS)]
+    
     def update_user(self, user_id, update_data):
         """Update user data"""
         update_data['updated_at'] = datetime.utcnow()
@@ -83,17 +154,83 @@ class UserModel(BaseModel):
             {'_id': ObjectId(user_id)},
             {'$set': update_data}
         )
+        self.invalidate_user(user_id)
+        return result.modified_count > 0
+
+    def delete_user(self, user_id):
+        """Delete a user"""
+        result = self.collection.delete_one({'_id': ObjectId(user_id)})
+        self.invalidate_user(user_id)
+        return result.deleted_count > 0
+
+    def increment_statistics(self, user_id, increments):
+        """Apply $inc counters to the user's statistics subdocument"""
+        result = self.collection.update_one(
+            {'_id': ObjectId(user_id)},
+            {'$inc': {f'statistics.{key}': value for key, value in increments.items()}}
+        )
         return result.modified_count > 0
 
+    def get_statistics(self, user_id):
+        """Get materialized user statistics with running means derived from sums"""
+        user = self.collection.find_one({'_id': ObjectId(user_id)}, {'statistics': 1})
+        if not user:
+            return None
+        return summarize_statistics(user.get('statistics', {}))
+
 class TranslationModel(BaseModel):
     """Translation model for managing translation history"""
     
+    INDEXES = {
+        'translations': [
+            # get_user_translations keyset pages
+            IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)])
+        ]
+    }
+    
     def __init__(self, db):
         super().__init__(db)
         self.collection = db.get_collection('translations')
+        self.writer = create_translation_writer(self.collection, on_written=self._count_written)
+    
+    def create_translation(self, user_id, translation_data, sync=True):
+        """Create a new translation record
+
+        sync=False queues it for the next batch; the returned ID is valid
+        either way because IDs are generated client-side.
+        """
+        return self.insert_record(self._build_translation(user_id, translation_data), sync)
+    
+    def insert_record(self, record, sync=False):
+        """Persist an already built translation document through the batched writer
+
+        The translation is counted by _count_written once its batch is
+        written, so records the writer drops are never counted.
+        """
+        return self.writer.write(record, sync=sync)
+
+    def _count_written(self, records):
+        """Count persisted translations, the same rule the statistics reconciliation applies"""
+        for record in records:
+            self._count_translation(record)
+            count_words(self.db, record.get('user_id'), record.get('output_data') or record.get('input_text'))
     
-    def create_translation(self, user_id, translation_data):
-        """Create a new translation record"""
+    def _count_translation(self, record):
+        """$inc the statistics counters of the translation's user and language"""
+        if 'users' not in self.db.models:
+            return
+        confidence = float(record.get('confidence') or 0.0)
+        increments = {'total_translations': 1, 'confidence_sum': confidence}
+        try:
+            if record.get('user_id'):
+                self.db.get_model('users').increment_statistics(record['user_id'], increments)
+            if record.get('language'):
+                self.db.get_model('languages').increment_statistics(record['language'], increments)
+        except Exception as e:
+            logger.error(f"Error recording translation statistics: {str(e)}")
+
+    def _build_translation(self, user_id, translation_data):
+        """Build a new translation record document"""
         translation = {
             'user_id': ObjectId(user_id),
             'type': translation_data.get('type', 'video'),  # video, text, image, stream
@@ -117,49 +254,66 @@ class TranslationModel(BaseModel):
             'created_at': datetime.utcnow(),
             'updated_at': datetime.utcnow()
         }
-        
-        result = self.collection.insert_one(translation)
-        return result.inserted_id
+        return translation
     
-    def get_user_translations(self, user_id, page=1, per_page=10):
-        """Get paginated translations for a user"""
-        skip = (page - 1) * per_page
-        
-        translations = list(self.collection.find(
-            {'user_id': ObjectId(user_id)}
-        ).sort('created_at', DESCENDING).skip(skip).limit(per_page))
-        
-        total_count = self.collection.count_documents({'user_id': ObjectId(user_id)})
-        
-        return {
-            'translations': [self.to_dict(t) for t in translations],
-            'total': total_count,
-            'page': page,
-            'per_page': per_page,
-            'total_pages': (total_count + per_page - 1) // per_page
+    def get_user_translations(self, user_id, cursor=None, per_page=10, include_total=False, projection=None):
+        """Get a page of translations for a user, newest first"""
+        self.writer.flush()
+        query = {'user_id': ObjectId(user_id)}
+        page = keyset_page(self.collection, query, cursor, per_page, projection)
+
+        result = {
+            'translations': [self.to_dict(t) for t in page['items']],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'per_page': per_page
         }
+        if include_total:
+            result['total'] = cached_total(self.collection, query)
+        return result
 
     def update_feedback(self, translation_id, feedback_data):
-        """Update translation with feedback data"""
+        """Update translation with feedback data
+
+        Returns the translation's user_id and previous feedback as they were
+        before the update, or None if there is no such translation.
+        """
         update_data = {
             'feedback': feedback_data,
             'updated_at': datetime.utcnow()
         }
-        result = self.collection.update_one(
+        return self.collection.find_one_and_update(
             {'_id': ObjectId(translation_id)},
-            {'$set': update_data}
+            {'$set': update_data},
+            projection={'user_id': 1, 'feedback.accuracy_rating': 1},
+            return_document=ReturnDocument.BEFORE
         )
-        return result.modified_count > 0
 
 class FeedbackModel(BaseModel):
     """Feedback model for managing user feedback"""
     
+    INDEXES = {
+        'feedback': [
+            # get_user_feedback keyset pages
+            IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]),
+            # claim_pending_analysis work queue, oldest first; stale leases filtered in the index
+            IndexModel([('analysis_status', ASCENDING), ('created_at', ASCENDING), ('analysis_claimed_at', ASCENDING)])
+        ]
+    }
+    
     def __init__(self, db):
         super().__init__(db)
         self.collection = db.get_collection('feedback')
+        self._statistics_cache = TTLCache(maxsize=1, ttl=Config.FEEDBACK_STATS_CACHE_TTL)
+        self._statistics_lock = threading.Lock()
     
     def create_feedback(self, user_id, feedback_data):
         """Create a new feedback record"""
+        result = self.collection.insert_one(self._build_feedback(user_id, feedback_data))
+        return result.inserted_id
+    
+    def _build_feedback(self, user_id, feedback_data):
+        """Build a new feedback record document"""
         feedback = {
             'user_id': ObjectId(user_id),
             'type': feedback_data.get('type'),  # translation, accuracy, feature, bug, general
@@ -172,6 +326,9 @@ class FeedbackModel(BaseModel):
             'language': feedback_data.get('language'),
             'severity': feedback_data.get('severity', 'medium'),
             'status': 'pending',
+            'analysis_status': feedback_data.get('analysis_status', 'not_requested'),  # not_requested, pending, processing, completed, failed
+            'ai_analysis': None,
+            'analysis_attempts': 0,
             'metadata': {
                 'browser_info': feedback_data.get('browser_info'),
                 'device_info': feedback_data.get('device_info'),
@@ -186,31 +343,26 @@ class FeedbackModel(BaseModel):
             'created_at': datetime.utcnow(),
             'updated_at': datetime.utcnow()
         }
-        
-        result = self.collection.insert_one(feedback)
-        return result.inserted_id
+        return feedback
     
-    def get_user_feedback(self, user_id, page=1, per_page=10):
-        """Get paginated feedback for a user"""
-        skip = (page - 1) * per_page
-
-        feedback_list = list(self.collection.find(
-            {'user_id': ObjectId(user_id)}
-        ).sort('created_at', DESCENDING).skip(skip).limit(per_page))
+    def get_user_feedback(self, user_id, cursor=None, per_page=10, include_total=False, projection=None):
+        """Get a page of feedback for a user, newest first"""
+        query = {'user_id': ObjectId(user_id)}
+        page = keyset_page(self.collection, query, cursor, per_page, projection)
 
-        total_count = self.collection.count_documents({'user_id': ObjectId(user_id)})
-
-        return {
-            'feedback': [self.to_dict(f) for f in feedback_list],
-            'total': total_count,
-            'page': page,
-            'per_page': per_page,
-            'total_pages': (total_count + per_page - 1) // per_page
+        result = {
+            'feedback': [self.to_dict(f) for f in page['items']],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'per_page': per_page
         }
+        if include_total:
+            result['total'] = cached_total(self.collection, query)
+        return result
 
-    def get_feedback_by_id(self, feedback_id):
-        """Get feedback by ID"""
-        feedback = self.collection.find_one({'_id': ObjectId(feedback_id)})
+    def get_feedback_by_id(self, feedback_id, projection=None):
+        """Get feedback by ID, optionally limited to the projected fields"""
+        feedback = self.collection.find_one({'_id': ObjectId(feedback_id)}, projection)
         return self.to_dict(feedback)
 
     def update_feedback(self, feedback_id, update_data):
@@ -222,50 +374,79 @@ class FeedbackModel(BaseModel):
         )
         return result.modified_count > 0
 
-    def get_statistics(self):
-        """Get feedback statistics"""
+    def claim_pending_analysis(self, limit, worker_id, lease_seconds=300):
+        """Atomically claim feedback awaiting AI analysis for a background worker"""
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=lease_seconds)
+        claimed = []
+        for _ in range(limit):
+            feedback = self.collection.find_one_and_update(
+                {
+                    '$or': [
+                        {'analysis_status': 'pending'},
+                        # Reclaim work from workers that died mid-batch
+                        {'analysis_status': 'processing', 'analysis_claimed_at': {'$lt': stale_before}}
+                    ]
+                },
+                {
+                    '$set': {
+                        'analysis_status': 'processing',
+                        'analysis_claimed_by': worker_id,
+                        'analysis_claimed_at': now
+                    },
+                    '$inc': {'analysis_attempts': 1}
+                },
+                sort=[('created_at', ASCENDING)],
+                return_document=ReturnDocument.AFTER
+            )
+            if not feedback:
+                break
+            claimed.append(feedback)
+        return claimed
+
+    def get_statistics(self, use_cache=True):
+        """Get feedback statistics, served from a short-TTL cache"""
+        if not use_cache:
+            return self._compute_statistics()
+        with self._statistics_lock:
+            return self._statistics_cache.get_or_set('statistics', self._compute_statistics)
+
+    def _compute_statistics(self):
+        """Count ratings and types server-side so only small grouped results are returned"""
         pipeline = [
             {
-                '$group': {
-                    '_id': None,
-                    'total_feedback': {'$sum': 1},
-                    'average_rating': {'$avg': '$rating'},
-                    'rating_distribution': {
-                        '$push': '$rating'
-                    },
-                    'type_distribution': {
-                        '$push': '$type'
-                    }
+                '$facet': {
+                    'overall': [
+                        {
+                            '$group': {
+                                '_id': None,
+                                'total_feedback': {'$sum': 1},
+                                'average_rating': {'$avg': '$rating'}
+                            }
+                        }
+                    ],
+                    'ratings': [
+                        {'$match': {'rating': {'$ne': None}}},
+                        {'$group': {'_id': '$rating', 'count': {'$sum': 1}}}
+                    ],
+                    'types': [
+                        {'$match': {'type': {'$nin': [None, '']}}},
+                        {'$group': {'_id': '$type', 'count': {'$sum': 1}}}
+                    ]
                 }
             }
         ]
 
-        result = list(self.collection.aggregate(pipeline))
-        if result:
-            stats = result[0]
-            # Count rating distribution
-            rating_counts = {}
-            for rating in stats.get('rating_distribution', []):
-                if rating is not None:
-                    rating_counts[rating] = rating_counts.get(rating, 0) + 1
-
-            # Count type distribution
-            type_counts = {}
-            for feedback_type in stats.get('type_distribution', []):
-                if feedback_type:
-                    type_counts[feedback_type] = type_counts.get(feedback_type, 0) + 1
+        with analytics_timeout():
+            result = list(self.db.get_collection('feedback', analytics=True).aggregate(pipeline))
+        facets = result[0] if result else {}
+        overall = facets.get('overall') or [{}]
 
-            return {
-                'total_feedback': stats.get('total_feedback', 0),
-                'average_rating': round(stats.get('average_rating', 0), 2),
-                'rating_distribution': rating_counts,
-                'type_distribution': type_counts
-            }
         return {
-            'total_feedback': 0,
-            'average_rating': 0.0,
-            'rating_distribution': {},
-            'type_distribution': {}
+            'total_feedback': overall[0].get('total_feedback', 0),
+            'average_rating': round(overall[0].get('average_rating') or 0, 2),
+            'rating_distribution': {r['_id']: r['count'] for r in facets.get('ratings', [])},
+            'type_distribution': {t['_id']: t['count'] for t in facets.get('types', [])}
         }
 
     def add_vote(self, feedback_id, user_id):
@@ -300,12 +481,39 @@ class FeedbackModel(BaseModel):
 class StreamingSessionModel(BaseModel):
     """Streaming session model for managing real-time sessions"""
     
+    INDEXES = {
+        'streaming_sessions': [
+            # get_session, record_frame, update_session, end_session
+            IndexModel([('session_id', ASCENDING)], unique=True),
+            # get_user_sessions, with and without a status filter
+            IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]),
+            IndexModel([('user_id', ASCENDING), ('status', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)])
+        ],
+        'session_translations': [
+            # get_session_translations keyset pages
+            IndexModel([('session_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)])
+        ]
+    }
+    
+    # Fields read on the per-frame hot path and when stopping a session
+    FRAME_FIELDS = {'user_id': 1, 'status': 1, 'language': 1, 'statistics.total_frames': 1}
+    STOP_FIELDS = {'user_id': 1, 'status': 1, 'statistics': 1, 'created_at': 1}
+    OWNER_FIELDS = {'user_id': 1}
+    
     def __init__(self, db):
         super().__init__(db)
         self.collection = db.get_collection('streaming_sessions')
+        # Per-frame translations live in their own collection so session documents stay small
+        self.translations_collection = db.get_collection('session_translations')
+        self.frame_writer = create_translation_writer(self.translations_collection)
     
     def create_session(self, user_id, session_data):
         """Create a new streaming session"""
+        result = self.collection.insert_one(self._build_session(user_id, session_data))
+        return result.inserted_id
+    
+    def _build_session(self, user_id, session_data):
+        """Build a new streaming session document"""
         session = {
             'user_id': ObjectId(user_id),
             'session_id': session_data.get('session_id'),
@@ -315,10 +523,10 @@ class StreamingSessionModel(BaseModel):
             'statistics': {
                 'total_frames': 0,
                 'total_translations': 0,
+                'confidence_sum': 0.0,
                 'average_confidence': 0.0,
                 'duration_seconds': 0
             },
-            'translations': [],
             'metadata': {
                 'device_type': session_data.get('device_type'),
                 'browser': session_data.get('browser'),
@@ -326,12 +534,99 @@ class StreamingSessionModel(BaseModel):
             },
             'created_at': datetime.utcnow(),
             'updated_at': datetime.utcnow(),
-            'ended_at': None
+            'ended_at': None,
+            # Text of the latest frame, counted towards the user lexicon once it changes
+            'last_text': None
         }
-        
-        result = self.collection.insert_one(session)
-        return result.inserted_id
+        return session
     
+    def get_session(self, session_id, projection=None):
+        """Get streaming session by session ID, optionally limited to the projected fields"""
+        return self.collection.find_one({'session_id': session_id}, projection)
+
+    def record_frame(self, session_id, user_id, translation):
+        """Record a processed frame, keeping session statistics as running counters
+
+        A word held in front of the camera is recognized on many frames, so
+        the recognized text only counts towards the user lexicon once it is
+        committed: when the next frame recognizes something else, or the
+        session ends.
+        """
+        self.frame_writer.write(self._build_frame(session_id, user_id, translation))
+        previous = self.collection.find_one_and_update(
+            {'session_id': session_id}, self._frame_update(translation),
+            projection={'last_text': 1}, return_document=ReturnDocument.BEFORE
+        )
+        count_words(self.db, user_id, self._committed_text(previous, translation))
+        return previous is not None
+
+    def _build_frame(self, session_id, user_id, translation):
+        """Build a session translation document for a processed frame"""
+        return {
+            'session_id': session_id,
+            'user_id': ObjectId(user_id),
+            'text': translation.get('text'),
+            'refined_text': translation.get('refined_text'),
+            'confidence': translation.get('confidence', 0.0),
+            'timestamp': translation.get('timestamp'),
+            'created_at': datetime.utcnow()
+        }
+
+    @staticmethod
+    def _frame_text(translation):
+        return translation.get('refined_text') or translation.get('text')
+
+    def _frame_update(self, translation):
+        """Running counter update applied to the session for each frame"""
+        return {
+            '$inc': {
+                'statistics.total_frames': 1,
+                'statistics.total_translations': 1,
+                'statistics.confidence_sum': translation.get('confidence', 0.0)
+            },
+            '$set': {'updated_at': datetime.utcnow(), 'last_text': self._frame_text(translation)}
+        }
+
+    def _committed_text(self, previous, translation):
+        """The previous frame's text if this frame replaced it, else None"""
+        last_text = (previous or {}).get('last_text')
+        if last_text and last_text != self._frame_text(translation):
+            return last_text
+        return None
+
+    def get_session_translations(self, session_id, cursor=None, per_page=50):
+        """Get a page of translations recorded during a session, newest first"""
+        self.frame_writer.flush()
+        page = keyset_page(self.translations_collection, {'session_id': session_id}, cursor, per_page)
+        return {
+            'translations': [self.to_dict(t) for t in page['items']],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'per_page': per_page
+        }
+
+    @staticmethod
+    def _sessions_query(user_id, status):
+        query = {'user_id': ObjectId(user_id)}
+        if status and status != 'all':
+            query['status'] = status
+        return query
+
+    def get_user_sessions(self, user_id, status='active', cursor=None, per_page=10, include_total=False):
+        """Get a page of streaming sessions for a user, newest first"""
+        query = self._sessions_query(user_id, status)
+        page = keyset_page(self.collection, query, cursor, per_page, projection={'translations': 0})
+
+        result = {
+            'sessions': [self.to_dict(session) for session in page['items']],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'per_page': per_page
+        }
+        if include_total:
+            result['total'] = cached_total(self.collection, query)
+        return result
+
     def update_session(self, session_id, update_data):
         """Update streaming session"""
         update_data['updated_at'] = datetime.utcnow()
@@ -342,36 +637,115 @@ class StreamingSessionModel(BaseModel):
         return result.modified_count > 0
     
     def end_session(self, session_id, final_stats):
-        """End a streaming session"""
+        """End a streaming session, committing the text of its last frame"""
+        previous = self.collection.find_one_and_update(
+            {'session_id': session_id},
+            {'$set': self._end_session_update(final_stats)},
+            projection={'user_id': 1, 'last_text': 1}, return_document=ReturnDocument.BEFORE
+        )
+        if previous:
+            count_words(self.db, previous['user_id'], previous.get('last_text'))
+        return previous is not None
+
+    @staticmethod
+    def _end_session_update(final_stats):
         update_data = {
             'status': 'completed',
             'ended_at': datetime.utcnow(),
             'updated_at': datetime.utcnow(),
-            'statistics': final_stats
+            'last_text': None
         }
-        
-        result = self.collection.update_one(
-            {'session_id': session_id},
-            {'$set': update_data}
-        )
-        return result.modified_count > 0
+        for key, value in final_stats.items():
+            update_data[f'statistics.{key}'] = value
+        return update_data
 
 class AnalyticsModel(BaseModel):
-    """Analytics model for tracking usage and performance"""
+    """Analytics model for tracking usage and performance
+    
+    Events are stored in a MongoDB time-series collection (timeField
+    'timestamp', metaField 'meta' = {user_id, event_type}) and counted into
+    per-minute rollups for dashboards.
+    """
+    
+    # The time-series collection is clustered on (meta, timestamp) and its
+    # retention indexes are managed by ensure_timeseries
+    INDEXES = {
+        'analytics_rollups': [
+            # flush_rollups upserts and get_rollups range scans
+            IndexModel([('minute', ASCENDING), ('event_type', ASCENDING), ('event_name', ASCENDING)], unique=True),
+            IndexModel([('minute', ASCENDING)], expireAfterSeconds=Config.ANALYTICS_ROLLUP_RETENTION_DAYS * 86400),
+            # get_rollups for one event type, without scanning the other types' minutes
+            IndexModel([('event_type', ASCENDING), ('minute', ASCENDING)])
+        ]
+    }
+    
+    ROLLUP_FLUSH_INTERVAL = 10  # seconds
     
     def __init__(self, db):
         super().__init__(db)
         self.collection = db.get_collection('analytics')
+        self.rollups = db.get_collection('analytics_rollups')
+        # Dashboard reads may be served by secondaries
+        self.rollups_reader = db.get_collection('analytics_rollups', analytics=True)
+        self._rollup_buffer = {}
+        self._rollup_lock = threading.Lock()
+        self._last_flush = datetime.utcnow()
+    
+    def ensure_timeseries(self):
+        """Create the analytics time-series collection and per-event-type TTL indexes"""
+        database = self.collection.database
+        if 'analytics' not in database.list_collection_names():
+            try:
+                database.create_collection(
+                    'analytics',
+                    timeseries={'timeField': 'timestamp', 'metaField': 'meta', 'granularity': 'seconds'},
+                    expireAfterSeconds=Config.ANALYTICS_RETENTION_DAYS * 86400
+                )
+                logger.info("Created analytics time-series collection")
+            except Exception as e:
+                # Time-series collections need MongoDB 5.0+
+                logger.warning(f"Could not create analytics time-series collection: {str(e)}")
+                return False
+        else:
+            options = database['analytics'].options()
+            if 'timeseries' not in options:
+                logger.warning("Analytics collection is not a time-series collection, "
+                               "run backend/scripts/migrate_analytics_timeseries.py")
+                return False
+        
+        # Shorter retention for high-volume event types (MongoDB 6.3+ partial TTL on metaField)
+        for event_type, days in parse_retention(Config.ANALYTICS_RETENTION_BY_TYPE).items():
+            try:
+                self.collection.create_index(
+                    [('timestamp', ASCENDING)],
+                    name=f'ttl_{event_type}',
+                    expireAfterSeconds=days * 86400,
+                    partialFilterExpression={'meta.event_type': event_type}
+                )
+            except Exception as e:
+                logger.warning(f"Could not create retention index for '{event_type}' events: {str(e)}")
+        return True
     
     def log_event(self, user_id, event_data):
         """Log an analytics event"""
-        event = {
-            'user_id': ObjectId(user_id) if user_id else None,
-            'event_type': event_data.get('event_type'),
+        event = self._build_event(user_id, event_data)
+        result = self.collection.insert_one(event)
+        if self._count_rollup(event):
+            self.flush_rollups()
+        return result.inserted_id
+    
+    def _build_event(self, user_id, event_data):
+        """Build a time-series analytics event document"""
+        now = datetime.utcnow()
+        return {
+            'timestamp': now,
+            'meta': {
+                'user_id': ObjectId(user_id) if user_id else None,
+                'event_type': event_data.get('event_type')
+            },
             'event_name': event_data.get('event_name'),
             'properties': event_data.get('properties', {}),
             'session_id': event_data.get('session_id'),
-            'timestamp': datetime.utcnow(),
             'metadata': {
                 'user_agent': event_data.get('user_agent'),
                 'ip_address': event_data.get('ip_address'),
@@ -379,13 +753,220 @@ class AnalyticsModel(BaseModel):
                 'page_url': event_data.get('page_url')
             }
         }
+    
+    def _count_rollup(self, event):
+        """Buffer the event's per-minute count; returns True when a flush is due"""
+        timestamp = event['timestamp']
+        minute = timestamp.replace(second=0, microsecond=0)
+        with self._rollup_lock:
+            key = (minute, event['meta']['event_type'], event['event_name'])
+            self._rollup_buffer[key] = self._rollup_buffer.get(key, 0) + 1
+            return (timestamp - self._last_flush).total_seconds() >= self.ROLLUP_FLUSH_INTERVAL
+    
+    def _drain_rollups(self):
+        """Take the buffered counts as $inc upserts"""
+        with self._rollup_lock:
+            buffer, self._rollup_buffer = self._rollup_buffer, {}
+            self._last_flush = datetime.utcnow()
+        return [
+            UpdateOne(
+                {'minute': minute, 'event_type': event_type, 'event_name': event_name},
+                {'$inc': {'count': count}},
+                upsert=True
+            )
+            for (minute, event_type, event_name), count in buffer.items()
+        ]
+    
+    def flush_rollups(self):
+        """Write buffered per-minute counts to the rollup collection"""
+        operations = self._drain_rollups()
+        if operations:
+            self.rollups.bulk_write(operations, ordered=False)
+        return len(operations)
+    
+    @staticmethod
+    def _rollups_query(start, end, event_type=None):
+        query = {'minute': {'$gte': start, '$lt': end}}
+        if event_type:
+            query['event_type'] = event_type
+        return query
+    
+    def get_rollups(self, start, end, event_type=None):
+        """Get per-minute event counts for a dashboard time range"""
+        self.flush_rollups()
+        rollups = self.rollups_reader.find(self._rollups_query(start, end, event_type), {'_id': 0}).sort('minute', ASCENDING)
+        return [
+            {**r, 'minute': r['minute'].isoformat()}
+            for r in rollups
+        ]
+    
+    def rebuild_rollups(self, start, end):
+        """Recompute rollups for a time range from the raw events"""
+        pipeline = [
+            {'$match': {'timestamp': {'$gte': start, '$lt': end}}},
+            {'$group': {
+                '_id': {
+                    'minute': {'$dateTrunc': {'date': '$timestamp', 'unit': 'minute'}},
+                    'event_type': '$meta.event_type',
+                    'event_name': '$event_name'
+                },
+                'count': {'$sum': 1}
+            }}
+        ]
+        with analytics_timeout():
+            operations = [
+                UpdateOne(
+                    {'minute': r['_id']['minute'], 'event_type': r['_id']['event_type'], 'event_name': r['_id']['event_name']},
+                    {'$set': {'count': r['count']}},
+                    upsert=True
+                )
+                # The counts are $set back, so aggregate the primary's events
+                for r in self.db.get_collection('analytics', primary=True).aggregate(pipeline)
+            ]
+            if operations:
+                self.rollups.bulk_write(operations, ordered=False)
+        return len(operations)
+
+def parse_retention(spec):
+    """Parse 'streaming=7,feedback=365' into {event_type: days}"""
+    retention = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            event_type, days = item.split('=', 1)
+            retention[event_type.strip()] = int(days)
+    return retention
+
+class UserLexiconModel(BaseModel):
+    """Counts of the words each user has committed, for personalized suggestions
+
+    Counts are buffered and written as $inc upserts like the analytics
+    rollups. The most used words of recently active users are kept in memory
+    as UserLexicon overlays, updated in place as translations are recorded.
+    """
+    
+    INDEXES = {
+        'user_words': [
+            # flush_words upserts
+            IndexModel([('user_id', ASCENDING), ('word', ASCENDING)], unique=True),
+            # _load_lexicon reads the most used words
+            IndexModel([('user_id', ASCENDING), ('count', DESCENDING)])
+        ]
+    }
+    
+    FLUSH_INTERVAL = 10  # seconds
+    MAX_WORD_LENGTH = 32
+    
+    def __init__(self, db):
+        super().__init__(db)
+        self.collection = db.get_collection('user_words')
+        self._buffer = {}
+        self._lock = threading.Lock()
+        self._last_flush = datetime.utcnow()
+        # Overlays of recently active users, reloaded after USER_LEXICON_TTL
+        self._lexicons = TTLCache(Config.USER_LEXICON_CACHE_SIZE, Config.USER_LEXICON_TTL)
+    
+    def record_text(self, user_id, text):
+        """Count the words of a committed translation, returns how many were counted"""
+        user_id = str(user_id)
+        words, due = self._buffer_words(user_id, text)
+        if not words:
+            return 0
         
-        result = self.collection.insert_one(event)
-        return result.inserted_id
+        lexicon = self._lexicons.get(user_id, count=False)
+        if lexicon is not None:
+            for word in words:
+                lexicon.add(word)
+        if due:
+            self.flush_words()
+        return len(words)
+    
+    def _buffer_words(self, user_id, text):
+        """Add the text's words to the buffer; returns them and whether a flush is due"""
+        words = [word for word in tokenize(text) if len(word) <= self.MAX_WORD_LENGTH]
+        if not words:
+            return words, False
+        with self._lock:
+            for word in words:
+                self._buffer[user_id, word] = self._buffer.get((user_id, word), 0) + 1
+            return words, (datetime.utcnow() - self._last_flush).total_seconds() >= self.FLUSH_INTERVAL
+    
+    def _drain_words(self):
+        """Take the buffered counts, as ([((user_id, word), count)], $inc upserts)"""
+        with self._lock:
+            buffer, self._buffer = self._buffer, {}
+            self._last_flush = datetime.utcnow()
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {'user_id': ObjectId(user_id), 'word': word},
+                {'$inc': {'count': count}, '$set': {'updated_at': now}},
+                upsert=True
+            )
+            for (user_id, word), count in buffer.items()
+        ]
+        return list(buffer.items()), operations
+    
+    def _restore_words(self, counts, error):
+        """Put back the counts of a failed flush, so the next flush retries them
+        
+        After a BulkWriteError only the failed upserts are put back; the others
+        were applied.
+        """
+        if isinstance(error, BulkWriteError):
+            counts = [counts[e['index']] for e in error.details.get('writeErrors', [])]
+        logger.error(f"Error flushing {len(counts)} user word counts: {str(error)}")
+        with self._lock:
+            for key, count in counts:
+                self._buffer[key] = self._buffer.get(key, 0) + count
+    
+    def flush_words(self):
+        """Write buffered word counts; failed counts stay buffered for the next flush"""
+        counts, operations = self._drain_words()
+        if not operations:
+            return 0
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            self._restore_words(counts, e)
+            return 0
+        return len(operations)
+    
+    def get_lexicon(self, user_id):
+        """The user's UserLexicon overlay, loaded on first use"""
+        user_id = str(user_id)
+        return self._lexicons.get_or_set(user_id, lambda: self._load_lexicon(user_id))
+    
+    def _load_lexicon(self, user_id):
+        self.flush_words()
+        words = self.collection.find(
+            {'user_id': ObjectId(user_id)}, {'_id': 0, 'word': 1, 'count': 1}
+        ).sort('count', DESCENDING).limit(Config.USER_LEXICON_SIZE)
+        return UserLexicon(
+            {w['word']: w['count'] for w in words}, Config.LEXICON_TOP_K, Config.USER_LEXICON_SIZE
+        )
+    
+    def delete_user(self, user_id):
+        """Forget a user's word counts"""
+        user_id = str(user_id)
+        with self._lock:
+            self._buffer = {key: count for key, count in self._buffer.items() if key[0] != user_id}
+        self._lexicons.invalidate(user_id)
+        return self.collection.delete_many({'user_id': ObjectId(user_id)}).deleted_count
+    
+    def get_cache_stats(self):
+        return self._lexicons.get_stats()
 
 class LanguageModel(BaseModel):
     """Language model for managing supported languages"""
     
+    INDEXES = {
+        'languages': [
+            IndexModel([('code', ASCENDING)], unique=True),
+            # get_supported_languages
+            IndexModel([('is_active', ASCENDING)])
+        ]
+    }
+    
     def __init__(self, db):
         super().__init__(db)
         self.collection = db.get_collection('languages')
@@ -414,53 +995,28 @@ class LanguageModel(BaseModel):
         result = self.collection.insert_one(language)
         return result.inserted_id
 
+    def increment_statistics(self, code, increments):
+        """Apply $inc counters to a language document"""
+        result = self.collection.update_one(
+            {'code': code},
+            {'$inc': increments}
+        )
+        return result.modified_count > 0
+
+def summarize_statistics(statistics):
+    """Derive running means from the $inc-maintained sums and counts"""
+    total_translations = statistics.get('total_translations', 0)
+    rating_count = statistics.get('rating_count', 0)
+    return {
+        'total_translations': total_translations,
+        'total_sessions': statistics.get('total_sessions', 0),
+        'average_confidence': round(statistics.get('confidence_sum', 0) / total_translations, 4) if total_translations else 0.0,
+        'accuracy_rating': round(statistics.get('rating_sum', 0) / rating_count, 2) if rating_count else 0.0,
+        'rating_count': rating_count,
+        'favorite_language': statistics.get('favorite_language', 'ASL')
+    }
+
 def create_database_indexes(db):
     """Create all necessary database indexes"""
-    try:
-        # Users collection indexes
-        users = db.get_collection('users')
-        users.create_index('email', unique=True)
-        users.create_index('username', unique=True)
-        users.create_index('created_at')
-        users.create_index('last_login')
-        
-        # Translations collection indexes
-        translations = db.get_collection('translations')
-        translations.create_index('user_id')
-        translations.create_index('created_at')
-        translations.create_index('language')
-        translations.create_index('type')
-        translations.create_index([('user_id', ASCENDING), ('created_at', DESCENDING)])
-        
-        # Feedback collection indexes
-        feedback = db.get_collection('feedback')
-        feedback.create_index('user_id')
-        feedback.create_index('type')
-        feedback.create_index('status')
-        feedback.create_index('created_at')
-        feedback.create_index('translation_id')
-        
-        # Streaming sessions collection indexes
-        streaming_sessions = db.get_collection('streaming_sessions')
-        streaming_sessions.create_index('user_id')
-        streaming_sessions.create_index('session_id', unique=True)
-        streaming_sessions.create_index('status')
-        streaming_sessions.create_index('created_at')
-        
-        # Analytics collection indexes
-        analytics = db.get_collection('analytics')
-        analytics.create_index('user_id')
-        analytics.create_index('event_type')
-        analytics.create_index('timestamp')
-        analytics.create_index('session_id')
-        
-        # Languages collection indexes
-        languages = db.get_collection('languages')
-        languages.create_index('code', unique=True)
-        languages.create_index('is_active')
-        
-        logger.info("All database indexes created successfully")
-        
-    except Exception as e:
-        logger.error(f"Error creating database indexes: {str(e)}")
-        raise
+    from indexes import ensure_indexes
+    return ensure_indexes(db)
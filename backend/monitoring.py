@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Monitoring for GestureBridge AI
+Latency histograms and a MongoDB connection pool listener reporting checkout
+wait times, in-use connections and pool exhaustion
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds"""
+
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self, buckets_ms: Optional[Sequence[float]] = None):
+        if buckets_ms is not None:
+            self.BUCKETS_MS = tuple(buckets_ms)
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, latency_ms: float) -> None:
+        index = len(self.BUCKETS_MS)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if latency_ms <= bound:
+                index = i
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.total += 1
+            self.sum_ms += latency_ms
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bucket bound containing the given percentile"""
+        if not self.total:
+            return None
+        rank = p * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return float(self.BUCKETS_MS[i]) if i < len(self.BUCKETS_MS) else float('inf')
+        return float('inf')
+
+    def snapshot(self) -> Dict:
+        buckets = {f"le_{bound}": count for bound, count in zip(self.BUCKETS_MS, self.counts)}
+        buckets['le_inf'] = self.counts[-1]
+        return {
+            'count': self.total,
+            'average_ms': round(self.sum_ms / self.total, 2) if self.total else 0.0,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'buckets': buckets
+        }
+
+
+class _PoolState:
+    def __init__(self):
+        self.max_pool_size = None
+        self.open = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.cleared = 0
+        self.wait = LatencyHistogram(PoolMetricsListener.WAIT_BUCKETS_MS)
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Connection pool utilization per server, for MongoClient(event_listeners=[...])"""
+
+    WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+    EXHAUSTION_LOG_INTERVAL = 60  # seconds
+
+    def __init__(self, name: str = 'mongo'):
+        self.name = name
+        self._pools: Dict[str, _PoolState] = {}
+        self._lock = threading.Lock()
+        self._last_exhaustion_log = 0.0
+
+    def _pool(self, address) -> _PoolState:
+        key = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _PoolState()
+        return pool
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address).max_pool_size = event.options.get('maxPoolSize')
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address).cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address).open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.open = max(0, pool.open - 1)
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.waiting += 1
+            pool.max_waiting = max(pool.max_waiting, pool.waiting)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.waiting = max(0, pool.waiting - 1)
+            pool.in_use += 1
+            pool.max_in_use = max(pool.max_in_use, pool.in_use)
+            pool.checkouts += 1
+        if event.duration is not None:
+            pool.wait.observe(event.duration * 1000)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.waiting = max(0, pool.waiting - 1)
+            pool.checkout_failures[event.reason] = pool.checkout_failures.get(event.reason, 0) + 1
+            exhausted = event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT
+            now = time.monotonic()
+            log = exhausted and now - self._last_exhaustion_log >= self.EXHAUSTION_LOG_INTERVAL
+            if log:
+                self._last_exhaustion_log = now
+        if event.duration is not None:
+            pool.wait.observe(event.duration * 1000)
+        if log:
+            logger.warning(f"MongoDB pool exhausted for {event.address}: {pool.in_use} connections in use, "
+                           f"{pool.waiting} waiting (maxPoolSize={pool.max_pool_size})")
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.in_use = max(0, pool.in_use - 1)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                address: {
+                    'max_pool_size': pool.max_pool_size,
+                    'open_connections': pool.open,
+                    'in_use': pool.in_use,
+                    'max_in_use': pool.max_in_use,
+                    'waiting': pool.waiting,
+                    'max_waiting': pool.max_waiting,
+                    'utilization': round(pool.in_use / pool.max_pool_size, 4) if pool.max_pool_size else None,
+                    'checkouts': pool.checkouts,
+                    'checkout_failures': dict(pool.checkout_failures),
+                    'pool_cleared': pool.cleared,
+                    'checkout_wait': pool.wait.snapshot()
+                }
+                for address, pool in self._pools.items()
+            }
+
+
+# Global instances for the sync (pymongo) and async (motor) clients
+pool_metrics = PoolMetricsListener('pymongo')
+async_pool_metrics = PoolMetricsListener('motor')
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+N-gram Model for GestureBridge AI
+Unigram, bigram and trigram counts over lexicon word IDs, used to rerank
+prefix completions by the words signed before them. Counts are quantized to
+one byte on a logarithmic scale and stored in an open-addressing hash table
+of flat arrays, serialized to a file that is memory-mapped like the lexicon.
+
+Scores use stupid backoff: the relative frequency under the longest context
+seen in the corpus, discounted by BACKOFF for every word of context dropped.
+
+Usage:
+    python backend/ngram.py                          # rebuild data/ngrams.bin
+    python backend/ngram.py corpus/*.txt --output ngrams.bin
+
+The model is keyed by lexicon word IDs, so it is rebuilt whenever the
+lexicon changes (checked through a checksum of the lexicon's word list).
+"""
+
+import argparse
+import glob
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config import Config
+from lexicon import Lexicon, _slot, load_lexicon, tokenize
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'GBNG'
+VERSION = 1
+# magic, version, order, vocabulary size, lexicon checksum, slots, total tokens
+HEADER = struct.Struct('<4sHHIIQQ')
+ORDER = 3
+# Word IDs are packed into a 64-bit key, 21 bits per word
+FIELD_BITS = 21
+MAX_VOCABULARY = (1 << FIELD_BITS) - 1
+# Counts are stored as round(log(count) / log(QUANT_BASE)), under 5% error
+QUANT_BASE = 1.1
+BACKOFF = 0.4
+# Completions of each next character added to the candidates being reranked
+CANDIDATES_PER_CHILD = 3
+DEQUANTIZED = [QUANT_BASE ** q for q in range(256)]
+
+
+def ngram_key(word_ids: Sequence[int]) -> int:
+    """Nonzero key of up to three word IDs, distinct for every order"""
+    key = 0
+    for word_id in word_ids:
+        key = (key << FIELD_BITS) | (word_id + 1)
+    return key
+
+
+def quantize(count: int) -> int:
+    return min(255, round(math.log(count) / math.log(QUANT_BASE)))
+
+
+def lexicon_checksum(lexicon: Lexicon) -> int:
+    return zlib.crc32(lexicon.word_blob)
+
+
+def count_ngrams(lines: Iterable[str], lexicon: Lexicon, order: int = ORDER) -> Counter:
+    """Counts of every 1..order-gram of word IDs, n-grams never span an unknown word"""
+    counts: Counter = Counter()
+    for line in lines:
+        run: List[int] = []
+        for word in tokenize(line) + ['']:
+            word_id = lexicon.word_id(word) if word else -1
+            if word_id < 0:
+                for end in range(1, len(run) + 1):
+                    for n in range(1, min(order, end) + 1):
+                        counts[tuple(run[end - n:end])] += 1
+                run = []
+            else:
+                run.append(word_id)
+    return counts
+
+
+class NgramModel:
+    """Read-only quantized n-gram counts keyed by lexicon word IDs"""
+
+    def __init__(self, keys, values, order: int, vocabulary_size: int, checksum: int, total: int):
+        self.keys = keys
+        self.values = values
+        self.order = order
+        self.vocabulary_size = vocabulary_size
+        self.checksum = checksum
+        self.total = total
+        self._shift = 64 - max(len(keys).bit_length() - 1, 0)
+        self._mmap = None
+
+    def __len__(self) -> int:
+        return sum(1 for key in self.keys if key)
+
+    @classmethod
+    def build(cls, counts: Dict[tuple, int], vocabulary_size: int, checksum: int, order: int = ORDER) -> 'NgramModel':
+        if vocabulary_size > MAX_VOCABULARY:
+            raise ValueError(f"Vocabulary of {vocabulary_size} words does not fit {FIELD_BITS}-bit IDs")
+        entries = [(ngram_key(ngram), quantize(count)) for ngram, count in counts.items() if len(ngram) <= order]
+
+        # Power-of-two table at most half full
+        slots = 1
+        while slots < 2 * len(entries):
+            slots *= 2
+        shift = 64 - (slots.bit_length() - 1)
+        keys, values = array('Q', [0]) * slots, array('B', [0]) * slots
+        for key, value in entries:
+            slot = _slot(key, shift)
+            while keys[slot]:
+                slot = (slot + 1) & (slots - 1)
+            keys[slot], values[slot] = key, value
+
+        total = sum(count for ngram, count in counts.items() if len(ngram) == 1)
+        return cls(keys, values, order, vocabulary_size, checksum, total)
+
+    def _lookup(self, key: int) -> float:
+        slot = _slot(key, self._shift)
+        mask = len(self.keys) - 1
+        while True:
+            stored = self.keys[slot]
+            if stored == key:
+                return DEQUANTIZED[self.values[slot]]
+            if not stored:
+                return 0.0
+            slot = (slot + 1) & mask
+
+    def count(self, word_ids: Sequence[int]) -> float:
+        """Approximate corpus count of an n-gram, 0 if it was never seen"""
+        return self._lookup(ngram_key(word_ids))
+
+    def _levels(self, context: Sequence[int]):
+        """(history key, weight / history count) for each backoff level, longest history first
+
+        Only the words after the last unknown one are usable context, and
+        histories never seen in the corpus are skipped.
+        """
+        context = list(context)[-(self.order - 1):] if self.order > 1 else []
+        while -1 in context:
+            context = context[context.index(-1) + 1:]
+        levels = []
+        weight = 1.0
+        for start in range(len(context) + 1):
+            history = context[start:]
+            denominator = self.count(history) if history else self.total
+            if denominator:
+                levels.append((ngram_key(history) << FIELD_BITS, weight / denominator))
+            weight *= BACKOFF
+        return levels
+
+    def _score(self, levels, word_id: int) -> float:
+        for history_key, scale in levels:
+            count = self._lookup(history_key | (word_id + 1))
+            if count:
+                return scale * count
+        return 0.0
+
+    def score(self, context: Sequence[int], word_id: int) -> float:
+        """Stupid backoff score of word_id following context"""
+        return self._score(self._levels(context), word_id)
+
+    def rank(self, context: Sequence[int], candidates: Sequence[int]) -> List[int]:
+        """Candidates ordered by score after context, then by lexicon rank"""
+        levels = self._levels(context)
+        scores = {word_id: self._score(levels, word_id) for word_id in candidates}
+        return sorted(candidates, key=lambda word_id: (-scores[word_id], word_id))
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.order, self.vocabulary_size, self.checksum,
+                                len(self.keys), self.total))
+            f.write(b'\0' * (-HEADER.size % 8))
+            f.write(bytes(self.keys) if isinstance(self.keys, memoryview) else self.keys.tobytes())
+            f.write(bytes(self.values) if isinstance(self.values, memoryview) else self.values.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'NgramModel':
+        """Memory-map a model file; pages are read on first access"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        magic, version, order, vocabulary_size, checksum, slots, total = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} n-gram file")
+        offset = HEADER.size + (-HEADER.size % 8)
+        keys = view[offset:offset + slots * 8].cast('Q')
+        values = view[offset + slots * 8:offset + slots * 9]
+        model = cls(keys, values, order, vocabulary_size, checksum, total)
+        model._mmap = mapped
+        return model
+
+
+def rank_completions(lexicon: Lexicon, model: NgramModel, context_words: Iterable[str], prefix: str,
+                     limit: int = 5) -> List[str]:
+    """Completions of prefix reranked by the preceding words
+
+    Candidates are the cached completions of the prefix node and of each of
+    its children, so words just outside the global top-k can still surface
+    when the context predicts them, at a bounded number of lookups.
+    """
+    context = [lexicon.word_id(word) for word in tokenize(' '.join(context_words))[-(model.order - 1):]]
+    candidates = lexicon.completion_ids(prefix, lexicon.top_k, per_child=CANDIDATES_PER_CHILD)
+    return [lexicon.word(word_id) for word_id in model.rank(context, candidates)[:limit]]
+
+
+def corpus_paths() -> List[str]:
+    return sorted(glob.glob(os.path.join(Config.DATA_DIR, 'corpus', '*.txt')))
+
+
+def read_lines(paths: Iterable[str]):
+    for path in paths:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            yield from f
+
+
+def build_ngram_file(paths: Iterable[str], lexicon: Lexicon, output_path: str) -> NgramModel:
+    model = NgramModel.build(count_ngrams(read_lines(paths), lexicon), len(lexicon), lexicon_checksum(lexicon))
+    model.save(output_path)
+    return model
+
+
+def load_ngram_model(lexicon: Optional[Lexicon] = None, path: Optional[str] = None) -> NgramModel:
+    """Map the prebuilt model, rebuilding it if it is missing, outdated or built for another lexicon"""
+    lexicon = lexicon or load_lexicon()
+    path = path or Config.NGRAM_PATH
+    paths = corpus_paths()
+    stale = not os.path.exists(path) or any(os.path.getmtime(p) > os.path.getmtime(path) for p in paths)
+    if not stale:
+        try:
+            model = NgramModel.load(path)
+            if model.checksum == lexicon_checksum(lexicon):
+                return model
+            logger.info(f"{path} was built for a different lexicon")
+        except ValueError as e:
+            logger.warning(str(e))
+    logger.info(f"Building n-gram model {path} from {len(paths)} corpus files")
+    build_ngram_file(paths, lexicon, path)
+    return NgramModel.load(path)
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', nargs='*', help='plain-text files (default: data/corpus/*.txt)')
+    parser.add_argument('--output', default=Config.NGRAM_PATH)
+    args = parser.parse_args(argv)
+
+    paths = args.corpus or corpus_paths()
+    model = build_ngram_file(paths, load_lexicon(), args.output)
+    print(f"Wrote {len(model):,} n-grams over {model.total:,} tokens, {len(model.keys):,} slots "
+          f"to {args.output} ({os.path.getsize(args.output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Keyset Pagination for GestureBridge AI
+Cursor-based pagination on (created_at, _id) with opaque continuation tokens
+and cached approximate totals
+"""
+
+import base64
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import DESCENDING
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from cache import TTLCache
+
+MAX_PER_PAGE = 100
+
+# Totals are only an indication for the UI, so a short-lived cached count is enough
+_total_cache = TTLCache(maxsize=10000, ttl=60)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a continuation token cannot be decoded"""
+
+
+def encode_cursor(document: Dict, sort_field: str = 'created_at') -> str:
+    """Build an opaque continuation token from the last document of a page"""
+    value = document[sort_field]
+    payload = {
+        't': value.isoformat() if isinstance(value, datetime) else value,
+        'i': str(document['_id'])
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str):
+    """Return the (sort value, ObjectId) pair encoded in a continuation token"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload['t']), ObjectId(payload['i'])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursor(f"Invalid pagination cursor: {str(e)}")
+
+
+def parse_per_page(value, default: int = 10) -> int:
+    try:
+        per_page = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        per_page = default
+    return max(1, min(per_page, MAX_PER_PAGE))
+
+
+def _page_find(collection, query: Dict, cursor: Optional[str], per_page: int,
+               projection: Optional[Dict], sort_field: str):
+    """Build the find() cursor for one page (works for pymongo and motor collections)"""
+    if projection and any(projection.values()):
+        # The continuation token is built from the sort key of the last document
+        projection = {**projection, sort_field: 1}
+
+    page_query = dict(query)
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        page_query = {
+            '$and': [
+                query,
+                {
+                    '$or': [
+                        {sort_field: {'$lt': value}},
+                        {sort_field: value, '_id': {'$lt': last_id}}
+                    ]
+                }
+            ]
+        }
+
+    return (
+        collection.find(page_query, projection)
+        .sort([(sort_field, DESCENDING), ('_id', DESCENDING)])
+        .limit(per_page + 1)
+    )
+
+
+def keyset_page(collection, query: Dict, cursor: Optional[str] = None, per_page: int = 10,
+                projection: Optional[Dict] = None, sort_field: str = 'created_at') -> Dict:
+    """
+    Fetch one page in (sort_field, _id) descending order
+
+    The query should be served by a compound index ending in
+    (sort_field, _id), e.g. (user_id, created_at, _id), so every page is a
+    bounded index range scan regardless of how deep it is.
+    """
+    documents = list(_page_find(collection, query, cursor, per_page, projection, sort_field))
+    return _page_result(documents, per_page, sort_field)
+
+
+async def keyset_page_async(collection, query: Dict, cursor: Optional[str] = None, per_page: int = 10,
+                            projection: Optional[Dict] = None, sort_field: str = 'created_at') -> Dict:
+    """keyset_page for motor collections"""
+    documents = await _page_find(collection, query, cursor, per_page, projection, sort_field).to_list(per_page + 1)
+    return _page_result(documents, per_page, sort_field)
+
+
+def _page_result(documents, per_page: int, sort_field: str) -> Dict:
+    has_more = len(documents) > per_page
+    documents = documents[:per_page]
+
+    return {
+        'items': documents,
+        'next_cursor': encode_cursor(documents[-1], sort_field) if has_more else None,
+        'has_more': has_more,
+        'per_page': per_page
+    }
+
+
+def _total_key(collection, query: Dict):
+    return (collection.name, json.dumps(query, sort_keys=True, default=str))
+
+
+def cached_total(collection, query: Dict) -> int:
+    """Count matching documents, cached briefly per collection and query"""
+    return _total_cache.get_or_set(_total_key(collection, query), lambda: collection.count_documents(query))
+
+
+async def cached_total_async(collection, query: Dict) -> int:
+    """cached_total for motor collections"""
+    key = _total_key(collection, query)
+    total = _total_cache.get(key)
+    if total is None:
+        total = await collection.count_documents(query)
+        _total_cache.set(key, total)
+    return total
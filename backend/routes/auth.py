@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt, get_jwt_identity
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 import logging
@@ -9,12 +9,32 @@ import os
 # Fix import error by adding backend directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
+from config import Config
 from database import db
+from stats_engine import stats_engine
 from bson import ObjectId
 
 logger = logging.getLogger(__name__)
 auth_bp = Blueprint('auth', __name__)
 
+def add_role_claims(identity):
+    """JWTManager.additional_claims_loader embedding the user's role in access tokens"""
+    if not Config.JWT_ROLE_CLAIMS:
+        return {}
+    role = db.get_model('users').get_role(identity)
+    return {'role': role} if role else {}
+
+def current_user_role():
+    """Role of the current JWT user, from its role claim when the token has one
+
+    Role changes reach role claims when the token is reissued; tokens without
+    the claim fall back to the (cached) user document.
+    """
+    claims = get_jwt()
+    if 'role' in claims:
+        return claims['role']
+    return db.get_model('users').get_role(get_jwt_identity())
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     try:
@@ -27,23 +47,27 @@ def register():
             
         # Check if user already exists
         users = db.get_collection('users')
-        if users.find_one({'email': data['email']}):
+        if users.find_one({'email': data['email']}, {'_id': 1}):
             return jsonify({'error': 'Email already registered'}), 409
             
-        if users.find_one({'username': data['username']}):
+        if users.find_one({'username': data['username']}, {'_id': 1}):
             return jsonify({'error': 'Username already taken'}), 409
             
         # Assign role (admin if username is 'admin', else user)
         role = 'admin' if data['username'].lower() == 'admin' else 'user'
+        # Stored where the statistics reconciliation counts users per language
+        preferred_language = data.get('preferred_language') or 'ASL'
         new_user = {
             'username': data['username'],
             'email': data['email'],
             'password': generate_password_hash(data['password']),
             'role': role,
+            'profile': {'preferred_language': preferred_language},
             'created_at': datetime.utcnow(),
             'updated_at': datetime.utcnow()
         }
         result = users.insert_one(new_user)
+        stats_engine.record_user(preferred_language)
         access_token = create_access_token(identity=str(result.inserted_id))
         return jsonify({
             'message': 'User registered successfully',
@@ -65,20 +89,21 @@ def login():
             return jsonify({'error': 'Missing email or password'}), 400
             
         # Find user
-        users = db.get_collection('users')
-        user = users.find_one({'email': data['email']})
+        users_model = db.get_model('users')
+        user = users_model.get_user_by_email(data['email'], users_model.LOGIN_FIELDS)
         
         if not user or not check_password_hash(user['password'], data['password']):
             return jsonify({'error': 'Invalid email or password'}), 401
+        users_model.cache_user(user)
             
         # Create access token
-        access_token = create_access_token(identity=str(user['_id']))
+        access_token = create_access_token(identity=user['_id'])
         return jsonify({
             'message': 'Login successful',
             'access_token': access_token,
             'role': user.get('role', 'user'),
             'user': {
-                'id': str(user['_id']),
+                'id': user['_id'],
                 'username': user['username'],
                 'email': user['email'],
                 'role': user.get('role', 'user'),
@@ -94,15 +119,13 @@ def login():
 @auth_bp.route('/admin/users', methods=['GET'])
 @jwt_required()
 def list_users():
-    user_id = get_jwt_identity()
-    users = db.get_collection('users')
-    current_user = users.find_one({'_id': ObjectId(user_id)})
-    if not current_user or current_user.get('role') != 'admin':
+    if current_user_role() != 'admin':
         return jsonify({'error': 'Admin access required'}), 403
+    users_model = db.get_model('users')
     user_list = []
-    for u in users.find():
+    for u in users_model.list_users(users_model.PUBLIC_FIELDS):
         user_list.append({
-            'id': str(u['_id']),
+            'id': u['_id'],
             'username': u['username'],
             'email': u['email'],
             'role': u.get('role', 'user'),
@@ -116,18 +139,17 @@ def get_profile():
     try:
         current_user_id = get_jwt_identity()
         
-        users = db.get_collection('users')
-        user = users.find_one({'_id': ObjectId(current_user_id)})
+        user = db.get_model('users').get_cached_user(current_user_id)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
             
         return jsonify({
             'user': {
-                'id': str(user['_id']),
+                'id': user['_id'],
                 'username': user['username'],
                 'email': user['email'],
-                'created_at': user['created_at'].isoformat()
+                'created_at': user['created_at']
             }
         }), 200
         
@@ -135,6 +157,23 @@ def get_profile():
         logger.error(f"Error getting profile: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@auth_bp.route('/statistics', methods=['GET'])
+@jwt_required()
+def get_statistics():
+    try:
+        current_user_id = get_jwt_identity()
+        
+        statistics = db.get_model('users').get_statistics(current_user_id)
+        
+        if statistics is None:
+            return jsonify({'error': 'User not found'}), 404
+            
+        return jsonify({'statistics': statistics}), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting statistics: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @auth_bp.route('/profile', methods=['PUT'])
 @jwt_required()
 def update_profile():
@@ -142,23 +181,22 @@ def update_profile():
         current_user_id = get_jwt_identity()
         data = request.get_json()
         
+        users_model = db.get_model('users')
         users = db.get_collection('users')
-        user = users.find_one({'_id': ObjectId(current_user_id)})
+        user = users.find_one({'_id': ObjectId(current_user_id)}, {'_id': 1})
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
             
         # Update allowed fields
-        update_data = {
-            'updated_at': datetime.utcnow()
-        }
+        update_data = {}
         
         if 'username' in data:
             # Check if username is already taken by another user
             existing_user = users.find_one({
                 'username': data['username'],
                 '_id': {'$ne': ObjectId(current_user_id)}
-            })
+            }, {'_id': 1})
             if existing_user:
                 return jsonify({'error': 'Username already taken'}), 409
             update_data['username'] = data['username']
@@ -166,11 +204,8 @@ def update_profile():
         if 'password' in data:
             update_data['password'] = generate_password_hash(data['password'])
             
-        # Update user
-        users.update_one(
-            {'_id': ObjectId(current_user_id)},
-            {'$set': update_data}
-        )
+        # Update user (also drops it from the user cache)
+        users_model.update_user(current_user_id, update_data)
         
         return jsonify({
             'message': 'Profile updated successfully'
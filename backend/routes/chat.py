@@ -1,98 +1,24 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+import json
 import sys
 import os
 
 # Fix import error by adding backend directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
-from config import Config
-import openai
+from chat_cache import chat_response_cache
+from intents import intent_matcher
+from llm_gateway import LLMStream, llm_gateway
 
 chat_bp = Blueprint('chat', __name__)
 
-@chat_bp.route('/message', methods=['POST'])
-# @jwt_required()  # Temporarily disabled for testing
-def send_message():
-    """Send a message to the AI chatbot"""
-    try:
-        # user_id = get_jwt_identity()  # Temporarily disabled
-        data = request.get_json()
+# Keep proxies (nginx) from buffering or caching the event stream
+STREAM_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
 
-        user_message = data.get('message', '').strip()
-        if not user_message:
-            return jsonify({'error': 'Message cannot be empty'}), 400
+ERROR_RESPONSE = "I'm sorry, I'm having trouble responding right now. Please try again later or check our help documentation."
 
-        # Get chatbot response
-        bot_response = get_chatbot_response(user_message)
-
-        # Log the conversation (optional)
-        # You can add database logging here if needed
-
-        return jsonify({
-            'success': True,
-            'user_message': user_message,
-            'bot_response': bot_response
-        })
-
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-def get_chatbot_response(message):
-    """
-    Get response from ChatGPT for user assistance
-    """
-    try:
-        if not Config.OPENAI_API_KEY:
-            # Enhanced fallback responses with comprehensive knowledge
-            message_lower = message.lower()
-
-            # Greeting responses
-            if any(word in message_lower for word in ['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening']):
-                return "Hello! Welcome to GestureBridge AI! I'm here to help you with sign language translation, app features, troubleshooting, or any questions about our platform. How can I assist you today?"
-
-            # Help and general questions
-            if any(word in message_lower for word in ['help', 'support', 'assist', 'guide']):
-                return "I'd be happy to help! I can assist you with:\n\n• Getting started with GestureBridge AI\n• Understanding sign language basics\n• Troubleshooting technical issues\n• Account management\n• API documentation\n• Community features\n\nWhat specific area would you like help with?"
-
-            # How to use questions
-            if any(word in message_lower for word in ['how', 'use', 'start', 'begin', 'tutorial']):
-                return "To get started with GestureBridge AI:\n\n1. Register or login to your account\n2. Grant camera and microphone permissions\n3. Click 'Start Live Demo' on your dashboard\n4. Select your preferred sign language\n5. Position yourself 2-3 feet from the camera\n6. Begin signing naturally!\n\nFor detailed tutorials, visit our Help Center at /help-center.html"
-
-            # What is questions
-            if any(word in message_lower for word in ['what', 'about', 'features', 'capabilities']):
-                return "GestureBridge AI is a comprehensive sign language translation platform featuring:\n\n• Real-time translation with <100ms latency\n• 15+ international sign languages (ASL, BSL, JSL, etc.)\n• 99.2% accuracy with AI-powered recognition\n• Progressive Web App with offline support\n• Mobile-optimized interface\n• Community forums and feedback system\n\nWould you like to know more about any specific feature?"
-
-            # Sign language questions
-            if any(word in message_lower for word in ['sign language', 'asl', 'bsl', 'sign', 'gesture']):
-                return "GestureBridge AI supports multiple sign languages including ASL, BSL, JSL, LSF, DGS, and many regional variants. For best results:\n\n• Use clear, crisp handshapes\n• Include appropriate facial expressions\n• Sign at a natural pace\n• Ensure good lighting and plain background\n• Position 2-3 feet from camera\n\nWould you like tips for a specific sign language?"
-
-            # Troubleshooting questions
-            if any(word in message_lower for word in ['problem', 'issue', 'error', 'trouble', 'not working']):
-                return "I'm sorry you're experiencing issues! Common solutions include:\n\n• Check camera/microphone permissions in your browser\n• Ensure good lighting and reduce background clutter\n• Try a different browser (Chrome, Firefox, Safari, Edge)\n• Clear browser cache and refresh the page\n• Check your internet connection (5 Mbps minimum)\n\nFor specific error messages, please share more details so I can help troubleshoot."
-
-            # Account questions
-            if any(word in message_lower for word in ['account', 'login', 'register', 'password', 'profile']):
-                return "For account-related help:\n\n• Register: Visit /register to create a new account\n• Login: Use /login with your credentials\n• Password Reset: Click 'Forgot Password' on login page\n• Profile: Update settings in your dashboard\n• Security: Enable 2FA in account settings\n\nNeed help with a specific account issue?"
-
-            # API questions
-            if any(word in message_lower for word in ['api', 'developer', 'integration', 'documentation']):
-                return "For API documentation and developer resources:\n\n• API Docs: Visit /api-docs.html for complete documentation\n• Authentication: JWT-based with Bearer tokens\n• Endpoints: Available for streaming, feedback, history, etc.\n• WebSocket: Real-time translation at ws://host:port/streaming\n• SDKs: REST API with JSON responses\n\nCheck our API documentation for code examples and integration guides."
-
-            # Community questions
-            if any(word in message_lower for word in ['community', 'forum', 'discuss', 'share']):
-                return "Join our vibrant community at /community.html where you can:\n\n• Share your experiences with sign language translation\n• Ask questions and get help from other users\n• Participate in discussions and workshops\n• Contribute to improving the platform\n• Connect with the deaf and hard-of-hearing community\n\nThe community is a great place to learn and share!"
-
-            # Contact questions
-            if any(word in message_lower for word in ['contact', 'support', 'email', 'reach']):
-                return "You can reach us through several channels:\n\n• Support: support@gesturebridge.ai (24-48 hour response)\n• Business: business@gesturebridge.ai\n• Technical: dev@gesturebridge.ai\n• General: info@gesturebridge.ai\n• Contact Form: /contact.html\n\nWe're here to help with any questions or concerns!"
-
-            # Default response
-            return "I'm your GestureBridge AI assistant with comprehensive knowledge about our platform! I can help you with:\n\n• Getting started and tutorials\n• Sign language basics and best practices\n• Troubleshooting technical issues\n• Account management and settings\n• API documentation and integration\n• Community features and forums\n• Contact information and support\n\nWhat would you like to know about GestureBridge AI?"
-
-        openai.api_key = Config.OPENAI_API_KEY
-
-        system_prompt = """You are an expert AI assistant for GestureBridge AI, a comprehensive sign language translation platform. You have complete knowledge of the website, features, sign languages, and all aspects of the application.
+SYSTEM_PROMPT = """You are an expert AI assistant for GestureBridge AI, a comprehensive sign language translation platform. You have complete knowledge of the website, features, sign languages, and all aspects of the application.
 
 ## WEBSITE OVERVIEW
 GestureBridge AI is a modern web application that provides real-time sign language translation using artificial intelligence. It supports bidirectional translation between sign language and text, making communication more accessible for everyone.
@@ -253,19 +179,130 @@ GestureBridge AI is a modern web application that provides real-time sign langua
 
 Remember: You are the primary interface for users learning about and using GestureBridge AI. Your knowledge should be comprehensive and your responses should build user confidence and success with the platform."""
 
-        response = openai.ChatCompletion.create(
-            model=Config.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": message}
-            ],
-            max_tokens=300,
-            temperature=0.7
-        )
-
-        bot_response = response.choices[0].message.content.strip()
+@chat_bp.route('/message', methods=['POST'])
+# @jwt_required()  # Temporarily disabled for testing
+def send_message():
+    """Send a message to the AI chatbot"""
+    try:
+        # user_id = get_jwt_identity()  # Temporarily disabled
+        data = request.get_json()
+
+        user_message = data.get('message', '').strip()
+        if not user_message:
+            return jsonify({'error': 'Message cannot be empty'}), 400
+
+        # Get chatbot response
+        bot_response = get_chatbot_response(user_message)
+
+        # Log the conversation (optional)
+        # You can add database logging here if needed
+
+        return jsonify({
+            'success': True,
+            'user_message': user_message,
+            'bot_response': bot_response
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@chat_bp.route('/stream', methods=['POST'])
+@jwt_required()
+def stream_message():
+    """Send a message to the AI chatbot and stream the answer as Server-Sent Events
+
+    Emits a 'token' event ({text}) per chunk as the model produces it, then
+    'done' ({bot_response}) with the whole answer. If the client
+    disconnects, the server closes the event generator, which stops the
+    LLM stream.
+    """
+    try:
+        data = request.get_json()
+
+        user_message = data.get('message', '').strip()
+        if not user_message:
+            return jsonify({'error': 'Message cannot be empty'}), 400
+
+        chunks = open_chatbot_stream(user_message)
+        response = Response(chatbot_events(user_message, chunks), mimetype='text/event-stream', headers=STREAM_HEADERS)
+        if isinstance(chunks, LLMStream):
+            # Closing an event generator that never started skips its finally block
+            response.call_on_close(chunks.close)
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def chat_messages(message):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": message}
+    ]
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def open_chatbot_stream(message):
+    """
+    Chunks of the answer to message. Offline, cached and failed answers
+    come as a single chunk; otherwise an LLMStream, already connected and
+    past its first token
+    """
+    try:
+        if not llm_gateway.is_enabled():
+            return iter([intent_matcher.respond(message)])
+
+        cached_response = chat_response_cache.get(message)
+        if cached_response is not None:
+            return iter([cached_response])
+
+        return llm_gateway.stream('chat', messages=chat_messages(message), max_tokens=300, temperature=0.7)
+
+    except Exception as e:
+        print(f"Error getting chatbot response: {e}")
+        return iter([ERROR_RESPONSE])
+
+def chatbot_events(message, chunks):
+    """
+    SSE events relaying chunks; closing this generator closes the LLM stream.
+    Answers streamed to the end are cached like get_chatbot_response's
+    """
+    parts = []
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            yield sse_event('token', {'text': chunk})
+    except Exception as e:
+        print(f"Error streaming chatbot response: {e}")
+        yield sse_event('error', {'error': ERROR_RESPONSE})
+        return
+    finally:
+        if isinstance(chunks, LLMStream):
+            chunks.close()
+
+    bot_response = ''.join(parts).strip()
+    if isinstance(chunks, LLMStream):
+        chat_response_cache.put(message, bot_response)
+    yield sse_event('done', {'bot_response': bot_response})
+
+def get_chatbot_response(message):
+    """
+    Get response from ChatGPT for user assistance
+    """
+    try:
+        if not llm_gateway.is_enabled():
+            # Answer from the keyword intents in data/chat_intents.json
+            return intent_matcher.respond(message)
+
+        # Support questions repeat a lot; reuse the answer to the same or a reworded question
+        cached_response = chat_response_cache.get(message)
+        if cached_response is not None:
+            return cached_response
+
+        bot_response = llm_gateway.complete('chat', messages=chat_messages(message), max_tokens=300, temperature=0.7)
+        chat_response_cache.put(message, bot_response)
         return bot_response
 
     except Exception as e:
         print(f"Error getting chatbot response: {e}")
-        return "I'm sorry, I'm having trouble responding right now. Please try again later or check our help documentation."
+        return ERROR_RESPONSE
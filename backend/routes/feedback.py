@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
+from datetime import datetime, timedelta
 import sys
 import os
 
@@ -8,81 +8,14 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
 from database import db
-from config import Config
-import openai
+from analysis_cache import feedback_analysis_cache
+from feedback_analysis import analyze_feedback_with_chatgpt, notify_feedback_analysis_worker
+from pagination import InvalidCursor, parse_per_page
+from stats_engine import stats_engine
 
 
 feedback_bp = Blueprint('feedback', __name__)
 
-def analyze_feedback_with_chatgpt(feedback_data):
-    """
-    Analyze user feedback using ChatGPT to provide insights and suggestions
-    """
-    try:
-        if not Config.OPENAI_API_KEY:
-            return {
-                'analysis': 'Feedback analysis requires OpenAI API key',
-                'suggestions': ['Set up OpenAI API key for automated feedback analysis'],
-                'sentiment': 'neutral'
-            }
-
-        openai.api_key = Config.OPENAI_API_KEY
-
-        feedback_type = feedback_data.get('type', 'general')
-        rating = feedback_data.get('rating', 3)
-        comment = feedback_data.get('comment', '')
-        category = feedback_data.get('category', 'general')
-
-        prompt = f"""Analyze this user feedback for GestureBridge AI sign language translation app:
-
-Feedback Type: {feedback_type}
-Rating: {rating}/5
-Category: {category}
-Comment: {comment}
-
-Please provide:
-1. Sentiment analysis (positive, negative, neutral)
-2. Key insights from the feedback
-3. Specific suggestions for improvement
-4. Priority level (low, medium, high)
-
-Format the response as JSON with keys: sentiment, insights, suggestions, priority"""
-
-        response = openai.ChatCompletion.create(
-            model=Config.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": "You are an AI assistant that analyzes user feedback for a sign language translation app. Provide structured analysis in JSON format."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=300,
-            temperature=0.3
-        )
-
-        analysis_text = response.choices[0].message.content.strip()
-
-        # Try to parse as JSON, fallback to text analysis
-        try:
-            import json
-            analysis = json.loads(analysis_text)
-        except:
-            # Fallback parsing
-            analysis = {
-                'sentiment': 'neutral',
-                'insights': [analysis_text],
-                'suggestions': ['Review feedback manually'],
-                'priority': 'medium'
-            }
-
-        return analysis
-
-    except Exception as e:
-        print(f"Feedback analysis error: {e}")
-        return {
-            'analysis': f'Error analyzing feedback: {str(e)}',
-            'suggestions': ['Manual review recommended'],
-            'sentiment': 'neutral'
-        }
-
 @feedback_bp.route('/submit', methods=['POST'])
 @jwt_required()
 def submit_feedback():
@@ -116,14 +49,15 @@ def submit_feedback():
             'url': request.referrer
         }
 
-        # Analyze feedback with ChatGPT if comment is provided
-        analysis = None
+        # Queue ChatGPT analysis for the background worker if comment is provided
         if comment and len(comment.strip()) > 0:
-            analysis = analyze_feedback_with_chatgpt(feedback_data)
-            feedback_data['ai_analysis'] = analysis
+            feedback_data['analysis_status'] = 'pending'
         
         feedback_model = db.get_model('feedback')
         feedback_id = feedback_model.create_feedback(user_id, feedback_data)
+
+        if feedback_data.get('analysis_status') == 'pending':
+            notify_feedback_analysis_worker()
         
         # Log analytics event
         analytics_model = db.get_model('analytics')
@@ -137,16 +71,12 @@ def submit_feedback():
             }
         })
         
-        response_data = {
+        return jsonify({
             'success': True,
             'message': 'Feedback submitted successfully',
-            'feedback_id': str(feedback_id)
-        }
-
-        if analysis:
-            response_data['ai_analysis'] = analysis
-
-        return jsonify(response_data)
+            'feedback_id': str(feedback_id),
+            'analysis_status': feedback_data.get('analysis_status', 'not_requested')
+        })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -173,7 +103,7 @@ def analyze_feedback(feedback_id):
         analysis = analyze_feedback_with_chatgpt(feedback)
 
         # Update feedback with analysis
-        feedback_model.update_feedback(feedback_id, {'ai_analysis': analysis})
+        feedback_model.update_feedback(feedback_id, {'ai_analysis': analysis, 'analysis_status': 'completed'})
 
         return jsonify({
             'success': True,
@@ -184,6 +114,34 @@ def analyze_feedback(feedback_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@feedback_bp.route('/analysis/<feedback_id>', methods=['GET'])
+@jwt_required()
+def get_feedback_analysis(feedback_id):
+    """Get the background AI analysis status for a feedback entry"""
+    try:
+        user_id = get_jwt_identity()
+
+        feedback_model = db.get_model('feedback')
+        feedback = feedback_model.get_feedback_by_id(
+            feedback_id, {'user_id': 1, 'analysis_status': 1, 'ai_analysis': 1}
+        )
+
+        if not feedback:
+            return jsonify({'error': 'Feedback not found'}), 404
+
+        if str(feedback['user_id']) != user_id:
+            return jsonify({'error': 'Unauthorized to view this feedback'}), 403
+
+        return jsonify({
+            'success': True,
+            'feedback_id': feedback_id,
+            'analysis_status': feedback.get('analysis_status', 'not_requested'),
+            'ai_analysis': feedback.get('ai_analysis')
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @feedback_bp.route('/translation', methods=['POST'])
 @jwt_required()
 def submit_translation_feedback():
@@ -201,6 +159,8 @@ def submit_translation_feedback():
         
         if not all([translation_id, accuracy_rating, language]):
             return jsonify({'error': 'Translation ID, accuracy rating, and language are required'}), 400
+        if isinstance(accuracy_rating, bool) or not isinstance(accuracy_rating, (int, float)):
+            return jsonify({'error': 'Accuracy rating must be a number'}), 400
         
         feedback_data = {
             'type': 'translation',
@@ -223,11 +183,17 @@ def submit_translation_feedback():
         
         # Update translation feedback
         translations_model = db.get_model('translations')
-        translations_model.update_feedback(translation_id, {
+        previous = translations_model.update_feedback(translation_id, {
             'accuracy_rating': accuracy_rating,
             'user_correction': suggested_text,
             'feedback_id': str(feedback_id)
         })
+        # Ratings count for the translation's owner, the latest rating replacing earlier ones
+        if previous:
+            stats_engine.record_feedback(
+                previous['user_id'], accuracy_rating,
+                previous.get('feedback', {}).get('accuracy_rating')
+            )
         
         return jsonify({
             'success': True,
@@ -244,21 +210,20 @@ def get_user_feedback():
     """Get all feedback submitted by the current user"""
     try:
         user_id = get_jwt_identity()
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 10))
+        cursor = request.args.get('cursor')
+        per_page = parse_per_page(request.args.get('per_page'))
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         
         feedback_model = db.get_model('feedback')
-        result = feedback_model.get_user_feedback(user_id, page, per_page)
+        result = feedback_model.get_user_feedback(user_id, cursor, per_page, include_total)
         
         return jsonify({
             'success': True,
-            'feedback': result['feedback'],
-            'total': result['total'],
-            'page': result['page'],
-            'per_page': result['per_page'],
-            'total_pages': result['total_pages']
+            **result
         })
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -267,7 +232,8 @@ def get_feedback_statistics():
     """Get overall feedback statistics"""
     try:
         feedback_model = db.get_model('feedback')
-        stats = feedback_model.get_statistics()
+        stats = dict(feedback_model.get_statistics())
+        stats['analysis_cache'] = feedback_analysis_cache.get_stats()
         
         return jsonify({
             'success': True,
@@ -277,6 +243,28 @@ def get_feedback_statistics():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@feedback_bp.route('/analytics', methods=['GET'])
+@jwt_required()
+def get_analytics_rollups():
+    """Get per-minute analytics event counts for dashboards"""
+    try:
+        end = datetime.utcnow()
+        minutes = min(int(request.args.get('minutes', 60)), 7 * 24 * 60)
+        start = end - timedelta(minutes=minutes)
+        
+        analytics_model = db.get_model('analytics')
+        rollups = analytics_model.get_rollups(start, end, request.args.get('event_type'))
+        
+        return jsonify({
+            'success': True,
+            'rollups': rollups
+        })
+        
+    except ValueError:
+        return jsonify({'error': 'minutes must be an integer'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @feedback_bp.route('/improve-model', methods=['POST'])
 @jwt_required()
 def contribute_to_model_improvement():
@@ -6,6 +6,7 @@ import tempfile
 import os
 from datetime import datetime
 from backend.database import db
+from pagination import InvalidCursor, parse_per_page
 
 from backend.sign_language_app.model import SignLanguageModel
 from bson import ObjectId
@@ -46,8 +47,7 @@ def process_video():
                 predicted_class = np.bincount(np.argmax(predictions, axis=1)).argmax()
                 confidence = float(np.mean(predictions[:, predicted_class]))
                 
-                # Save the translation to database
-                translations = db.get_collection('translations')
+                # Queue the translation for the next batched write
                 translation_record = {
                     'user_id': ObjectId(current_user_id),
                     'type': 'video',
@@ -55,7 +55,7 @@ def process_video():
                     'confidence': confidence,
                     'created_at': datetime.utcnow()
                 }
-                translations.insert_one(translation_record)
+                db.get_model('translations').insert_record(translation_record)
                 
                 return jsonify({
                     'predicted_class': int(predicted_class),
@@ -97,8 +97,7 @@ def process_text():
             'created_at': datetime.utcnow()
         }
         
-        translations = db.get_collection('translations')
-        translations.insert_one(translation_record)
+        db.get_model('translations').insert_record(translation_record)
         
         return jsonify({
             'message': 'Text processed successfully',
@@ -115,41 +114,27 @@ def get_history():
     try:
         current_user_id = get_jwt_identity()
         
-        # Get page parameters for pagination
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 10))
-        
-        # Calculate skip value for pagination
-        skip = (page - 1) * per_page
+        # Get cursor parameters for pagination
+        cursor = request.args.get('cursor')
+        per_page = parse_per_page(request.args.get('per_page'))
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         
-        translations = db.get_collection('translations')
+        translations = db.get_model('translations')
+        result = translations.get_user_translations(current_user_id, cursor, per_page, include_total)
         
-        # Get total count for pagination
-        total_count = translations.count_documents({'user_id': ObjectId(current_user_id)})
-        
-        # Get paginated results
-        results = translations.find(
-            {'user_id': ObjectId(current_user_id)}
-        ).sort(
-            'created_at', -1
-        ).skip(skip).limit(per_page)
-        
-        # Convert results to list and format dates
-        history_list = []
-        for record in results:
-            record['_id'] = str(record['_id'])
-            record['user_id'] = str(record['user_id'])
-            record['created_at'] = record['created_at'].isoformat()
-            history_list.append(record)
+        history = {
+            'history': result['translations'],
+            'next_cursor': result['next_cursor'],
+            'has_more': result['has_more'],
+            'per_page': result['per_page']
+        }
+        if include_total:
+            history['total'] = result['total']
             
-        return jsonify({
-            'history': history_list,
-            'total': total_count,
-            'page': page,
-            'per_page': per_page,
-            'total_pages': (total_count + per_page - 1) // per_page
-        }), 200
+        return jsonify(history), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error fetching history: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -0,0 +1,35 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+import sys
+import os
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from chat_cache import chat_response_cache
+from database import db
+from llm_gateway import llm_gateway
+from monitoring import pool_metrics, async_pool_metrics
+from routes.auth import current_user_role
+
+
+monitoring_bp = Blueprint('monitoring', __name__)
+
+@monitoring_bp.route('/metrics', methods=['GET'])
+@jwt_required()
+def get_metrics():
+    """Connection pool, batched write, LLM gateway and chat cache metrics (admin only)"""
+    if current_user_role() != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    return jsonify({
+        'success': True,
+        'mongo_pool': pool_metrics.snapshot(),
+        'mongo_pool_async': async_pool_metrics.snapshot(),
+        'translation_writes': {
+            'translations': db.get_model('translations').writer.snapshot(),
+            'session_translations': db.get_model('streaming_sessions').frame_writer.snapshot()
+        },
+        'user_cache': db.get_model('users').get_cache_stats(),
+        'llm': llm_gateway.get_metrics(),
+        'chat_cache': chat_response_cache.get_stats()
+    }), 200
@@ -5,7 +5,6 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from database import db
 from datetime import datetime
-from bson.objectid import ObjectId
 
 prediction_bp = Blueprint('prediction', __name__)
 
@@ -53,7 +52,8 @@ def delete_history():
 @jwt_required()
 def delete_account():
     user_id = get_jwt_identity()
-    db.get_collection('users').delete_one({'_id': ObjectId(user_id)})
+    db.get_model('users').delete_user(user_id)
     db.get_collection('history').delete_many({'user_id': user_id})
     db.get_collection('feedback').delete_many({'user_id': user_id})
+    db.get_model('user_lexicons').delete_user(user_id)
     return jsonify({'message': 'Account deleted'})
@@ -11,8 +11,9 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
 from database import db
-from config import Config
-import openai
+from llm_gateway import llm_gateway
+from pagination import InvalidCursor, parse_per_page
+from stats_engine import stats_engine
 
 
 streaming_bp = Blueprint('streaming', __name__)
@@ -41,6 +42,7 @@ def start_streaming():
         # Create streaming session in MongoDB
         streaming_model = db.get_model('streaming_sessions')
         session_id = streaming_model.create_session(user_id, session_data)
+        stats_engine.record_session(user_id, language)
         
         # Log analytics event
         analytics_model = db.get_model('analytics')
@@ -79,34 +81,25 @@ def process_frame():
         
         # Get session from MongoDB
         streaming_model = db.get_model('streaming_sessions')
-        session = streaming_model.get_session(session_id)
+        session = streaming_model.get_session(session_id, streaming_model.FRAME_FIELDS)
         
-        if not session or session['user_id'] != user_id:
+        if not session or str(session['user_id']) != user_id:
             return jsonify({'error': 'Invalid session ID or unauthorized'}), 400
         
         if session['status'] != 'active':
             return jsonify({'error': 'Session is not active'}), 400
         
-        # Decode frame
-        frame_bytes = base64.b64decode(frame_data.split(',')[1])
-        frame_array = np.frombuffer(frame_bytes, dtype=np.uint8)
-        frame = cv2.imdecode(frame_array, cv2.IMREAD_COLOR)
-        
-        # Process frame with ML model (placeholder)
-        translation_result = process_sign_language_frame(frame, session['language'])
+        # Decode frame and process it with the ML model (placeholder)
+        translation_result = recognize_frame(frame_data, session['language'])
         
         # Update session statistics
-        update_data = {
-            'frame_count': session['statistics']['total_frames'] + 1,
-            'translation': {
-                'text': translation_result['translation'],
-                'refined_text': translation_result.get('refined_translation', translation_result['translation']),
-                'confidence': translation_result['confidence'],
-                'timestamp': timestamp
-            }
-        }
-        
-        streaming_model.update_session(session_id, update_data)
+        streaming_model.record_frame(session_id, user_id, {
+            'text': translation_result['translation'],
+            'refined_text': translation_result.get('refined_translation', translation_result['translation']),
+            'confidence': translation_result['confidence'],
+            'timestamp': timestamp
+        })
+        stats_engine.record_translation(user_id, session['language'], translation_result['confidence'])
         
         # Log analytics event
         analytics_model = db.get_model('analytics')
@@ -141,7 +134,7 @@ def stop_streaming(session_id):
         
         # Get session from MongoDB
         streaming_model = db.get_model('streaming_sessions')
-        session = streaming_model.get_session(session_id)
+        session = streaming_model.get_session(session_id, streaming_model.STOP_FIELDS)
         
         if not session:
             return jsonify({'error': 'Invalid session ID'}), 400
@@ -152,14 +145,9 @@ def stop_streaming(session_id):
         if session['status'] != 'active':
             return jsonify({'error': 'Session is already stopped'}), 400
         
-        # Calculate final statistics
-        duration = (datetime.now() - session['created_at']).total_seconds()
-        final_stats = {
-            'total_frames': session['statistics']['total_frames'],
-            'total_translations': len(session['translations']),
-            'duration_seconds': duration,
-            'average_confidence': sum(t['confidence'] for t in session['translations']) / len(session['translations']) if session['translations'] else 0
-        }
+        # Calculate final statistics from the running counters
+        final_stats = summarize_session(session)
+        duration = final_stats['duration_seconds']
         
         # End session in MongoDB
         streaming_model.end_session(session_id, final_stats)
@@ -192,13 +180,14 @@ def get_user_sessions():
     """Get active streaming sessions for the current user"""
     try:
         user_id = get_jwt_identity()
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 10))
+        cursor = request.args.get('cursor')
+        per_page = parse_per_page(request.args.get('per_page'))
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         status = request.args.get('status', 'active')  # active, completed, all
         
         # Get sessions from MongoDB
         streaming_model = db.get_model('streaming_sessions')
-        result = streaming_model.get_user_sessions(user_id, status, page, per_page)
+        result = streaming_model.get_user_sessions(user_id, status, cursor, per_page, include_total)
         
         # Log analytics event
         analytics_model = db.get_model('analytics')
@@ -207,20 +196,49 @@ def get_user_sessions():
             'event_name': 'view_sessions',
             'properties': {
                 'status': status,
-                'page': page,
-                'total_sessions': result['total']
+                'has_cursor': bool(cursor),
+                'returned_sessions': len(result['sessions'])
             }
         })
         
         return jsonify({
             'success': True,
-            'sessions': result['sessions'],
-            'total': result['total'],
-            'page': result['page'],
-            'per_page': result['per_page'],
-            'total_pages': result['total_pages']
+            **result
+        })
+        
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@streaming_bp.route('/sessions/<session_id>/translations', methods=['GET'])
+@jwt_required()
+def get_session_translations(session_id):
+    """Get translations recorded during a streaming session"""
+    try:
+        user_id = get_jwt_identity()
+        cursor = request.args.get('cursor')
+        per_page = parse_per_page(request.args.get('per_page'), default=50)
+        
+        streaming_model = db.get_model('streaming_sessions')
+        session = streaming_model.get_session(session_id, streaming_model.OWNER_FIELDS)
+        
+        if not session:
+            return jsonify({'error': 'Invalid session ID'}), 400
+        
+        if str(session['user_id']) != user_id:
+            return jsonify({'error': 'Unauthorized'}), 403
+        
+        result = streaming_model.get_session_translations(session_id, cursor, per_page)
+        
+        return jsonify({
+            'success': True,
+            'session_id': session_id,
+            **result
         })
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -229,17 +247,15 @@ def refine_translation_with_chatgpt(basic_translation, language, context=None):
     Refine basic translation using ChatGPT for more natural language
     """
     try:
-        if not Config.OPENAI_API_KEY:
-            return basic_translation  # Return basic if no API key
-
-        openai.api_key = Config.OPENAI_API_KEY
+        if not llm_gateway.is_enabled():
+            return basic_translation  # Return basic if no LLM backend
 
         prompt = f"Refine this sign language translation to make it more natural and conversational: '{basic_translation}'. Language: {language}."
         if context:
             prompt += f" Context: {context}"
 
-        response = openai.ChatCompletion.create(
-            model=Config.OPENAI_MODEL,
+        refined = llm_gateway.complete(
+            'streaming',
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that refines sign language translations into natural, conversational language."},
                 {"role": "user", "content": prompt}
@@ -247,14 +263,30 @@ def refine_translation_with_chatgpt(basic_translation, language, context=None):
             max_tokens=100,
             temperature=0.7
         )
-
-        refined = response.choices[0].message.content.strip()
         return refined if refined else basic_translation
 
     except Exception as e:
         print(f"Error refining translation: {e}")
         return basic_translation  # Fallback to basic translation
 
+def recognize_frame(frame_data, language):
+    """Decode a base64 data-URL frame and run sign recognition on it"""
+    frame_bytes = base64.b64decode(frame_data.split(',')[1])
+    frame_array = np.frombuffer(frame_bytes, dtype=np.uint8)
+    frame = cv2.imdecode(frame_array, cv2.IMREAD_COLOR)
+    return process_sign_language_frame(frame, language)
+
+def summarize_session(session):
+    """Final statistics of a session, computed from its running counters"""
+    statistics = session['statistics']
+    total_translations = statistics.get('total_translations', 0)
+    return {
+        'total_frames': statistics.get('total_frames', 0),
+        'total_translations': total_translations,
+        'duration_seconds': (datetime.utcnow() - session['created_at']).total_seconds(),
+        'average_confidence': statistics.get('confidence_sum', 0.0) / total_translations if total_translations else 0
+    }
+
 def process_sign_language_frame(frame, language):
     """
     Process video frame for sign language recognition
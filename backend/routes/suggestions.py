@@ -6,10 +6,20 @@ import os
 # Fix import error by adding backend directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
-from word_suggestions import get_word_suggestions, get_predictions_from_letters
+from config import Config
+from database import db
+from word_suggestions import get_word_suggestions, get_predictions_from_letters, word_suggestion_service
 
 suggestions_bp = Blueprint('suggestions', __name__)
 
+def _user_lexicon(user_id):
+    """The user's personal word counts, None when they cannot be loaded"""
+    try:
+        return db.get_model('user_lexicons').get_lexicon(user_id)
+    except Exception as e:
+        print(f"User lexicon unavailable: {e}")
+        return None
+
 @suggestions_bp.route('/word', methods=['POST'])
 @jwt_required()
 def get_word_suggestions_endpoint():
@@ -29,7 +39,7 @@ def get_word_suggestions_endpoint():
             })
 
         # Get word suggestions
-        suggestions = get_word_suggestions(current_word, max_suggestions)
+        suggestions = get_word_suggestions(current_word, max_suggestions, _user_lexicon(user_id))
 
         return jsonify({
             'success': True,
@@ -45,6 +55,123 @@ def get_word_suggestions_endpoint():
             'suggestions': []
         }), 500
 
+def _suggest(current_word, context_words, max_suggestions, user_lexicon=None):
+    """Context-aware suggestions when there is context, plain suggestions otherwise"""
+    if context_words:
+        return word_suggestion_service.get_context_aware_suggestions(
+            current_word, context_words, max_suggestions, user_lexicon
+        )
+    return get_word_suggestions(current_word, max_suggestions, user_lexicon)
+
+@suggestions_bp.route('/word', methods=['GET'])
+def get_cached_word_suggestions_endpoint():
+    """Cacheable word suggestions: ?current_word=hel&context_words=thank,you&max_suggestions=5
+
+    Suggestions do not depend on the user, so no JWT is required and the
+    response may be stored by browsers and shared caches. The ETag lets
+    clients revalidate with If-None-Match once max-age has passed.
+    """
+    try:
+        current_word = request.args.get('current_word', '').strip()
+        context_words = [word for word in request.args.get('context_words', '').split(',') if word.strip()]
+        max_suggestions = min(int(request.args.get('max_suggestions', 5)), 10)
+
+        suggestions = _suggest(current_word, context_words, max_suggestions) if current_word or context_words else []
+
+        response = jsonify({
+            'success': True,
+            'current_word': current_word,
+            'context_words': context_words,
+            'suggestions': suggestions,
+            'count': len(suggestions)
+        })
+        response.cache_control.public = True
+        response.cache_control.max_age = Config.SUGGESTION_HTTP_MAX_AGE
+        response.add_etag()
+        return response.make_conditional(request)
+
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'suggestions': []
+        }), 400
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'suggestions': []
+        }), 500
+
+def _max_suggestions(value):
+    """max_suggestions from a request body, clamped to 1..10"""
+    return max(1, min(int(value), 10))
+
+def _context_words(value):
+    """context_words from a request body, which must be a list of strings"""
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(word, str) for word in value):
+        raise ValueError('context_words must be a list of strings')
+    return value
+
+@suggestions_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def get_batch_suggestions_endpoint():
+    """Suggestions for several words in one request
+
+    Body: {"requests": [{"current_word": "h"}, {"current_word": "he", "context_words": ["thank"]}],
+           "max_suggestions": 5}
+    Results are returned in request order.
+    """
+    try:
+        user_lexicon = _user_lexicon(get_jwt_identity())
+        data = request.get_json() or {}
+        items = data.get('requests', [])
+        max_suggestions = _max_suggestions(data.get('max_suggestions', 5))
+
+        if not isinstance(items, list):
+            return jsonify({'success': False, 'error': 'requests must be a list'}), 400
+        if len(items) > Config.SUGGESTION_BATCH_LIMIT:
+            return jsonify({
+                'success': False,
+                'error': f'At most {Config.SUGGESTION_BATCH_LIMIT} requests per batch'
+            }), 400
+
+        results = []
+        for item in items:
+            current_word = str(item.get('current_word', '')).strip()
+            context_words = _context_words(item.get('context_words'))
+            limit = _max_suggestions(item.get('max_suggestions', max_suggestions))
+            suggestions = _suggest(current_word, context_words, limit, user_lexicon) if current_word or context_words else []
+            results.append({
+                'current_word': current_word,
+                'context_words': context_words,
+                'suggestions': suggestions,
+                'count': len(suggestions)
+            })
+
+        return jsonify({
+            'success': True,
+            'results': results,
+            'count': len(results)
+        })
+
+    except (AttributeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid batch request: {str(e)}',
+            'results': []
+        }), 400
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'results': []
+        }), 500
+
 @suggestions_bp.route('/letters', methods=['POST'])
 @jwt_required()
 def get_letter_predictions_endpoint():
@@ -64,7 +191,7 @@ def get_letter_predictions_endpoint():
             })
 
         # Get predictions from letter sequence
-        predictions = get_predictions_from_letters(letter_sequence, max_predictions)
+        predictions = get_predictions_from_letters(letter_sequence, max_predictions, _user_lexicon(user_id))
 
         return jsonify({
             'success': True,
@@ -92,17 +219,16 @@ def get_context_suggestions_endpoint():
         context_words = data.get('context_words', [])
         max_suggestions = min(int(data.get('max_suggestions', 5)), 10)
 
-        if not current_word:
+        # With context but no current word, the next word is predicted
+        if not current_word and not context_words:
             return jsonify({
                 'success': True,
                 'suggestions': [],
                 'message': 'No word provided'
             })
 
-        # For now, use basic suggestions (can be enhanced with NLP context)
-        from word_suggestions import word_suggestion_service
         suggestions = word_suggestion_service.get_context_aware_suggestions(
-            current_word, context_words, max_suggestions
+            current_word, context_words, max_suggestions, _user_lexicon(user_id)
         )
 
         return jsonify({
@@ -136,8 +262,10 @@ def get_suggestion_stats():
                 'word_completion',
                 'spell_checking',
                 'letter_sequence_prediction',
-                'context_aware_suggestions'
-            ]
+                'context_aware_suggestions',
+                'batch_suggestions'
+            ],
+            'cache': word_suggestion_service.get_cache_stats()
         }
 
         return jsonify({
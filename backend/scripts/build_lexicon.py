@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Lexicon Ingestion for GestureBridge AI
+Counts unigrams in plain-text corpora, merges them with ranked "word count"
+lists, writes the ranked word counts and builds the suggestion lexicon with
+top-k completions precomputed for every prefix
+
+Counts from every source are normalized to occurrences per billion tokens
+before merging, so a small domain corpus and a large general list can be
+weighted against each other.
+
+Usage:
+    python backend/scripts/build_lexicon.py                         # defaults below
+    python backend/scripts/build_lexicon.py corpus/*.txt --base counts.txt --base-weight 0.5 \\
+        --min-count 2 --top-k 10 --prefix-length 4
+"""
+
+import argparse
+import glob
+import os
+import sys
+from collections import Counter
+from typing import Dict, Iterable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from lexicon import build_lexicon_file, read_word_counts, tokenize
+
+PER_BILLION = 1_000_000_000
+
+
+def count_corpus(paths: Iterable[str]) -> Counter:
+    counts: Counter = Counter()
+    for path in paths:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                counts.update(tokenize(line))
+    return counts
+
+
+def normalize(counts: Dict[str, int]) -> Dict[str, float]:
+    total = sum(counts.values())
+    return {word: count * PER_BILLION / total for word, count in counts.items()} if total else {}
+
+
+def merge(sources, min_count: int = 1) -> Dict[str, int]:
+    """Weighted sum of normalized (counts, weight) sources, rounded to integers"""
+    merged: Dict[str, float] = {}
+    for counts, weight in sources:
+        for word, count in normalize(counts).items():
+            merged[word] = merged.get(word, 0.0) + weight * count
+    return {word: max(1, round(count)) for word, count in merged.items()
+            if round(count) >= min_count}
+
+
+def write_word_counts(counts: Dict[str, int], path: str, sources: Iterable[str]) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# Ranked word counts per billion tokens, generated by backend/scripts/build_lexicon.py from:\n")
+        for source in sources:
+            f.write(f"#   {source}\n")
+        for word, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+            f.write(f"{word} {count}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', nargs='*', help='plain-text files (default: data/corpus/*.txt)')
+    parser.add_argument('--base', action='append', help='"word count" files to merge (default: data/base_vocabulary.txt)')
+    parser.add_argument('--base-weight', type=float, default=1.0, help='weight of the base lists against the corpus')
+    parser.add_argument('--min-count', type=int, default=1, help='drop words below this count per billion tokens')
+    parser.add_argument('--counts-output', default=Config.LEXICON_WORDS_PATH)
+    parser.add_argument('--output', default=Config.LEXICON_PATH)
+    parser.add_argument('--top-k', type=int, default=Config.LEXICON_TOP_K)
+    parser.add_argument('--prefix-length', type=int, default=Config.LEXICON_PREFIX_LENGTH)
+    args = parser.parse_args()
+
+    corpus = args.corpus or sorted(glob.glob(os.path.join(Config.DATA_DIR, 'corpus', '*.txt')))
+    bases = args.base if args.base is not None else [os.path.join(Config.DATA_DIR, 'base_vocabulary.txt')]
+
+    corpus_counts = count_corpus(corpus)
+    print(f"Counted {sum(corpus_counts.values()):,} tokens, {len(corpus_counts):,} distinct words in {len(corpus)} files")
+    sources = [(corpus_counts, 1.0)] + [(read_word_counts(path), args.base_weight) for path in bases]
+    counts = merge(sources, args.min_count)
+
+    relative = [os.path.relpath(path, Config.DATA_DIR) for path in corpus + bases]
+    write_word_counts(counts, args.counts_output, relative)
+    lexicon = build_lexicon_file(args.counts_output, args.output, args.top_k, args.prefix_length)
+    print(f"Wrote {len(counts):,} ranked words to {args.counts_output}")
+    print(f"Wrote {lexicon.node_count:,} nodes, {len(lexicon.prefix_keys):,} prefix slots to {args.output} "
+          f"({os.path.getsize(args.output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
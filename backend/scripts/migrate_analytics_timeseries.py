@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Analytics Migration for GestureBridge AI
+Moves events from the plain `analytics` collection into a time-series
+collection with metaField {user_id, event_type}, then rebuilds the per-minute
+rollups
+
+Usage:
+    python backend/scripts/migrate_analytics_timeseries.py [--batch-size 5000] [--keep-old]
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from database import db
+
+
+def to_timeseries(event):
+    """Reshape a legacy analytics document"""
+    return {
+        'timestamp': event.get('timestamp') or event['_id'].generation_time.replace(tzinfo=None),
+        'meta': {
+            'user_id': event.get('user_id'),
+            'event_type': event.get('event_type')
+        },
+        'event_name': event.get('event_name'),
+        'properties': event.get('properties', {}),
+        'session_id': event.get('session_id'),
+        'metadata': event.get('metadata', {})
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--keep-old', action='store_true', help='keep the legacy collection as analytics_legacy')
+    args = parser.parse_args()
+
+    # Connect without Database.connect(), which would create an empty
+    # time-series collection before the legacy one is moved aside
+    db.client = MongoClient(Config.MONGO_URI)
+    db.db = db.client.get_database()
+    database = db.db
+
+    if 'analytics' in database.list_collection_names() and 'timeseries' in database['analytics'].options():
+        print("✅ analytics is already a time-series collection")
+        return
+
+    if 'analytics' in database.list_collection_names():
+        database['analytics'].rename('analytics_legacy')
+        print("Renamed analytics -> analytics_legacy")
+
+    db._initialize_models()
+    analytics_model = db.get_model('analytics')
+    if not analytics_model.ensure_timeseries():
+        print("❌ Could not create the time-series collection (MongoDB 5.0+ required)")
+        sys.exit(1)
+
+    legacy = database['analytics_legacy']
+    cutoff = datetime.utcnow() - timedelta(days=Config.ANALYTICS_RETENTION_DAYS)
+    batch, migrated = [], 0
+    recent = {'$or': [
+        {'timestamp': {'$gte': cutoff}},
+        # Events logged without a timestamp are dated by their ObjectId
+        {'timestamp': None, '_id': {'$gte': ObjectId.from_datetime(cutoff)}}
+    ]}
+    for event in legacy.find(recent).sort('_id', 1):
+        batch.append(to_timeseries(event))
+        if len(batch) >= args.batch_size:
+            analytics_model.collection.insert_many(batch, ordered=False)
+            migrated += len(batch)
+            batch = []
+            print(f"  migrated {migrated:,}", end='\r')
+    if batch:
+        analytics_model.collection.insert_many(batch, ordered=False)
+        migrated += len(batch)
+    print(f"\nMigrated {migrated:,} events newer than {cutoff.isoformat()}")
+
+    rollups = analytics_model.rebuild_rollups(cutoff, datetime.utcnow())
+    print(f"Rebuilt {rollups:,} per-minute rollups")
+
+    if not args.keep_old:
+        legacy.drop()
+        print("Dropped analytics_legacy")
+
+    print("✅ Analytics migration complete")
+
+
+if __name__ == "__main__":
+    main()
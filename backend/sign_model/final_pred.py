@@ -9,8 +9,8 @@ import pyttsx3
 from keras.models import load_model
 from cvzone.HandTrackingModule import HandDetector
 from string import ascii_uppercase
-import enchant
-ddd=enchant.Dict("en-US")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_suggestions import word_suggestion_service
 hd = HandDetector(maxHands=1)
 hd2 = HandDetector(maxHands=1)
 import tkinter as tk
@@ -336,6 +336,7 @@ class Application:
 
     def clear_fun(self):
         self.str=" "
+        self.word = " "
         self.word1 = " "
         self.word2 = " "
         self.word3 = " "
@@ -764,26 +765,12 @@ class Application:
             st=self.str.rfind(" ")
             ed=len(self.str)
             word=self.str[st+1:ed]
-            self.word=word
-            if len(word.strip())!=0:
-                ddd.check(word)
-                lenn = len(ddd.suggest(word))
-                if lenn >= 4:
-                    self.word4 = ddd.suggest(word)[3]
-
-                if lenn >= 3:
-                    self.word3 = ddd.suggest(word)[2]
-
-                if lenn >= 2:
-                    self.word2 = ddd.suggest(word)[1]
-
-                if lenn >= 1:
-                    self.word1 = ddd.suggest(word)[0]
-            else:
-                self.word1 = " "
-                self.word2 = " "
-                self.word3 = " "
-                self.word4 = " "
+            # Suggestions only change with the word, not every frame
+            if word != self.word:
+                self.word=word
+                suggestions = word_suggestion_service.get_suggestions(word, 4) if len(word.strip())!=0 else []
+                suggestions = suggestions + [" "] * (4 - len(suggestions))
+                self.word1, self.word2, self.word3, self.word4 = suggestions
 
 
     def destructor(self):
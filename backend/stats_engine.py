@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Statistics Engine for GestureBridge AI
+Keeps per-user, per-language and per-session statistics as $inc counters
+updated on write, with a periodic reconciliation job that recomputes them
+from the source collections
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+from typing import Dict, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from database import analytics_timeout, db
+
+logger = logging.getLogger(__name__)
+
+
+class StatisticsEngine:
+    """Incremental counters plus reconciliation for dashboard statistics"""
+
+    # Counters recomputed by reconcile()
+    USER_FIELDS = ('total_translations', 'confidence_sum', 'total_sessions', 'rating_sum', 'rating_count')
+    LANGUAGE_FIELDS = ('total_users', 'total_translations', 'confidence_sum', 'total_sessions')
+
+    def __init__(self, database):
+        self.database = database
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record_translation(self, user_id, language, confidence=0.0):
+        """Count a translation for its user and language"""
+        try:
+            confidence = float(confidence or 0.0)
+            self.database.get_model('users').increment_statistics(user_id, {
+                'total_translations': 1,
+                'confidence_sum': confidence
+            })
+            if language:
+                self.database.get_model('languages').increment_statistics(language, {
+                    'total_translations': 1,
+                    'confidence_sum': confidence
+                })
+        except Exception as e:
+            logger.error(f"Error recording translation statistics: {str(e)}")
+
+    def record_session(self, user_id, language):
+        """Count a started streaming session"""
+        try:
+            self.database.get_model('users').increment_statistics(user_id, {'total_sessions': 1})
+            if language:
+                self.database.get_model('languages').increment_statistics(language, {'total_sessions': 1})
+        except Exception as e:
+            logger.error(f"Error recording session statistics: {str(e)}")
+
+    def record_feedback(self, user_id, accuracy_rating, previous_rating=None):
+        """Fold a translation accuracy rating into its owner's running mean
+
+        Only the latest rating of a translation counts, as in reconcile(), so
+        re-rating replaces previous_rating instead of adding a new one.
+        """
+        try:
+            if previous_rating is None:
+                increments = {'rating_sum': accuracy_rating, 'rating_count': 1}
+            else:
+                increments = {'rating_sum': accuracy_rating - previous_rating}
+            self.database.get_model('users').increment_statistics(user_id, increments)
+        except Exception as e:
+            logger.error(f"Error recording feedback statistics: {str(e)}")
+
+    def record_user(self, language):
+        """Count a newly registered user for their preferred language"""
+        try:
+            self.database.get_model('languages').increment_statistics(language or 'ASL', {'total_users': 1})
+        except Exception as e:
+            logger.error(f"Error recording user statistics: {str(e)}")
+
+    def reconcile(self) -> Dict[str, int]:
+        """Recompute all counters from the source collections, returns how many documents were corrected
+
+        Corrections are applied as $inc deltas guarded by the counter values
+        they were computed against, so increments landing meanwhile are never
+        overwritten; documents whose counters moved while the sources were
+        aggregated are left for the next run.
+        """
+        with analytics_timeout():
+            return {
+                'users': self._reconcile_users(),
+                'languages': self._reconcile_languages()
+            }
+
+    def _grouped(self, collection_name, pipeline):
+        # Read from the primary: the targets are written back, and a lagging
+        # secondary would erase the increments it has not replicated yet
+        return {
+            doc['_id']: doc
+            for doc in self.database.get_collection(collection_name, primary=True).aggregate(pipeline)
+            if doc['_id'] is not None
+        }
+
+    def _counters(self, collection_name, key_field, prefix, fields):
+        """Current raw counter values per document, None where a field is missing"""
+        projection = {key_field: 1, **{f'{prefix}{field}': 1 for field in fields}}
+        counters = {}
+        for doc in self.database.get_collection(collection_name, primary=True).find({}, projection):
+            values = doc.get(prefix.rstrip('.'), {}) if prefix else doc
+            counters[doc[key_field]] = tuple(values.get(field) for field in fields)
+        return counters
+
+    def _apply_deltas(self, collection_name, key_field, prefix, fields, before, after, targets) -> int:
+        """$inc every document's counters to its target, if they did not move since before"""
+        operations = []
+        for key, current in after.items():
+            if before.get(key) != current:
+                continue
+            target = targets.get(key, {})
+            deltas = {}
+            for field, value in zip(fields, current):
+                delta = target.get(field, 0) - (value or 0)
+                if abs(delta) > 1e-9:
+                    deltas[f'{prefix}{field}'] = delta
+            if deltas:
+                guard = {f'{prefix}{field}': value for field, value in zip(fields, current)}
+                operations.append(UpdateOne({key_field: key, **guard}, {'$inc': deltas}))
+
+        if operations:
+            self.database.get_collection(collection_name).bulk_write(operations, ordered=False)
+        return len(operations)
+
+    def _reconcile_users(self) -> int:
+        before = self._counters('users', '_id', 'statistics.', self.USER_FIELDS)
+        translations = self._grouped('translations', [
+            {'$group': {
+                '_id': '$user_id',
+                'count': {'$sum': 1},
+                'confidence_sum': {'$sum': {'$ifNull': ['$confidence', 0]}}
+            }}
+        ])
+        # Ratings belong to the translation's owner, one (the latest) per translation
+        ratings = self._grouped('translations', [
+            {'$match': {'feedback.accuracy_rating': {'$type': 'number'}}},
+            {'$group': {
+                '_id': '$user_id',
+                'count': {'$sum': 1},
+                'rating_sum': {'$sum': '$feedback.accuracy_rating'}
+            }}
+        ])
+        sessions = self._grouped('streaming_sessions', [
+            {'$group': {
+                '_id': '$user_id',
+                'count': {'$sum': 1},
+                'frames': {'$sum': '$statistics.total_translations'},
+                'confidence_sum': {'$sum': '$statistics.confidence_sum'}
+            }}
+        ])
+        after = self._counters('users', '_id', 'statistics.', self.USER_FIELDS)
+
+        targets = {}
+        for user_id in set(translations) | set(ratings) | set(sessions):
+            t = translations.get(user_id, {})
+            r = ratings.get(user_id, {})
+            s = sessions.get(user_id, {})
+            targets[ObjectId(user_id)] = {
+                'total_translations': t.get('count', 0) + s.get('frames', 0),
+                'confidence_sum': t.get('confidence_sum', 0.0) + s.get('confidence_sum', 0.0),
+                'total_sessions': s.get('count', 0),
+                'rating_sum': r.get('rating_sum', 0),
+                'rating_count': r.get('count', 0)
+            }
+        return self._apply_deltas('users', '_id', 'statistics.', self.USER_FIELDS, before, after, targets)
+
+    def _reconcile_languages(self) -> int:
+        before = self._counters('languages', 'code', '', self.LANGUAGE_FIELDS)
+        users = self._grouped('users', [
+            {'$group': {'_id': {'$ifNull': ['$profile.preferred_language', 'ASL']}, 'count': {'$sum': 1}}}
+        ])
+        translations = self._grouped('translations', [
+            {'$group': {
+                '_id': '$language',
+                'count': {'$sum': 1},
+                'confidence_sum': {'$sum': {'$ifNull': ['$confidence', 0]}}
+            }}
+        ])
+        sessions = self._grouped('streaming_sessions', [
+            {'$group': {
+                '_id': '$language',
+                'count': {'$sum': 1},
+                'frames': {'$sum': '$statistics.total_translations'},
+                'confidence_sum': {'$sum': '$statistics.confidence_sum'}
+            }}
+        ])
+        after = self._counters('languages', 'code', '', self.LANGUAGE_FIELDS)
+
+        targets = {}
+        for code in set(users) | set(translations) | set(sessions):
+            t = translations.get(code, {})
+            s = sessions.get(code, {})
+            targets[code] = {
+                'total_users': users.get(code, {}).get('count', 0),
+                'total_translations': t.get('count', 0) + s.get('frames', 0),
+                'confidence_sum': t.get('confidence_sum', 0.0) + s.get('confidence_sum', 0.0),
+                'total_sessions': s.get('count', 0)
+            }
+        return self._apply_deltas('languages', 'code', '', self.LANGUAGE_FIELDS, before, after, targets)
+
+    def start_reconciliation(self, interval: float) -> None:
+        """Run reconcile() every interval seconds in a background thread"""
+        if interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name='stats-reconcile', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            try:
+                counts = self.reconcile()
+                logger.info(f"Statistics reconciled: {counts}")
+            except Exception as e:
+                logger.error(f"Statistics reconciliation failed: {str(e)}")
+
+
+class AsyncStatisticsEngine:
+    """Incremental counters for the ASGI routes, using the async models"""
+
+    def __init__(self, database):
+        self.database = database
+
+    async def record_translation(self, user_id, language, confidence=0.0):
+        try:
+            confidence = float(confidence or 0.0)
+            await self.database.get_model('users').increment_statistics(user_id, {
+                'total_translations': 1,
+                'confidence_sum': confidence
+            })
+            if language:
+                await self.database.get_model('languages').increment_statistics(language, {
+                    'total_translations': 1,
+                    'confidence_sum': confidence
+                })
+        except Exception as e:
+            logger.error(f"Error recording translation statistics: {str(e)}")
+
+    async def record_session(self, user_id, language):
+        try:
+            await self.database.get_model('users').increment_statistics(user_id, {'total_sessions': 1})
+            if language:
+                await self.database.get_model('languages').increment_statistics(language, {'total_sessions': 1})
+        except Exception as e:
+            logger.error(f"Error recording session statistics: {str(e)}")
+
+
+# Global instance
+stats_engine = StatisticsEngine(db)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Recompute GestureBridge AI statistics counters')
+    parser.add_argument('--reconcile', action='store_true', help='recompute user and language counters once')
+    args = parser.parse_args()
+
+    if args.reconcile:
+        db.connect()
+        print(f"✅ Reconciled: {stats_engine.reconcile()}")
+    else:
+        parser.print_help()
@@ -0,0 +1,101 @@
+# conftest.py
+import os
+from contextlib import contextmanager
+
+import bson
+import mongomock
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager
+from pymongo import monitoring
+from backend.database import Database
+
+
+@pytest.fixture
+def mock_db():
+    """Database wired to an in-memory mongomock client"""
+    database = Database()
+    database.client = mongomock.MongoClient()
+    database.db = database.client['gesturebridge_test']
+    database._initialize_models()
+    yield database
+    database.close()
+
+
+class TransferMeter(monitoring.CommandListener):
+    """Counts BSON bytes of command replies, i.e. what the server sent back"""
+
+    def __init__(self):
+        self.bytes_received = 0
+        self.commands = 0
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.bytes_received += len(bson.encode(event.reply))
+        self.commands += 1
+
+    def failed(self, event):
+        pass
+
+    @contextmanager
+    def measure(self):
+        """Reset the counters, then yield the meter for the measured block"""
+        self.bytes_received = 0
+        self.commands = 0
+        yield self
+
+
+@pytest.fixture
+def transfer_meter():
+    return TransferMeter()
+
+
+@pytest.fixture
+def live_db(transfer_meter):
+    """Database on a real mongod, e.g. MONGO_TEST_URI=mongodb://localhost:27017/gesturebridge_test"""
+    uri = os.getenv('MONGO_TEST_URI')
+    if not uri:
+        pytest.skip('MONGO_TEST_URI not set')
+    from pymongo import MongoClient
+    from backend.indexes import ensure_indexes
+    database = Database()
+    database.client = MongoClient(uri, serverSelectionTimeoutMS=2000, event_listeners=[transfer_meter])
+    database.db = database.client.get_database()
+    database._initialize_models()
+    ensure_indexes(database)
+    yield database
+    if database.db.name.endswith('_test'):
+        database.client.drop_database(database.db.name)
+    database.close()
+
+
+@pytest.fixture
+def auth_client(request):
+    """Auth routes bound to the database of the requesting test"""
+    from backend.routes import auth
+
+    database = request.getfixturevalue(request.param)
+    # Routes use the flat `database` module, so point its shared instance at the test database
+    saved = auth.db.client, auth.db.db, dict(auth.db.models)
+    auth.db.client, auth.db.db = database.client, database.db
+    auth.db._initialize_models()
+
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-for-projection-tests'
+    JWTManager(app).additional_claims_loader(auth.add_role_claims)
+    app.register_blueprint(auth.auth_bp, url_prefix='/api/auth')
+    with app.test_client() as client:
+        yield app, client, database
+    auth.db.client, auth.db.db, auth.db.models = saved
+
+
+@pytest.fixture
+def fake_llm_server():
+    """OpenAI-compatible server streaming fixed tokens; set tokens/token_delay per test"""
+    from backend.tests.fake_llm_server import FakeLLMServer
+
+    server = FakeLLMServer(token_delay=0.01).start()
+    yield server
+    server.stop()
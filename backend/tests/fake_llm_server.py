@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Fake OpenAI-compatible chat completions server for tests
+Answers POST /v1/chat/completions with a fixed list of tokens, generated
+token_delay seconds apart and sent as Server-Sent Events when stream is
+true or in one JSON response once all are generated otherwise, and
+records how many tokens each stream delivered before the client hung up.
+
+Point the OpenAI backend at it with OPENAI_BASE_URL, e.g.
+    python backend/tests/fake_llm_server.py --port 8089 --delay 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=fake python backend/app.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_TOKENS = ['Hello', '!', ' Open', ' the', ' dashboard', ' and', ' click', ' Start', ' Live', ' Demo', '.']
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: 'FakeLLMServer'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _chunk(self, delta=None, finish_reason=None, usage=None):
+        payload = {
+            'id': 'chatcmpl-fake', 'object': 'chat.completion.chunk', 'created': 0, 'model': 'fake',
+            'choices': [] if usage else [{'index': 0, 'delta': delta or {}, 'finish_reason': finish_reason}],
+            'usage': usage
+        }
+        self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+        self.wfile.flush()
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        self.server.requests.append(request)
+        tokens = self.server.tokens
+        usage = {'prompt_tokens': 10, 'completion_tokens': len(tokens), 'total_tokens': 10 + len(tokens)}
+
+        if not request.get('stream'):
+            # The whole answer is generated before anything is sent
+            time.sleep(self.server.token_delay * len(tokens))
+            body = json.dumps({
+                'id': 'chatcmpl-fake', 'object': 'chat.completion', 'created': 0, 'model': 'fake',
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': ''.join(tokens)}}],
+                'usage': usage
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        sent = 0
+        try:
+            for token in tokens:
+                time.sleep(self.server.token_delay)
+                self._chunk({'role': 'assistant', 'content': token} if not sent else {'content': token})
+                sent += 1
+            self._chunk(finish_reason='stop')
+            if (request.get('stream_options') or {}).get('include_usage'):
+                self._chunk(usage=usage)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.server.disconnected.set()
+        finally:
+            self.server.tokens_sent.append(sent)
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, tokens=None, token_delay: float = 0.0, port: int = 0):
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.tokens = list(tokens or DEFAULT_TOKENS)
+        self.token_delay = token_delay
+        self.requests = []
+        self.tokens_sent = []
+        self.disconnected = threading.Event()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self) -> 'FakeLLMServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--delay', type=float, default=0.05, help='seconds between tokens')
+    args = parser.parse_args()
+    server = FakeLLMServer(token_delay=args.delay, port=args.port)
+    print(f"Fake LLM server on {server.base_url}")
+    server.serve_forever()
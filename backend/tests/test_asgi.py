@@ -0,0 +1,115 @@
+# test_asgi.py
+from datetime import datetime
+
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token
+from starlette.testclient import TestClient
+
+from backend import asgi
+
+
+def _chat_client(monkeypatch):
+    """TestClient sending an access token accepted by the mounted Flask app's settings"""
+    app = _flask_app()
+    monkeypatch.setattr(asgi.flask_app, 'app', app)
+    with app.app_context():
+        token = create_access_token(identity='64b000000000000000000001')
+    return TestClient(asgi.app, headers={'Authorization': f'Bearer {token}'})
+
+
+def _flask_app(**config):
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = asgi.Config.JWT_SECRET_KEY
+    app.config.update(config)
+    JWTManager(app)
+    return app
+
+
+class _Request:
+    def __init__(self, token):
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+
+def test_flask_access_tokens_authenticate_async_routes(monkeypatch):
+    app = _flask_app()
+    monkeypatch.setattr(asgi.flask_app, 'app', app)
+    with app.app_context():
+        access, refresh = create_access_token(identity='64b000000000000000000001'), create_refresh_token(identity='x')
+
+    assert asgi.jwt_identity(_Request(access)) == '64b000000000000000000001'
+    assert asgi.jwt_identity(_Request(refresh)) is None
+    assert asgi.jwt_identity(_Request('not-a-token')) is None
+
+
+def test_jwt_identity_follows_the_flask_jwt_settings(monkeypatch):
+    app = _flask_app(JWT_ALGORITHM='HS512', JWT_IDENTITY_CLAIM='user')
+    monkeypatch.setattr(asgi.flask_app, 'app', app)
+    with app.app_context():
+        access = create_access_token(identity='64b000000000000000000001')
+
+    assert asgi.jwt_identity(_Request(access)) == '64b000000000000000000001'
+    app.config['JWT_ALGORITHM'] = 'HS256'
+    assert asgi.jwt_identity(_Request(access)) is None
+
+
+def test_async_routes_require_a_token():
+    # Without the context manager the lifespan (database connect) does not run
+    client = TestClient(asgi.app)
+    assert client.get('/api/inference/history').status_code == 401
+    assert client.post('/api/streaming/process_frame', json={}).status_code == 401
+
+
+def test_json_matches_flask_serialization():
+    body = asgi.JSONResponse({'ended_at': datetime(2024, 1, 2, 3, 4, 5)}).body
+    assert body == b'{"ended_at":"Tue, 02 Jan 2024 03:04:05 GMT"}'
+
+
+def test_other_routes_are_served_by_the_mounted_flask_app(monkeypatch):
+    flask_app = Flask(__name__)
+
+    @flask_app.route('/api/chat/ping')
+    def ping():
+        return {'pong': True}
+
+    monkeypatch.setattr(asgi.flask_app, 'app', flask_app)
+    client = TestClient(asgi.app)
+    assert client.get('/api/chat/ping').json() == {'pong': True}
+
+
+def test_chat_stream_is_served_natively(monkeypatch):
+    from backend.llm_gateway import StubBackend
+    from backend.routes import chat
+
+    saved = chat.llm_gateway.backend
+    chat.llm_gateway.configure_backend(StubBackend())
+    try:
+        assert TestClient(asgi.app).post('/api/chat/stream', json={'message': 'hello there'}).status_code == 401
+        assert chat.llm_gateway.backend.calls == []
+
+        client = _chat_client(monkeypatch)
+        with client.stream('POST', '/api/chat/stream', json={'message': 'hello there'}) as response:
+            body = ''.join(response.iter_text())
+        assert response.headers['content-type'].startswith('text/event-stream')
+        assert body.count('event: token') == 3
+        assert 'event: done\ndata: {"bot_response": "[stub] hello there"}' in body
+        assert client.post('/api/chat/stream', json={}).status_code == 400
+    finally:
+        chat.llm_gateway.configure_backend(saved)
+        chat.chat_response_cache.clear()
+
+
+def test_chat_stream_ends_when_the_relay_fails(monkeypatch):
+    from backend.llm_gateway import StubBackend
+    from backend.routes import chat
+
+    def failing(message, chunks):
+        raise RuntimeError('relay broke')
+    monkeypatch.setattr(asgi, 'chatbot_events', failing)
+    saved = chat.llm_gateway.backend
+    chat.llm_gateway.configure_backend(StubBackend())
+    try:
+        client = _chat_client(monkeypatch)
+        with client.stream('POST', '/api/chat/stream', json={'message': 'hello there'}) as response:
+            assert ''.join(response.iter_text()) == ''
+    finally:
+        chat.llm_gateway.configure_backend(saved)
@@ -0,0 +1,79 @@
+# test_auth.py
+import pytest
+from flask_jwt_extended import create_access_token, decode_token
+from werkzeug.security import generate_password_hash
+
+
+def _create_user(database, username, role='user'):
+    users_model = database.get_model('users')
+    user_id = users_model.create_user(username, f'{username}@example.com', generate_password_hash('secret'))
+    users_model.update_user(user_id, {'role': role})
+    return str(user_id)
+
+
+@pytest.mark.parametrize('auth_client', ['mock_db'], indirect=True)
+def test_admin_check_uses_role_claim(auth_client):
+    app, client, database = auth_client
+    _create_user(database, 'admin', role='admin')
+
+    response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'secret'})
+    token = response.get_json()['access_token']
+    with app.app_context():
+        assert decode_token(token)['role'] == 'admin'
+
+    # The role comes from the token, not from the (now missing) user document
+    database.get_collection('users').delete_one({'username': 'admin'})
+    response = client.get('/api/auth/admin/users', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+
+    with app.app_context():
+        user_token = create_access_token(identity=_create_user(database, 'alice'))
+    response = client.get('/api/auth/admin/users', headers={'Authorization': f'Bearer {user_token}'})
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize('auth_client', ['mock_db'], indirect=True)
+def test_profile_is_cached_until_update(auth_client):
+    app, client, database = auth_client
+    user_id = _create_user(database, 'alice')
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+
+    assert client.get('/api/auth/profile', headers=headers).get_json()['user']['username'] == 'alice'
+    database.get_collection('users').update_one({'username': 'alice'}, {'$set': {'email': 'new@example.com'}})
+    assert client.get('/api/auth/profile', headers=headers).get_json()['user']['email'] == 'alice@example.com'
+
+    assert client.put('/api/auth/profile', headers=headers, json={'username': 'alicia'}).status_code == 200
+    user = client.get('/api/auth/profile', headers=headers).get_json()['user']
+    assert user['username'] == 'alicia'
+    assert user['email'] == 'new@example.com'
+
+
+@pytest.mark.parametrize('auth_client', ['mock_db'], indirect=True)
+def test_registration_counts_users_per_language_like_reconcile(auth_client):
+    from backend.stats_engine import StatisticsEngine
+    app, client, database = auth_client
+    database.get_model('languages').create_language({'code': 'BSL', 'name': 'British Sign Language'})
+
+    response = client.post('/api/auth/register', json={
+        'username': 'alice', 'email': 'alice@example.com', 'password': 'secret', 'preferred_language': 'BSL'
+    })
+    assert response.status_code == 201
+    assert database.get_collection('users').find_one({'username': 'alice'})['profile']['preferred_language'] == 'BSL'
+
+    languages = database.get_collection('languages')
+    assert languages.find_one({'code': 'BSL'})['total_users'] == 1
+    StatisticsEngine(database).reconcile()
+    assert languages.find_one({'code': 'BSL'})['total_users'] == 1
+
+
+@pytest.mark.parametrize('auth_client', ['mock_db'], indirect=True)
+def test_deleted_user_leaves_the_cache(auth_client):
+    app, client, database = auth_client
+    user_id = _create_user(database, 'alice')
+    users_model = database.get_model('users')
+    assert users_model.get_cached_user(user_id)['username'] == 'alice'
+
+    assert users_model.delete_user(user_id)
+    assert users_model.get_cached_user(user_id) is None
+    assert users_model.get_role(user_id) is None
@@ -0,0 +1,57 @@
+# test_chat_cache.py
+import time
+
+import pytest
+
+from backend.chat_cache import ChatResponseCache
+from backend.llm_gateway import StubBackend
+
+
+def test_reworded_questions_reuse_the_answer():
+    cache = ChatResponseCache(maxsize=10, ttl=None, threshold=0.7)
+    cache.put('How do I reset my password?', 'Use the reset link.')
+    cache.put('How do I delete my account?', 'Open your profile.')
+
+    assert cache.get('how do i reset my password') == 'Use the reset link.'
+    assert cache.get('Reset my password please') == 'Use the reset link.'
+    assert cache.get('How do I reset my profile?') is None
+    assert cache.get('What can you do?') is None
+    stats = cache.get_stats()
+    assert (stats['exact_hits'], stats['similar_hits'], stats['misses']) == (1, 1, 2)
+
+
+def test_evicted_and_expired_questions_leave_the_index():
+    cache = ChatResponseCache(maxsize=2, ttl=None)
+    cache.put('camera not detected', 'Check permissions.')
+    cache.put('app works offline', 'Yes.')
+    cache.put('supported browsers', 'Chrome and Firefox.')
+
+    assert cache.nearest('camera not detected') == []
+    assert cache.get('Which browsers are supported?') == 'Chrome and Firefox.'
+
+    expiring = ChatResponseCache(ttl=0.01)
+    expiring.put('camera not detected', 'Check permissions.')
+    time.sleep(0.02)
+    assert expiring.get('my camera is not detected') is None
+    assert expiring.nearest('camera not detected') == []
+
+
+@pytest.fixture
+def chat_with_stub_llm():
+    from backend.routes import chat
+
+    backend, saved = StubBackend(), chat.llm_gateway.backend
+    chat.llm_gateway.configure_backend(backend)
+    chat.chat_response_cache.clear()
+    yield chat, backend
+    chat.llm_gateway.configure_backend(saved)
+    chat.chat_response_cache.clear()
+
+
+def test_chatbot_answers_repeated_questions_from_the_cache(chat_with_stub_llm):
+    chat, backend = chat_with_stub_llm
+
+    first = chat.get_chatbot_response('Does the app work offline?')
+    assert chat.get_chatbot_response('does it work offline') == first
+    assert chat.get_chatbot_response('How do I contact support?') != first
+    assert len(backend.calls) == 2
@@ -0,0 +1,88 @@
+# test_chat_stream.py
+import json
+import time
+
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from backend.llm_gateway import StubBackend
+
+
+@pytest.fixture
+def chat_client():
+    from backend.routes import chat
+
+    backend, saved = StubBackend(token_delay=0.05), chat.llm_gateway.backend
+    chat.llm_gateway.configure_backend(backend)
+    chat.chat_response_cache.clear()
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-for-chat-tests'
+    JWTManager(app)
+    app.register_blueprint(chat.chat_bp, url_prefix='/api/chat')
+    with app.app_context():
+        token = create_access_token(identity='64b000000000000000000001')
+    with app.test_client() as client:
+        client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        yield client, chat
+    chat.llm_gateway.configure_backend(saved)
+    chat.chat_response_cache.clear()
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        event, data = block.split('\n')
+        events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def test_stream_sends_tokens_then_the_answer(chat_client):
+    client, chat = chat_client
+    response = client.post('/api/chat/stream', json={'message': 'is asl supported'})
+
+    assert response.mimetype == 'text/event-stream'
+    events = parse_events(response.get_data(as_text=True))
+    assert [name for name, _ in events] == ['token'] * 4 + ['done']
+    assert ''.join(data['text'] for _, data in events[:-1]) == '[stub] is asl supported'
+    assert events[-1][1]['bot_response'] == '[stub] is asl supported'
+    # The streamed answer is cached for the JSON endpoint
+    assert chat.get_chatbot_response('Is ASL supported?') == '[stub] is asl supported'
+    assert client.post('/api/chat/stream', json={'message': ' '}).status_code == 400
+
+
+def test_stream_requires_a_token(chat_client):
+    client, chat = chat_client
+    del client.environ_base['HTTP_AUTHORIZATION']
+    assert client.post('/api/chat/stream', json={'message': 'is asl supported'}).status_code == 401
+    assert chat.llm_gateway.backend.calls == []
+
+
+def test_first_token_arrives_before_generation_ends_and_disconnect_cancels(chat_client):
+    client, chat = chat_client
+    started = time.perf_counter()
+    response = client.post('/api/chat/stream', json={'message': 'one two three four five six seven eight'},
+                           buffered=False)
+    first = next(iter(response.response))
+    first_token_seconds = time.perf_counter() - started
+
+    assert first.startswith(b'event: token')
+    # Nine words 50ms apart: the first arrives well before the last would
+    assert first_token_seconds < 0.3
+    response.close()
+    assert chat.llm_gateway.get_metrics()['features']['chat']['counters']['cancelled'] >= 1
+    assert chat.chat_response_cache.get('one two three four five six seven eight') is None
+
+
+def test_stream_closed_before_the_first_event_frees_its_slot(chat_client):
+    client, chat = chat_client
+    gateway = chat.llm_gateway
+    # The test client always reads the first chunk, so call the view directly
+    with client.application.test_request_context('/api/chat/stream', method='POST',
+                                                 json={'message': 'closed before reading'},
+                                                 headers={'Authorization': client.environ_base['HTTP_AUTHORIZATION']}):
+        response = chat.stream_message()
+    assert gateway._concurrency._value < gateway._concurrency._initial_value
+    response.close()
+
+    assert gateway._concurrency._value == gateway._concurrency._initial_value
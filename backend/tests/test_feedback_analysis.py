@@ -0,0 +1,101 @@
+# test_feedback_analysis.py
+import json
+import pytest
+from bson import ObjectId
+from backend.llm_gateway import StubBackend
+from backend.feedback_analysis import FeedbackAnalysisWorker, llm_gateway, feedback_analysis_cache
+from backend.analysis_cache import FeedbackAnalysisCache
+
+
+def batch_responder(messages):
+    """Fake LLM that answers batch prompts with one analysis per item"""
+    prompt = messages[-1]['content']
+    count = prompt.count('| Comment:')
+    if count == 0:
+        return json.dumps({'sentiment': 'positive', 'insights': [], 'suggestions': [], 'priority': 'low'})
+    return json.dumps([
+        {'index': i, 'sentiment': 'negative', 'insights': ['x'], 'suggestions': ['y'], 'priority': 'high'}
+        for i in range(count)
+    ])
+
+
+@pytest.fixture
+def stub_llm():
+    previous = llm_gateway.backend
+    backend = StubBackend(responder=batch_responder)
+    llm_gateway.configure_backend(backend)
+    feedback_analysis_cache.clear()
+    yield backend
+    llm_gateway.configure_backend(previous)
+    feedback_analysis_cache.clear()
+
+
+def submit(mock_db, comment):
+    return mock_db.get_model('feedback').create_feedback(str(ObjectId()), {
+        'type': 'accuracy', 'rating': 2, 'comment': comment, 'analysis_status': 'pending'
+    })
+
+
+def test_worker_analyzes_pending_feedback_in_one_batch(mock_db, stub_llm):
+    ids = [submit(mock_db, f"letter {c} is wrong") for c in 'ABC']
+    worker = FeedbackAnalysisWorker(mock_db, batch_size=10)
+
+    assert worker.run_once() == 3
+    assert len(stub_llm.calls) == 1
+
+    feedback_model = mock_db.get_model('feedback')
+    for feedback_id in ids:
+        feedback = feedback_model.get_feedback_by_id(feedback_id)
+        assert feedback['analysis_status'] == 'completed'
+        assert feedback['ai_analysis']['priority'] == 'high'
+
+    assert worker.run_once() == 0
+
+
+def test_worker_requeues_batch_when_llm_fails(mock_db, stub_llm):
+    def failing(messages):
+        raise RuntimeError('llm down')
+    stub_llm.responder = failing
+    feedback_id = submit(mock_db, 'crashes on start')
+    submit(mock_db, 'slow')
+
+    worker = FeedbackAnalysisWorker(mock_db, max_attempts=1)
+    # Nothing was analyzed, so the worker waits before polling again
+    assert worker.run_once() == 0
+
+    feedback = mock_db.get_model('feedback').get_feedback_by_id(feedback_id)
+    assert feedback['analysis_status'] == 'failed'
+    assert 'llm down' in feedback['analysis_error']
+
+
+def test_feedback_without_comment_is_not_queued(mock_db, stub_llm):
+    mock_db.get_model('feedback').create_feedback(str(ObjectId()), {'type': 'general', 'rating': 5})
+    assert FeedbackAnalysisWorker(mock_db).run_once() == 0
+
+
+def test_repeated_comments_reuse_cached_analysis(mock_db, stub_llm):
+    submit(mock_db, 'Not accurate for J')
+    submit(mock_db, 'crashes when I switch camera')
+    worker = FeedbackAnalysisWorker(mock_db)
+    worker.run_once()
+    assert len(stub_llm.calls) == 1
+
+    submit(mock_db, 'not accurate for J!!')
+    submit(mock_db, 'Crashes when I switch cameras')
+    worker.run_once()
+    assert len(stub_llm.calls) == 1
+    stats = feedback_analysis_cache.get_stats()
+    assert stats['exact_hits'] == 1
+    assert stats['fuzzy_hits'] == 1
+
+
+def test_analysis_cache_separates_rating_buckets_and_evicts():
+    cache = FeedbackAnalysisCache(maxsize=1)
+    cache.put({'comment': 'great app', 'type': 'general', 'rating': 5}, {'sentiment': 'positive'})
+    assert cache.get({'comment': 'Great app.', 'type': 'general', 'rating': 4}) == {'sentiment': 'positive'}
+    assert cache.get({'comment': 'great app', 'type': 'general', 'rating': 1}) is None
+
+    cache.put({'comment': 'slow', 'type': 'bug', 'rating': 2}, {'sentiment': 'negative'})
+    assert cache.get({'comment': 'great app', 'type': 'general', 'rating': 5}) is None
+    assert cache.get_stats()['evictions'] == 1
+    assert not cache._buckets or all(('general', 'high') != k[:2] for k in cache._buckets)
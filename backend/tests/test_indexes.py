@@ -0,0 +1,193 @@
+# test_indexes.py
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING
+
+from backend.indexes import declared_indexes, ensure_indexes, find_covering_index
+
+
+class _RecordingCursor:
+    def __init__(self, cursor, entry):
+        self._cursor = cursor
+        self._entry = entry
+
+    def sort(self, key, direction=None):
+        self._entry['sort'] = list(key) if isinstance(key, list) else [(key, direction or ASCENDING)]
+        self._cursor = self._cursor.sort(key, direction) if direction else self._cursor.sort(key)
+        return self
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class _RecordingCollection:
+    """Collection proxy logging the filter and sort of every query a model sends"""
+
+    def __init__(self, collection, log):
+        self._collection = collection
+        self._log = log
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    def _record(self, query, sort=None):
+        entry = {'collection': self._collection.name, 'filter': query or {}, 'sort': list(sort or [])}
+        self._log.append(entry)
+        return entry
+
+    def find(self, filter=None, *args, **kwargs):
+        entry = self._record(filter, kwargs.get('sort'))
+        return _RecordingCursor(self._collection.find(filter, *args, **kwargs), entry)
+
+    def find_one(self, filter=None, *args, **kwargs):
+        self._record(filter, kwargs.get('sort'))
+        return self._collection.find_one(filter, *args, **kwargs)
+
+    def find_one_and_update(self, filter, update, *args, **kwargs):
+        self._record(filter, kwargs.get('sort'))
+        return self._collection.find_one_and_update(filter, update, *args, **kwargs)
+
+    def update_one(self, filter, update, *args, **kwargs):
+        self._record(filter)
+        return self._collection.update_one(filter, update, *args, **kwargs)
+
+    def count_documents(self, filter, *args, **kwargs):
+        self._record(filter)
+        return self._collection.count_documents(filter, *args, **kwargs)
+
+    def bulk_write(self, requests, *args, **kwargs):
+        for request in requests:
+            self._record(getattr(request, '_filter', None))
+        return self._collection.bulk_write(requests, *args, **kwargs)
+
+
+def record_model_queries(database):
+    """Run the model methods behind the routes and return the queries they send"""
+    log = []
+    for model in database.models.values():
+        for name, value in list(vars(model).items()):
+            if hasattr(value, 'find_one_and_update') and hasattr(value, 'name'):
+                setattr(model, name, _RecordingCollection(value, log))
+
+    now = datetime.utcnow()
+    users = database.get_model('users')
+    user_id = users.create_user('ana', 'ana@example.com', 'hash')
+    users.get_user_by_email('ana@example.com')
+    users.get_user_by_username('ana')
+    users.increment_statistics(user_id, {'total_sessions': 1})
+
+    translations = database.get_model('translations')
+    translation_ids = [translations.create_translation(str(user_id), {'output_data': 'hi'}) for _ in range(2)]
+    page = translations.get_user_translations(user_id, per_page=1, include_total=True)
+    translations.get_user_translations(user_id, cursor=page['next_cursor'], per_page=1)
+    translations.update_feedback(str(translation_ids[0]), {'accuracy_rating': 4})
+
+    feedback = database.get_model('feedback')
+    feedback_ids = [feedback.create_feedback(str(user_id), {'type': 'general', 'rating': 4, 'comment': 'slow'})
+                    for _ in range(2)]
+    page = feedback.get_user_feedback(user_id, per_page=1, include_total=True)
+    feedback.get_user_feedback(user_id, cursor=page['next_cursor'], per_page=1)
+    feedback.claim_pending_analysis(1, 'worker')
+    feedback.add_vote(str(feedback_ids[0]), str(user_id))
+
+    sessions = database.get_model('streaming_sessions')
+    sessions.create_session(str(user_id), {'session_id': 's1'})
+    sessions.get_session('s1')
+    for _ in range(2):
+        sessions.record_frame('s1', str(user_id), {'text': 'hello', 'confidence': 0.9})
+    page = sessions.get_session_translations('s1', per_page=1)
+    sessions.get_session_translations('s1', cursor=page['next_cursor'], per_page=1)
+    for status in ('active', 'all'):
+        sessions.get_user_sessions(str(user_id), status=status, include_total=True)
+    sessions.end_session('s1', {'duration_seconds': 1})
+
+    analytics = database.get_model('analytics')
+    analytics.log_event(str(user_id), {'event_type': 'streaming', 'event_name': 'frame'})
+    analytics.flush_rollups()
+    for event_type in ('streaming', None):
+        analytics.get_rollups(now - timedelta(hours=1), now + timedelta(hours=1), event_type)
+
+    languages = database.get_model('languages')
+    languages.create_language({'code': 'ASL', 'name': 'American Sign Language'})
+    languages.get_supported_languages()
+    languages.increment_statistics('ASL', {'total_users': 1})
+
+    lexicons = database.get_model('user_lexicons')
+    lexicons.record_text(str(user_id), 'hello there')
+    lexicons.get_lexicon(str(user_id))
+    return log
+
+
+def _conjunctions(query):
+    """The query as a list of flat AND-ed conditions, one per $or branch"""
+    branches = [{}]
+    for key, value in query.items():
+        if key == '$and':
+            for clause in value:
+                branches = [{**branch, **option} for branch in branches for option in _conjunctions(clause)]
+        elif key == '$or':
+            options = [option for clause in value for option in _conjunctions(clause)]
+            branches = [{**branch, **option} for branch in branches for option in options]
+        else:
+            branches = [{**branch, key: value} for branch in branches]
+    return branches
+
+
+def query_shapes(query, sort):
+    """(equality fields, sort fields, range fields) the planner needs an index for, per $or branch"""
+    shapes = []
+    for conditions in _conjunctions(query):
+        if '_id' in conditions and not isinstance(conditions['_id'], dict):
+            continue  # served by the _id index
+        ranges = [field for field, value in conditions.items()
+                  if isinstance(value, dict) and set(value) - {'$eq', '$in'}]
+        equality = [field for field in conditions if field not in ranges]
+        # Sorting on a field pinned by equality is free
+        shapes.append((equality, [field for field, _ in sort if field not in equality], ranges))
+    return shapes
+
+
+def test_model_queries_have_a_declared_index(mock_db):
+    indexes = declared_indexes(mock_db)
+    uncovered = [
+        (entry['collection'], shape)
+        for entry in record_model_queries(mock_db)
+        for shape in query_shapes(entry['filter'], entry['sort'])
+        if not find_covering_index(indexes[entry['collection']], *shape)
+    ]
+    assert not uncovered
+
+
+def test_ensure_indexes_is_idempotent_and_drops_redundant(mock_db):
+    translations = mock_db.get_collection('translations')
+    translations.create_index('user_id')
+    translations.create_index('language')
+    translations.create_index('output_data')
+
+    first = ensure_indexes(mock_db, drop_redundant=True)
+    assert sorted(first['translations']['dropped']) == ['language_1', 'user_id_1']
+    assert 'output_data_1' in translations.index_information()
+
+    second = ensure_indexes(mock_db, drop_redundant=True)
+    assert all(not changes['created'] and not changes['dropped'] for changes in second.values())
+
+
+def _stages(plan):
+    yield plan.get('stage')
+    for child in [plan.get('inputStage')] + plan.get('inputStages', []):
+        if child:
+            yield from _stages(child)
+
+
+def test_model_queries_are_index_served_by_explain(live_db):
+    for entry in record_model_queries(live_db):
+        if not query_shapes(entry['filter'], entry['sort']):
+            continue
+        cursor = live_db.get_collection(entry['collection']).find(entry['filter'])
+        if entry['sort']:
+            cursor = cursor.sort(entry['sort'])
+        stages = set(_stages(cursor.explain()['queryPlanner']['winningPlan']))
+        assert 'COLLSCAN' not in stages and 'SORT' not in stages, (entry, stages)
@@ -0,0 +1,33 @@
+# test_intents.py
+from backend.intents import AhoCorasick, IntentMatcher, intent_matcher
+
+INTENTS = [
+    {'name': 'greeting', 'keywords': {'hi': 1.0, 'hello': 1.0}, 'response': 'Hello!'},
+    {'name': 'errors', 'keywords': {'error*': 1.0, 'not working': 2.0}, 'response': 'Sorry about that.'},
+    {'name': 'account', 'keywords': {'password': 1.0, 'hi': 1.0}, 'response': 'Account help.'},
+]
+
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = AhoCorasick(['he', 'she', 'hers', 'his'])
+    found = sorted(automaton.find('ushers'))
+
+    assert found == [(0, 4), (1, 4), (2, 6)]
+
+
+def test_keywords_match_whole_words_or_prefixes():
+    matcher = IntentMatcher(INTENTS, 'Default.')
+
+    assert matcher.scores('this is fine') == {}
+    assert matcher.scores('Hi, errors everywhere') == {'greeting': 1.0, 'errors': 1.0, 'account': 1.0}
+    assert matcher.scores('hi hi hello') == {'greeting': 2.0, 'account': 1.0}
+    assert matcher.respond('the app is not working') == 'Sorry about that.'
+    assert matcher.respond('hi') == 'Hello!'
+    assert matcher.respond('what is this?') == 'Default.'
+
+
+def test_bundled_intents():
+    assert intent_matcher.match('how do I reset my password').get('name') == 'account'
+    assert intent_matcher.match('hi there')['name'] == 'greeting'
+    assert intent_matcher.match('the camera keeps throwing errors')['name'] == 'troubleshooting'
+    assert intent_matcher.respond('zzz') == intent_matcher.default_response
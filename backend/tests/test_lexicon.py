@@ -0,0 +1,60 @@
+# test_lexicon.py
+from backend.lexicon import Lexicon
+
+FREQUENCIES = {'hello': 50, 'help': 80, 'held': 20, 'helmet': 5, 'he': 300, 'her': 200, 'thank': 40, 'the': 1000}
+
+
+def test_completions_are_ranked_by_frequency():
+    lexicon = Lexicon.build(FREQUENCIES, top_k=3)
+
+    assert lexicon.complete('hel') == ['help', 'hello', 'held']
+    assert lexicon.complete('he', limit=2) == ['he', 'her']
+    assert lexicon.complete('HEL', limit=1) == ['help']
+    assert lexicon.complete('x') == []
+    assert lexicon.frequency('hello') == 50
+
+
+def test_binary_round_trip(tmp_path):
+    path = str(tmp_path / 'lexicon.bin')
+    Lexicon.build(FREQUENCIES, top_k=4).save(path)
+    lexicon = Lexicon.load(path)
+
+    assert len(lexicon) == len(FREQUENCIES)
+    assert lexicon.complete('hel') == ['help', 'hello', 'held', 'helmet']
+    assert lexicon.complete('th') == ['the', 'thank']
+    assert 'helmet' in lexicon
+
+
+def test_short_prefixes_use_the_prefix_table(tmp_path):
+    path = str(tmp_path / 'lexicon.bin')
+    Lexicon.build(FREQUENCIES, top_k=3, prefix_length=2).save(path)
+    lexicon = Lexicon.load(path)
+
+    assert lexicon._lookup_prefix('he') is not None
+    assert lexicon._lookup_prefix('hel') is None
+    assert lexicon._lookup_prefix('zz') == -1
+    assert lexicon.complete('h') == lexicon.complete('he') == ['he', 'her', 'help']
+    assert lexicon.complete('hel') == ['help', 'hello', 'held']
+
+
+def test_corpus_counts_are_normalized_before_merging():
+    from backend.scripts.build_lexicon import count_corpus, merge, tokenize
+
+    assert tokenize("I'm signing, THANK you!") == ["i'm", 'signing', 'thank', 'you']
+    merged = merge([({'hello': 3, 'help': 1}, 1.0), ({'help': 300, 'held': 100}, 1.0)])
+    assert merged['help'] > merged['hello'] > merged['held']
+    assert count_corpus([]) == {}
+
+
+def test_fuzzy_completion_uses_recognizer_confusions():
+    from backend.fingerspelling import EditCosts, fingerspelling_costs
+
+    lexicon = Lexicon.build({**FREQUENCIES, 'name': 60, 'mine': 30, 'hero': 10}, top_k=3)
+
+    assert lexicon.fuzzy_complete('mane', fingerspelling_costs)[0] == 'name'
+    assert lexicon.fuzzy_complete('hellp', fingerspelling_costs)[0] == 'help'
+    assert lexicon.fuzzy_complete('helo', fingerspelling_costs)[0] == 'hello'
+    # With uniform costs swapping M and N is two edits, more than A -> I
+    assert lexicon.fuzzy_complete('mane', EditCosts(), max_cost=2.0)[0] == 'mine'
+    assert lexicon.fuzzy_complete('xyzzy', fingerspelling_costs) == []
+    assert fingerspelling_costs.substitution('m', 'n') < fingerspelling_costs.substitution('m', 'b')
@@ -0,0 +1,132 @@
+# test_llm_gateway.py
+import pytest
+from backend.llm_gateway import (
+    LLMGateway, StubBackend, TokenBucket, LatencyHistogram, FeatureBudgets,
+    LLMResult, LLMBudgetExceeded, LLMRateLimited, LLMUnavailable, RetryableLLMError
+)
+
+
+class FlakyBackend:
+    name = 'flaky'
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def complete(self, messages, max_tokens, temperature):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RetryableLLMError('temporary failure')
+        return LLMResult(text='ok', prompt_tokens=3, completion_tokens=2)
+
+
+def make_gateway(backend, **kwargs):
+    kwargs.setdefault('rate_limiter', TokenBucket(6000))
+    return LLMGateway(backend=backend, retry_base_delay=0, **kwargs)
+
+
+def test_stub_backend_is_deterministic():
+    gateway = make_gateway(StubBackend())
+    text = gateway.complete('chat', [{'role': 'user', 'content': 'hello there'}])
+    assert text == '[stub] hello there'
+    assert gateway.get_metrics()['features']['chat']['counters']['requests'] == 1
+
+
+def test_unconfigured_gateway_raises():
+    gateway = make_gateway(None)
+    assert not gateway.is_enabled()
+    with pytest.raises(LLMUnavailable):
+        gateway.complete('chat', [])
+
+
+def test_retries_transient_errors():
+    backend = FlakyBackend(failures=2)
+    gateway = make_gateway(backend, max_retries=3)
+    assert gateway.complete('feedback', []) == 'ok'
+    assert backend.calls == 3
+    assert gateway.get_metrics()['features']['feedback']['counters']['retries'] == 2
+
+
+def test_gives_up_after_max_retries():
+    gateway = make_gateway(FlakyBackend(failures=5), max_retries=1)
+    with pytest.raises(RetryableLLMError):
+        gateway.complete('feedback', [])
+
+
+def test_feature_budget_blocks_after_limit():
+    gateway = make_gateway(FlakyBackend(failures=0), budgets={'chat': 5})
+    gateway.complete('chat', [])
+    with pytest.raises(LLMBudgetExceeded):
+        gateway.complete('chat', [])
+    # Other features are unaffected
+    assert gateway.complete('streaming', []) == 'ok'
+
+
+def test_token_bucket_times_out_when_empty():
+    bucket = TokenBucket(rate_per_minute=1, capacity=1)
+    bucket.acquire(timeout=0)
+    with pytest.raises(LLMRateLimited):
+        bucket.acquire(timeout=0.01)
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for latency in [10, 20, 30, 400, 9000]:
+        histogram.observe(latency)
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 5
+    assert snapshot['p50_ms'] == 50
+    assert snapshot['p99_ms'] == 10000
+
+
+def test_parse_budgets():
+    assert FeatureBudgets.parse('chat=10, feedback=5') == {'chat': 10, 'feedback': 5}
+
+
+def test_stream_relays_openai_tokens(fake_llm_server):
+    from backend.llm_gateway import OpenAIBackend
+
+    gateway = make_gateway(OpenAIBackend('fake-key', 'fake', base_url=fake_llm_server.base_url))
+    stream = gateway.stream('chat', [{'role': 'user', 'content': 'how do I start?'}])
+
+    assert ''.join(stream) == ''.join(fake_llm_server.tokens)
+    assert fake_llm_server.requests[0]['stream'] is True
+    metrics = gateway.get_metrics()
+    assert metrics['budgets']['chat']['used'] == 10 + len(fake_llm_server.tokens)
+    assert metrics['features']['chat']['first_token_latency']['count'] == 1
+
+
+def test_closing_a_stream_stops_generation(fake_llm_server):
+    from backend.llm_gateway import OpenAIBackend
+
+    fake_llm_server.tokens = ['word '] * 100
+    fake_llm_server.token_delay = 0.02
+    gateway = make_gateway(OpenAIBackend('fake-key', 'fake', base_url=fake_llm_server.base_url), max_concurrency=1)
+    stream = gateway.stream('chat', [{'role': 'user', 'content': 'tell me everything'}])
+    assert [next(stream), next(stream)] == ['word ', 'word ']
+    stream.close()
+
+    assert fake_llm_server.disconnected.wait(5)
+    assert fake_llm_server.tokens_sent[0] < 100
+    assert gateway.get_metrics()['features']['chat']['counters']['cancelled'] == 1
+    # The concurrency slot was released
+    gateway.acquire_timeout = 0.1
+    assert next(gateway.stream('chat', [])) == 'word '
+
+
+def test_redis_bucket_falls_back_to_local_when_redis_is_down():
+    redis = pytest.importorskip('redis')
+    from backend.llm_gateway import RedisTokenBucket
+
+    class DownRedis:
+        def register_script(self, script):
+            def run(keys, args):
+                raise redis.ConnectionError('Connection refused')
+            return run
+
+    bucket = RedisTokenBucket(DownRedis(), rate_per_minute=60, capacity=2)
+    bucket.acquire(timeout=0)
+    bucket.acquire(timeout=0)
+    with pytest.raises(LLMRateLimited):
+        bucket.acquire(timeout=0)
+    assert bucket.degraded and bucket.errors == 3
@@ -0,0 +1,348 @@
+# test_models.py
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+
+def test_feedback_statistics_are_grouped_server_side(mock_db):
+    feedback_model = mock_db.get_model('feedback')
+    user_id = str(ObjectId())
+    for feedback_type, rating in [('bug', 1), ('bug', 2), ('feature', 5), ('general', 5), (None, None)]:
+        feedback_model.create_feedback(user_id, {'type': feedback_type, 'rating': rating})
+
+    stats = feedback_model.get_statistics(use_cache=False)
+    assert stats['total_feedback'] == 5
+    assert stats['average_rating'] == 3.25
+    assert stats['rating_distribution'] == {1: 1, 2: 1, 5: 2}
+    assert stats['type_distribution'] == {'bug': 2, 'feature': 1, 'general': 1}
+
+
+def test_feedback_statistics_are_cached(mock_db):
+    feedback_model = mock_db.get_model('feedback')
+    assert feedback_model.get_statistics()['total_feedback'] == 0
+    feedback_model.create_feedback(str(ObjectId()), {'type': 'bug', 'rating': 3})
+    assert feedback_model.get_statistics()['total_feedback'] == 0
+    assert feedback_model.get_statistics(use_cache=False)['total_feedback'] == 1
+
+
+def test_empty_feedback_statistics(mock_db):
+    stats = mock_db.get_model('feedback').get_statistics(use_cache=False)
+    assert stats == {
+        'total_feedback': 0,
+        'average_rating': 0,
+        'rating_distribution': {},
+        'type_distribution': {}
+    }
+
+
+def test_statistics_engine_maintains_and_reconciles_counters(mock_db):
+    from backend.stats_engine import StatisticsEngine
+    engine = StatisticsEngine(mock_db)
+    users = mock_db.get_model('users')
+    languages = mock_db.get_model('languages')
+    user_id = users.create_user('ana', 'ana@example.com', 'hash')
+    languages.create_language({'code': 'ASL', 'name': 'American Sign Language'})
+
+    engine.record_user('ASL')
+    engine.record_session(user_id, 'ASL')
+    engine.record_translation(user_id, 'ASL', 0.9)
+    engine.record_translation(user_id, 'ASL', 0.7)
+    engine.record_feedback(user_id, 4)
+
+    stats = users.get_statistics(user_id)
+    assert stats['total_translations'] == 2
+    assert stats['total_sessions'] == 1
+    assert stats['average_confidence'] == 0.8
+    assert stats['accuracy_rating'] == 4.0
+
+    # Reconciliation recomputes the counters from the source collections
+    mock_db.get_model('translations').create_translation(str(user_id), {'language': 'ASL', 'confidence': 0.5})
+    engine.reconcile()
+    stats = users.get_statistics(user_id)
+    assert stats['total_translations'] == 1
+    assert stats['total_sessions'] == 0
+    language = mock_db.get_collection('languages').find_one({'code': 'ASL'})
+    assert language['total_users'] == 1
+    assert language['total_translations'] == 1
+
+
+def test_streaming_session_keeps_running_counters(mock_db):
+    sessions = mock_db.get_model('streaming_sessions')
+    user_id = str(ObjectId())
+    sessions.create_session(user_id, {'session_id': 's1'})
+    for confidence in (0.9, 0.8):
+        sessions.record_frame('s1', user_id, {'text': 'Hello', 'confidence': confidence})
+
+    session = sessions.get_session('s1')
+    assert 'translations' not in session
+    assert session['statistics']['total_frames'] == 2
+    assert abs(session['statistics']['confidence_sum'] - 1.7) < 1e-9
+    page = sessions.get_session_translations('s1')
+    assert [t['confidence'] for t in page['translations']] == [0.8, 0.9]
+
+    sessions.end_session('s1', {'average_confidence': 0.85})
+    session = sessions.get_session('s1')
+    assert session['status'] == 'completed'
+    assert session['statistics']['total_frames'] == 2
+
+
+def test_keyset_pagination_walks_history_without_gaps(mock_db):
+    from datetime import datetime
+    translations = mock_db.get_model('translations')
+    user_id = str(ObjectId())
+    created_at = datetime(2024, 1, 1)
+    # Identical timestamps force the _id tie-breaker
+    for i in range(25):
+        mock_db.get_collection('translations').insert_one({
+            'user_id': ObjectId(user_id), 'output_data': str(i), 'created_at': created_at
+        })
+
+    seen, cursor = [], None
+    while True:
+        page = translations.get_user_translations(user_id, cursor, per_page=10, include_total=True)
+        seen.extend(t['output_data'] for t in page['translations'])
+        assert page['total'] == 25
+        if not page['has_more']:
+            break
+        cursor = page['next_cursor']
+
+    assert seen == [str(i) for i in reversed(range(25))]
+
+
+def test_invalid_cursor_is_rejected(mock_db):
+    import pytest
+    # InvalidCursor subclasses ValueError
+    with pytest.raises(ValueError):
+        mock_db.get_model('feedback').get_user_feedback(str(ObjectId()), cursor='not-a-cursor')
+
+
+def test_analytics_events_use_meta_field_and_rollups(mock_db):
+    analytics = mock_db.get_model('analytics')
+    user_id = str(ObjectId())
+    for _ in range(3):
+        analytics.log_event(user_id, {'event_type': 'streaming', 'event_name': 'frame_processed'})
+    analytics.log_event(user_id, {'event_type': 'feedback', 'event_name': 'feedback_submitted'})
+
+    event = analytics.collection.find_one({'meta.event_type': 'feedback'})
+    assert event['meta']['user_id'] == ObjectId(user_id)
+    assert 'user_id' not in event and 'event_type' not in event
+
+    now = datetime.utcnow()
+    rollups = analytics.get_rollups(now - timedelta(minutes=5), now + timedelta(minutes=1), 'streaming')
+    assert sum(r['count'] for r in rollups) == 3
+    assert analytics.flush_rollups() == 0
+
+
+def test_user_lexicon_counts_committed_words(mock_db):
+    from backend.word_suggestions import word_suggestion_service
+
+    translations, user_lexicons = mock_db.get_model('translations'), mock_db.get_model('user_lexicons')
+    user_id = str(ObjectId())
+    for text in ['Hello Marisol', 'Marisol is here', 'hello']:
+        translations.create_translation(user_id, {'output_data': text})
+
+    lexicon = user_lexicons.get_lexicon(user_id)
+    assert lexicon.complete('mar') == [('marisol', 2)]
+    assert mock_db.db['user_words'].find_one({'word': 'hello'})['count'] == 2
+
+    # The cached overlay is updated in place as translations are written
+    translations.create_translation(user_id, {'output_data': 'Marisol'})
+    assert user_lexicons.get_lexicon(user_id) is lexicon
+    assert lexicon.complete('m') == [('marisol', 3)]
+    assert word_suggestion_service.get_suggestions('mar', 3, lexicon)[0] == 'marisol'
+    assert 'marisol' not in word_suggestion_service.get_suggestions('mar', 3)
+
+    user_lexicons.delete_user(user_id)
+    assert user_lexicons.get_lexicon(user_id).complete('m') == []
+
+
+def test_streamed_frames_feed_the_user_lexicon_once_committed(mock_db):
+    sessions, user_lexicons = mock_db.get_model('streaming_sessions'), mock_db.get_model('user_lexicons')
+    user_id = str(ObjectId())
+    sessions.create_session(user_id, {'session_id': 's1'})
+    # A word held for several frames counts once, when the recognized text changes
+    for _ in range(5):
+        sessions.record_frame('s1', user_id, {'text': 'marsol', 'refined_text': 'Marisol'})
+    assert user_lexicons.get_lexicon(user_id).complete('mar') == []
+    sessions.record_frame('s1', user_id, {'text': 'hello'})
+    sessions.record_frame('s1', user_id, {'text': None})
+    sessions.record_frame('s1', user_id, {'text': 'Marisol'})
+    user_lexicons.flush_words()
+    assert mock_db.db['user_words'].find_one({'word': 'marisol'})['count'] == 1
+    assert mock_db.db['user_words'].find_one({'word': 'hello'})['count'] == 1
+
+    # The last frame's text is committed when the session ends
+    assert sessions.end_session('s1', {'duration_seconds': 1})
+    user_lexicons.flush_words()
+    assert mock_db.db['user_words'].find_one({'word': 'marisol'})['count'] == 2
+
+
+def test_failed_word_flush_keeps_the_counts(mock_db, monkeypatch):
+    user_lexicons = mock_db.get_model('user_lexicons')
+    user_id = str(ObjectId())
+    user_lexicons.record_text(user_id, 'hello hello')
+
+    def unreachable(*args, **kwargs):
+        raise ConnectionError('mongo down')
+    monkeypatch.setattr(user_lexicons.collection, 'bulk_write', unreachable)
+    assert user_lexicons.flush_words() == 0
+    user_lexicons.record_text(user_id, 'hello')
+
+    monkeypatch.undo()
+    assert user_lexicons.flush_words() == 1
+    assert mock_db.db['user_words'].find_one({'word': 'hello'})['count'] == 3
+
+
+class _AsyncCollection:
+    """Awaitable wrapper of a mongomock collection, enough for the async write paths"""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+
+class _AsyncDatabase:
+    def __init__(self, mock_db):
+        self._mock_db = mock_db
+        self.models = {}
+
+    def get_collection(self, collection_name, analytics=False, primary=False):
+        return _AsyncCollection(self._mock_db.db[collection_name])
+
+    def get_model(self, model_name):
+        return self.models[model_name]
+
+
+def test_async_writes_count_translations_and_words(mock_db):
+    import asyncio
+    from backend.async_models import (
+        AsyncUserModel, AsyncTranslationModel, AsyncStreamingSessionModel, AsyncLanguageModel, AsyncUserLexiconModel
+    )
+    database = _AsyncDatabase(mock_db)
+    for name, model in [('users', AsyncUserModel), ('translations', AsyncTranslationModel),
+                        ('streaming_sessions', AsyncStreamingSessionModel), ('languages', AsyncLanguageModel),
+                        ('user_lexicons', AsyncUserLexiconModel)]:
+        database.models[name] = model(database)
+    user_id = str(mock_db.get_model('users').create_user('ana', 'ana@example.com', 'hash'))
+
+    async def write():
+        sessions = database.get_model('streaming_sessions')
+        await database.get_model('translations').create_translation(user_id, {'output_data': 'Marisol', 'confidence': 0.5})
+        await sessions.create_session(user_id, {'session_id': 's1'})
+        for _ in range(3):
+            await sessions.record_frame('s1', user_id, {'refined_text': 'Marisol'})
+        await sessions.end_session('s1', {'duration_seconds': 1})
+        await database.get_model('user_lexicons').flush_words()
+    asyncio.run(write())
+
+    assert mock_db.get_model('users').get_statistics(user_id)['total_translations'] == 1
+    assert mock_db.db['user_words'].find_one({'word': 'marisol'})['count'] == 2
+
+
+def test_live_counters_follow_the_reconciliation_rules(mock_db):
+    from backend.stats_engine import StatisticsEngine
+    engine = StatisticsEngine(mock_db)
+    users = mock_db.get_model('users')
+    translations = mock_db.get_model('translations')
+    mock_db.get_model('languages').create_language({'code': 'ASL', 'name': 'American Sign Language'})
+    owner = users.create_user('ana', 'ana@example.com', 'hash', {'preferred_language': 'ASL'})
+    engine.record_user('ASL')
+
+    # Translations are counted as they are inserted
+    translation_id = translations.create_translation(str(owner), {'language': 'ASL', 'confidence': 0.5})
+    assert users.get_statistics(owner)['total_translations'] == 1
+
+    # Only the latest rating of a translation counts, for its owner
+    for rating in (2, 4):
+        previous = translations.update_feedback(str(translation_id), {'accuracy_rating': rating})
+        engine.record_feedback(previous['user_id'], rating, previous['feedback']['accuracy_rating'])
+    assert translations.update_feedback(str(ObjectId()), {'accuracy_rating': 5}) is None
+    stats = users.get_statistics(owner)
+    assert stats['accuracy_rating'] == 4.0
+
+    # Live counters already match the sources, so reconciliation has nothing to correct
+    assert engine.reconcile() == {'users': 0, 'languages': 0}
+    assert users.get_statistics(owner) == stats
+
+
+def test_reconcile_corrects_orphaned_counters_and_skips_moving_ones(mock_db):
+    from backend.stats_engine import StatisticsEngine
+    engine = StatisticsEngine(mock_db)
+    users = mock_db.get_model('users')
+    idle = users.create_user('ana', 'ana@example.com', 'hash')
+    busy = users.create_user('ben', 'ben@example.com', 'hash')
+    # Counters without any source documents
+    engine.record_translation(idle, None, 0.9)
+    engine.record_translation(busy, None, 0.9)
+
+    before = engine._counters('users', '_id', 'statistics.', engine.USER_FIELDS)
+    engine.record_translation(busy, None, 0.8)  # lands while the sources are aggregated
+    after = engine._counters('users', '_id', 'statistics.', engine.USER_FIELDS)
+    corrected = engine._apply_deltas('users', '_id', 'statistics.', engine.USER_FIELDS, before, after, {})
+
+    assert corrected == 1
+    assert users.get_statistics(idle)['total_translations'] == 0
+    assert users.get_statistics(busy)['total_translations'] == 2
+    engine.reconcile()
+    assert users.get_statistics(busy)['total_translations'] == 0
+
+
+def test_reads_written_back_do_not_use_the_analytics_read_preference(mock_db, monkeypatch):
+    from backend.stats_engine import StatisticsEngine
+    get_collection = mock_db.get_collection
+    reads = []
+
+    def recording(collection_name, analytics=False, primary=False):
+        reads.append((collection_name, analytics, primary))
+        return get_collection(collection_name, analytics=analytics, primary=primary)
+    monkeypatch.setattr(mock_db, 'get_collection', recording)
+
+    StatisticsEngine(mock_db).reconcile()
+    now = datetime.utcnow()
+    mock_db.get_model('analytics').rebuild_rollups(now - timedelta(hours=1), now)
+
+    assert reads
+    assert not [read for read in reads if read[1]]
+    assert {name for name, _, primary in reads if primary} >= {'users', 'languages', 'translations', 'analytics'}
+
+
+def test_translations_are_counted_only_once_written(mock_db):
+    from pymongo.errors import AutoReconnect
+    users, translations = mock_db.get_model('users'), mock_db.get_model('translations')
+    user_id = str(users.create_user('ana', 'ana@example.com', 'hash'))
+    writer = translations.writer
+    collection, writer.retry_backoff = writer.collection, 0
+
+    class Unreachable:
+        def with_options(self, **kwargs):
+            return self
+
+        def insert_many(self, documents, ordered=True):
+            raise AutoReconnect('connection reset')
+
+    writer.collection = Unreachable()
+    translations.create_translation(user_id, {'output_data': 'Marisol'}, sync=False)
+    assert users.get_statistics(user_id)['total_translations'] == 0
+    writer.flush()
+    assert users.get_statistics(user_id)['total_translations'] == 0
+
+    writer.collection = collection
+    translations.create_translation(user_id, {'output_data': 'Marisol'}, sync=False)
+    writer.flush()
+    assert users.get_statistics(user_id)['total_translations'] == 1
+    assert mock_db.get_model('user_lexicons').get_lexicon(user_id).complete('mar') == [('marisol', 1)]
+
+
+def test_history_includes_queued_translations(mock_db):
+    translations = mock_db.get_model('translations')
+    user_id = str(ObjectId())
+    translation_id = translations.create_translation(user_id, {'output_data': 'hello'}, sync=False)
+
+    page = translations.get_user_translations(user_id)
+    assert [t['_id'] for t in page['translations']] == [str(translation_id)]
@@ -0,0 +1,37 @@
+from pymongo import monitoring
+
+from backend.monitoring import PoolMetricsListener
+
+ADDRESS = ('db.internal', 27017)
+
+
+def test_pool_listener_tracks_utilization_waits_and_exhaustion(caplog):
+    listener = PoolMetricsListener()
+    listener.pool_created(monitoring.PoolCreatedEvent(ADDRESS, {'maxPoolSize': 2}))
+
+    for connection_id in (1, 2):
+        listener.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, connection_id))
+        listener.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+        listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, connection_id, 0.002))
+
+    # A third request waits for a connection and times out
+    listener.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+    assert listener.snapshot()['db.internal:27017']['waiting'] == 1
+    listener.connection_check_out_failed(monitoring.ConnectionCheckOutFailedEvent(
+        ADDRESS, monitoring.ConnectionCheckOutFailedReason.TIMEOUT, 0.3
+    ))
+    listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+
+    pool = listener.snapshot()['db.internal:27017']
+    assert pool['open_connections'] == 2
+    assert pool['in_use'] == 1
+    assert pool['max_in_use'] == 2
+    assert pool['utilization'] == 0.5
+    assert pool['waiting'] == 0
+    assert pool['max_waiting'] == 1
+    assert pool['checkouts'] == 2
+    assert pool['checkout_failures'] == {'timeout': 1}
+    assert pool['checkout_wait']['count'] == 3
+    assert pool['checkout_wait']['buckets']['le_5'] == 2
+    assert pool['checkout_wait']['buckets']['le_500'] == 1
+    assert 'pool exhausted' in caplog.text
@@ -0,0 +1,33 @@
+# test_ngram.py
+from backend.lexicon import Lexicon
+from backend.ngram import NgramModel, count_ngrams, lexicon_checksum, rank_completions
+
+FREQUENCIES = {'the': 1000, 'you': 600, 'to': 500, 'thank': 40, 'thanks': 30, 'meet': 20, 'me': 300, 'my': 250}
+CORPUS = ['Thank you very much.', 'Nice to meet you.', 'Nice to meet you too.', 'Thank you!', 'Tell me.']
+
+
+def build_model(lexicon):
+    return NgramModel.build(count_ngrams(CORPUS, lexicon), len(lexicon), lexicon_checksum(lexicon))
+
+
+def test_context_reranks_completions():
+    lexicon = Lexicon.build(FREQUENCIES, top_k=5)
+    model = build_model(lexicon)
+
+    assert lexicon.complete('m', 3) == ['me', 'my', 'meet']
+    # "nice" is not in the lexicon, so only "to" is used as context
+    assert rank_completions(lexicon, model, ['nice', 'to'], 'm', 3) == ['meet', 'me', 'my']
+    assert rank_completions(lexicon, model, ['thank'], '', 1) == ['you']
+
+
+def test_binary_round_trip(tmp_path):
+    lexicon = Lexicon.build(FREQUENCIES, top_k=5)
+    path = str(tmp_path / 'ngrams.bin')
+    build_model(lexicon).save(path)
+    model = NgramModel.load(path)
+
+    thank, you = lexicon.word_id('thank'), lexicon.word_id('you')
+    assert model.checksum == lexicon_checksum(lexicon)
+    assert round(model.count([thank, you])) == 2
+    assert model.count([you, thank]) == 0
+    assert model.score([thank], you) > model.score([thank], lexicon.word_id('to'))
@@ -0,0 +1,64 @@
+# test_projections.py
+import bson
+import pytest
+from flask_jwt_extended import create_access_token
+from werkzeug.security import generate_password_hash
+
+
+def _create_user(database, username='alice', role='user'):
+    users_model = database.get_model('users')
+    user_id = users_model.create_user(username, f'{username}@example.com', generate_password_hash('secret'), {
+        'bio': 'x' * 20000
+    })
+    users_model.update_user(user_id, {'role': role})
+    return str(user_id)
+
+
+def test_session_frame_projection(mock_db):
+    streaming_model = mock_db.get_model('streaming_sessions')
+    streaming_model.create_session('64b000000000000000000001', {'session_id': 's1', 'browser': 'firefox'})
+
+    session = streaming_model.get_session('s1', streaming_model.FRAME_FIELDS)
+    assert set(session) == {'_id', 'user_id', 'status', 'language', 'statistics'}
+    assert set(session['statistics']) == {'total_frames'}
+
+
+def test_keyset_page_keeps_cursor_field_in_projection(mock_db):
+    translations_model = mock_db.get_model('translations')
+    for _ in range(3):
+        translations_model.create_translation('64b000000000000000000001', {'output_data': 'Hello'})
+
+    page = translations_model.get_user_translations('64b000000000000000000001', per_page=2,
+                                                    projection={'output_data': 1})
+    assert page['next_cursor']
+    assert set(page['translations'][0]) == {'_id', 'output_data', 'created_at'}
+
+
+@pytest.mark.parametrize('auth_client', ['mock_db'], indirect=True)
+def test_login_and_admin_routes_use_projected_users(auth_client):
+    app, client, database = auth_client
+    _create_user(database)
+    admin_id = _create_user(database, 'admin', role='admin')
+
+    response = client.post('/api/auth/login', json={'email': 'alice@example.com', 'password': 'secret'})
+    assert response.status_code == 200
+    assert set(response.get_json()['user']) == {'id', 'username', 'email', 'role', 'created_at'}
+
+    with app.app_context():
+        token = create_access_token(identity=admin_id)
+    response = client.get('/api/auth/admin/users', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert {u['username'] for u in response.get_json()['users']} == {'alice', 'admin'}
+
+
+@pytest.mark.parametrize('auth_client', ['live_db'], indirect=True)
+def test_login_transfers_only_needed_fields(auth_client, transfer_meter):
+    app, client, database = auth_client
+    _create_user(database)
+
+    with transfer_meter.measure():
+        assert client.post('/api/auth/login', json={'email': 'alice@example.com', 'password': 'secret'}).status_code == 200
+    projected = transfer_meter.bytes_received
+
+    full_document = len(bson.encode(database.get_collection('users').find_one({'email': 'alice@example.com'})))
+    assert projected < full_document / 10
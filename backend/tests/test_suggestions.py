@@ -0,0 +1,94 @@
+# test_suggestions.py
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from backend.cache import RedisCache
+
+
+@pytest.fixture
+def client():
+    from backend.routes.suggestions import suggestions_bp
+
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-for-suggestion-tests'
+    JWTManager(app)
+    app.register_blueprint(suggestions_bp, url_prefix='/api/suggestions')
+    with app.app_context():
+        token = create_access_token(identity='507f1f77bcf86cd799439011')
+    with app.test_client() as client:
+        client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        yield client
+
+
+def test_get_suggestions_are_cacheable(client):
+    response = client.get('/api/suggestions/word?current_word=hel&max_suggestions=3')
+    assert response.status_code == 200
+    assert response.get_json()['suggestions'][0] == 'help'
+    assert 'public' in response.headers['Cache-Control']
+    assert 'max-age' in response.headers['Cache-Control']
+
+    revalidated = client.get('/api/suggestions/word?current_word=hel&max_suggestions=3',
+                             headers={'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+
+    other = client.get('/api/suggestions/word?current_word=tha&max_suggestions=3')
+    assert other.headers['ETag'] != response.headers['ETag']
+
+
+def test_batch_returns_results_in_request_order(client):
+    response = client.post('/api/suggestions/batch', json={
+        'requests': [{'current_word': 'h'}, {'current_word': 'he'}, {'current_word': '', 'context_words': ['thank']}],
+        'max_suggestions': 2
+    })
+    results = response.get_json()['results']
+
+    assert [r['current_word'] for r in results] == ['h', 'he', '']
+    assert all(r['count'] == 2 for r in results)
+    assert results[2]['suggestions'][0] == 'you'
+
+    too_many = client.post('/api/suggestions/batch', json={'requests': [{'current_word': 'a'}] * 51})
+    assert too_many.status_code == 400
+
+
+def test_batch_rejects_malformed_context_and_clamps_max_suggestions(client):
+    for context_words in ['thank', [1, 2], {'thank': 1}]:
+        response = client.post('/api/suggestions/batch', json={
+            'requests': [{'current_word': 'h', 'context_words': context_words}]
+        })
+        assert response.status_code == 400
+
+    response = client.post('/api/suggestions/batch', json={
+        'requests': [{'current_word': 'h', 'max_suggestions': -3}, {'current_word': 'h'}],
+        'max_suggestions': 1000
+    })
+    counts = [r['count'] for r in response.get_json()['results']]
+    assert counts[0] == 1
+    assert 1 < counts[1] <= 10
+
+
+class DictRedis:
+    """Minimal stand-in for a redis client, enough for RedisCache"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_redis_cache_is_shared_between_processes():
+    server = DictRedis()
+    worker_a, worker_b = RedisCache(server, 'test'), RedisCache(server, 'test')
+
+    worker_a.set(('hel', 5), ['help', 'hello'])
+    assert worker_b.get(('hel', 5)) == ['help', 'hello']
+    assert worker_b.get_stats()['shared_hits'] == 1
+    assert worker_b.get_or_set(('tha', 5), lambda: ['thank']) == ['thank']
+    assert worker_a.get(('tha', 5)) == ['thank']
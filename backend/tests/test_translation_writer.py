@@ -0,0 +1,62 @@
+import mongomock
+from pymongo.errors import AutoReconnect
+
+from backend.translation_writer import TranslationWriter
+
+
+class FlakyCollection:
+    """Collection whose first insert_many writes half the batch, then drops the connection"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.calls = 0
+
+    def with_options(self, **kwargs):
+        return self
+
+    def insert_many(self, documents, ordered=True):
+        self.calls += 1
+        if self.calls == 1:
+            self.collection.insert_many(documents[:len(documents) // 2], ordered=ordered)
+            raise AutoReconnect('connection reset')
+        return self.collection.insert_many(documents, ordered=ordered)
+
+
+def test_writer_buffers_until_batch_is_full():
+    collection = mongomock.MongoClient().db.translations
+    writer = TranslationWriter(collection, batch_size=3, flush_interval=60)
+
+    ids = [writer.write({'text': f'word {i}'}) for i in range(2)]
+    assert collection.count_documents({}) == 0
+    assert writer.pending() == 2
+
+    ids.append(writer.write({'text': 'word 2'}))
+    assert writer.pending() == 0
+    assert sorted(d['_id'] for d in collection.find()) == sorted(ids)
+    writer.close()
+
+
+def test_sync_write_flushes_buffer_and_returns_persisted_id():
+    collection = mongomock.MongoClient().db.translations
+    writer = TranslationWriter(collection, batch_size=100, flush_interval=60)
+
+    writer.write({'text': 'queued'})
+    inserted_id = writer.write({'text': 'now'}, sync=True)
+
+    assert collection.find_one({'_id': inserted_id})['text'] == 'now'
+    assert collection.count_documents({}) == 2
+    writer.close()
+
+
+def test_retry_after_partial_write_does_not_duplicate_records():
+    collection = mongomock.MongoClient().db.translations
+    flaky = FlakyCollection(collection)
+    writer = TranslationWriter(flaky, batch_size=4, flush_interval=60, retry_backoff=0)
+
+    for i in range(4):
+        writer.write({'text': f'word {i}'})
+
+    assert flaky.calls == 2
+    assert collection.count_documents({}) == 4
+    assert writer.snapshot() == {'written': 4, 'batches': 1, 'retries': 1, 'failed': 0, 'pending': 0}
+    writer.close()
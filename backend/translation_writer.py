@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Translation Writer for GestureBridge AI
+Buffers translation records per worker process and persists them with
+unordered insert_many batches, flushed when the batch is full or the flush
+interval elapses. Records get client-side ObjectIds so callers know the ID
+before the batch is written; sync writes flush immediately for endpoints
+that must return a persisted ID.
+"""
+
+import atexit
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import WriteConcern
+from pymongo.errors import BulkWriteError, PyMongoError
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+def parse_write_concern(w, journal=False) -> WriteConcern:
+    """WriteConcern from a config value such as '1', '0' or 'majority'"""
+    w = int(w) if str(w).isdigit() else w
+    return WriteConcern(w=w, j=journal or None)
+
+
+class TranslationWriteError(Exception):
+    """Raised by a sync write whose record could not be persisted"""
+
+
+class TranslationWriter:
+    """Batched, unordered writer for one collection
+
+    on_written, if given, is called with the records of each batch that were
+    persisted, from the thread that wrote them.
+    """
+
+    def __init__(self, collection, batch_size: int = 100, flush_interval: float = 1.0,
+                 write_concern: Optional[WriteConcern] = None, max_retries: int = 3,
+                 retry_backoff: float = 0.1, on_written: Optional[Callable[[List[Dict]], None]] = None):
+        self.collection = collection
+        self.on_written = on_written
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_concern = write_concern
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'written': 0, 'batches': 0, 'retries': 0, 'failed': 0}
+
+    def write(self, document: Dict, sync: bool = False, write_concern: Optional[WriteConcern] = None) -> ObjectId:
+        """Queue a record and return its _id
+
+        With sync=True the record, together with anything already buffered,
+        is written before returning (using write_concern if given) and
+        TranslationWriteError is raised if it could not be persisted.
+        """
+        document.setdefault('_id', ObjectId())
+        if sync:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            failed = self._write_batch(batch + [document], write_concern)
+            if any(doc['_id'] == document['_id'] for doc in failed):
+                raise TranslationWriteError(f"Failed to persist record {document['_id']}")
+            return document['_id']
+
+        with self._lock:
+            self._buffer.append(document)
+            full = len(self._buffer) >= self.batch_size
+        self._ensure_thread()
+        if full:
+            self.flush()
+        return document['_id']
+
+    def flush(self) -> int:
+        """Write everything buffered so far, returns the number of records attempted"""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._write_batch(batch)
+        return len(batch)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {**self.stats, 'pending': len(self._buffer)}
+
+    def close(self) -> None:
+        """Stop the flush thread and write what is left"""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(self.flush_interval + 1)
+        self.flush()
+
+    def _write_batch(self, batch: List[Dict], write_concern: Optional[WriteConcern] = None) -> List[Dict]:
+        """insert_many(ordered=False) with retries, returns the records that failed"""
+        collection = self.collection
+        write_concern = write_concern or self.write_concern
+        if write_concern is not None:
+            collection = collection.with_options(write_concern=write_concern)
+
+        pending = batch
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                with self._lock:
+                    self.stats['retries'] += 1
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            try:
+                collection.insert_many(pending, ordered=False)
+                pending = []
+            except BulkWriteError as e:
+                # Duplicate keys mean an earlier attempt already inserted the record
+                failed = {
+                    error['index'] for error in e.details.get('writeErrors', [])
+                    if error.get('code') != DUPLICATE_KEY
+                }
+                pending = [doc for i, doc in enumerate(pending) if i in failed]
+                if pending:
+                    logger.warning(f"{len(pending)} translation records rejected: {e.details['writeErrors'][0].get('errmsg')}")
+            except PyMongoError as e:
+                logger.warning(f"Translation batch write failed (attempt {attempt + 1}): {str(e)}")
+            if not pending:
+                break
+
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['written'] += len(batch) - len(pending)
+            self.stats['failed'] += len(pending)
+        if pending:
+            logger.error(f"Dropped {len(pending)} translation records after {self.max_retries} retries")
+        if self.on_written:
+            failed_ids = {doc['_id'] for doc in pending}
+            written = [doc for doc in batch if doc['_id'] not in failed_ids]
+            try:
+                if written:
+                    self.on_written(written)
+            except Exception as e:
+                logger.error(f"Translation on_written callback failed: {str(e)}")
+        return pending
+
+    def _ensure_thread(self) -> None:
+        # Started lazily so each worker process flushes its own buffer
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='translation-writer', daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Translation writer flush failed: {str(e)}")
+
+
+def create_translation_writer(collection, on_written=None) -> TranslationWriter:
+    """TranslationWriter configured from Config"""
+    return TranslationWriter(
+        collection,
+        on_written=on_written,
+        batch_size=Config.TRANSLATION_BATCH_SIZE,
+        flush_interval=Config.TRANSLATION_FLUSH_INTERVAL,
+        write_concern=parse_write_concern(Config.TRANSLATION_WRITE_CONCERN, Config.TRANSLATION_WRITE_JOURNAL),
+        max_retries=Config.TRANSLATION_WRITE_RETRIES
+    )
@@ -4,10 +4,24 @@ Word Suggestion Service for GestureBridge AI
 Provides intelligent word predictions based on letter sequences
 """
 
-import enchant
 from typing import List, Dict, Optional
-import json
 import os
+import sys
+import threading
+
+try:
+    import enchant
+except ImportError:
+    enchant = None
+
+# Fix import error by adding backend directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from cache import create_shared_cache
+from config import Config
+from fingerspelling import fingerspelling_costs
+from lexicon import load_lexicon, tokenize
+from ngram import load_ngram_model, rank_completions
 
 class WordSuggestionService:
     def __init__(self):
@@ -16,105 +30,107 @@ class WordSuggestionService:
             self.dictionary = enchant.Dict("en-US")
             print("✅ Word suggestion service initialized with English dictionary")
         except:
-            print("⚠️  Enchant dictionary not available, using fallback")
+            print("⚠️  Enchant dictionary not available, using the lexicon only")
             self.dictionary = None
 
-        # Load common words for fallback
-        self.common_words = self._load_common_words()
-
-        # Word frequency data for better suggestions
-        self.word_frequencies = self._load_word_frequencies()
-
-    def _load_common_words(self) -> List[str]:
-        """Load common English words for fallback suggestions"""
-        common_words = [
-            "the", "and", "for", "are", "but", "not", "you", "all", "can", "had", "her", "was", "one", "our", "out", "day", "get", "has", "him", "his", "how", "its", "may", "new", "now", "old", "see", "two", "way", "who", "boy", "did", "has", "let", "put", "say", "she", "too", "use",
-            "hello", "thank", "please", "sorry", "yes", "no", "good", "bad", "well", "very", "much", "many", "some", "what", "when", "where", "why", "how", "which", "who", "that", "this", "here", "there",
-            "time", "year", "work", "home", "life", "love", "help", "need", "want", "make", "take", "come", "give", "find", "tell", "ask", "work", "seem", "feel", "try", "call", "keep", "begin", "start",
-            "school", "class", "student", "teacher", "learn", "study", "read", "write", "book", "paper", "test", "grade", "friend", "family", "parent", "child", "brother", "sister", "mother", "father"
-        ]
-        return common_words
-
-    def _load_word_frequencies(self) -> Dict[str, int]:
-        """Load word frequency data for ranking suggestions"""
-        # Simple frequency mapping for common words
-        frequencies = {
-            "the": 100, "and": 95, "for": 90, "are": 85, "but": 80, "not": 75, "you": 70, "all": 65, "can": 60, "had": 55,
-            "hello": 50, "thank": 45, "please": 40, "yes": 35, "no": 30, "good": 25, "what": 20, "how": 15, "when": 10
-        }
-        return frequencies
-
-    def get_suggestions(self, current_word: str, max_suggestions: int = 5) -> List[str]:
+        # Frequency-ranked prefix index, memory-mapped on first use
+        self._lexicon = None
+        self._lexicon_lock = threading.Lock()
+        # Recent suggestions by word and context, shared across workers when Redis is configured
+        self._suggestion_cache = create_shared_cache(
+            'suggestions', Config.SUGGESTION_CACHE_SIZE, Config.SUGGESTION_CACHE_TTL
+        )
+
+        # Bigram/trigram counts for reranking by context, also mapped lazily
+        self._ngrams = None
+
+    @property
+    def lexicon(self):
+        if self._lexicon is None:
+            with self._lexicon_lock:
+                if self._lexicon is None:
+                    self._lexicon = load_lexicon()
+        return self._lexicon
+
+    @property
+    def ngrams(self):
+        if self._ngrams is None:
+            lexicon = self.lexicon
+            with self._lexicon_lock:
+                if self._ngrams is None:
+                    self._ngrams = load_ngram_model(lexicon)
+        return self._ngrams
+
+    def get_suggestions(self, current_word: str, max_suggestions: int = 5, user_lexicon=None) -> List[str]:
         """
         Get word suggestions based on current word input
 
         Args:
             current_word: The current word being typed (can be partial)
             max_suggestions: Maximum number of suggestions to return
+            user_lexicon: The user's UserLexicon, whose frequent words come first
 
         Returns:
-            List of suggested words
+            List of suggested words, completions of the input first (by
+            frequency), then words within a few likely recognizer confusions,
+            then spelling corrections
         """
         if not current_word or current_word.strip() == "":
             return []
 
         current_word = current_word.lower().strip()
+        suggestions = self._suggestion_cache.get_or_set(
+            (current_word, max_suggestions), lambda: self._compute_suggestions(current_word, max_suggestions)
+        )
+        return self._personalize(suggestions, current_word, user_lexicon, max_suggestions)
+
+    def _personalize(self, suggestions: List[str], prefix: str, user_lexicon, max_suggestions: int) -> List[str]:
+        """The user's frequently committed completions of prefix first, then the global ranking"""
+        if user_lexicon is None:
+            return list(suggestions)
+        personal = [word for word, count in user_lexicon.complete(prefix, max_suggestions)
+                    if count >= Config.USER_LEXICON_MIN_COUNT]
+        return (personal + [word for word in suggestions if word not in personal])[:max_suggestions]
+
+    def _compute_suggestions(self, current_word: str, max_suggestions: int) -> List[str]:
+        suggestions = self.lexicon.complete(current_word, max_suggestions)
+
+        # Recover words whose letters were misrecognized, e.g. "mane" -> "name"
+        if len(suggestions) < max_suggestions:
+            for suggestion in self.lexicon.fuzzy_complete(
+                current_word, fingerspelling_costs, Config.SUGGESTION_MAX_EDIT_COST, max_suggestions
+            ):
+                if suggestion not in suggestions:
+                    suggestions.append(suggestion)
+                    if len(suggestions) >= max_suggestions:
+                        break
 
-        suggestions = []
-
-        # Try enchant dictionary first
-        if self.dictionary:
+        # Fall back to spelling corrections when the prefix has few completions
+        if len(suggestions) < max_suggestions and self.dictionary:
             try:
-                # Get suggestions from enchant
-                enchant_suggestions = self.dictionary.suggest(current_word)
-
-                # Filter and rank suggestions
-                filtered_suggestions = []
-                for suggestion in enchant_suggestions[:max_suggestions * 2]:  # Get more for filtering
-                    if suggestion.lower().startswith(current_word):
-                        filtered_suggestions.append(suggestion)
-
-                # If we have enough prefix matches, use them
-                if len(filtered_suggestions) >= max_suggestions:
-                    suggestions = filtered_suggestions[:max_suggestions]
-                else:
-                    # Combine prefix matches with other suggestions
-                    suggestions = filtered_suggestions
-                    for suggestion in enchant_suggestions:
-                        if suggestion.lower() not in [s.lower() for s in suggestions]:
-                            suggestions.append(suggestion)
-                            if len(suggestions) >= max_suggestions:
-                                break
-
+                seen = set(suggestions)
+                for suggestion in self.dictionary.suggest(current_word):
+                    if suggestion.lower() not in seen:
+                        seen.add(suggestion.lower())
+                        suggestions.append(suggestion)
+                        if len(suggestions) >= max_suggestions:
+                            break
             except Exception as e:
                 print(f"Enchant suggestion error: {e}")
 
-        # Fallback to common words if enchant fails or no suggestions
-        if len(suggestions) < max_suggestions:
-            fallback_suggestions = []
-            for word in self.common_words:
-                if word.startswith(current_word) and word not in [s.lower() for s in suggestions]:
-                    fallback_suggestions.append(word)
-                    if len(fallback_suggestions) >= (max_suggestions - len(suggestions)):
-                        break
-
-            suggestions.extend(fallback_suggestions)
-
-        # Limit to max_suggestions
-        suggestions = suggestions[:max_suggestions]
-
-        # Sort by frequency if available
-        suggestions.sort(key=lambda x: self.word_frequencies.get(x.lower(), 0), reverse=True)
-
         return suggestions
 
-    def get_predictions_from_letters(self, letter_sequence: str, max_predictions: int = 5) -> List[str]:
+    def get_cache_stats(self) -> Dict:
+        return self._suggestion_cache.get_stats()
+
+    def get_predictions_from_letters(self, letter_sequence: str, max_predictions: int = 5, user_lexicon=None) -> List[str]:
         """
         Get word predictions based on a sequence of letters
 
         Args:
             letter_sequence: String of letters (e.g., "hel" for predicting "hello")
             max_predictions: Maximum number of predictions to return
+            user_lexicon: The user's UserLexicon, whose frequent words come first
 
         Returns:
             List of predicted words
@@ -123,54 +139,58 @@ class WordSuggestionService:
             return []
 
         letter_sequence = letter_sequence.lower().strip()
+        predictions = self.lexicon.complete(letter_sequence, max_predictions)
+        return self._personalize(predictions, letter_sequence, user_lexicon, max_predictions)
 
-        # Get suggestions based on the letter sequence
-        suggestions = self.get_suggestions(letter_sequence, max_predictions * 2)
-
-        # Filter to only include words that start with the exact sequence
-        predictions = []
-        for suggestion in suggestions:
-            if suggestion.lower().startswith(letter_sequence):
-                predictions.append(suggestion)
-                if len(predictions) >= max_predictions:
-                    break
-
-        # If we don't have enough predictions, try partial matching
-        if len(predictions) < max_predictions:
-            for word in self.common_words:
-                if word.startswith(letter_sequence) and word not in [p.lower() for p in predictions]:
-                    predictions.append(word)
-                    if len(predictions) >= max_predictions:
-                        break
-
-        return predictions[:max_predictions]
-
-    def get_context_aware_suggestions(self, current_word: str, context_words: List[str] = None, max_suggestions: int = 5) -> List[str]:
+    def get_context_aware_suggestions(self, current_word: str, context_words: List[str] = None, max_suggestions: int = 5,
+                                      user_lexicon=None) -> List[str]:
         """
         Get context-aware word suggestions
 
+        Completions of the current word are reranked by a bigram/trigram
+        model of the previous words, so an empty current word predicts the
+        next word.
+
         Args:
             current_word: Current word being typed
             context_words: Previous words for context
             max_suggestions: Maximum suggestions to return
+            user_lexicon: The user's UserLexicon, whose frequent words come first
 
         Returns:
             List of context-aware suggestions
         """
-        # For now, just return regular suggestions
-        # This could be enhanced with NLP models for better context awareness
-        return self.get_suggestions(current_word, max_suggestions)
+        current_word = (current_word or "").lower().strip()
+        # Only the words the model can use are part of the cache key
+        context = tuple(tokenize(' '.join(context_words or []))[-(self.ngrams.order - 1):])
+        suggestions = self._suggestion_cache.get_or_set(
+            ('context', current_word, context, max_suggestions),
+            lambda: self._compute_context_suggestions(current_word, context, max_suggestions)
+        )
+        return self._personalize(suggestions, current_word, user_lexicon, max_suggestions)
+
+    def _compute_context_suggestions(self, current_word: str, context_words, max_suggestions: int) -> List[str]:
+        suggestions = rank_completions(self.lexicon, self.ngrams, context_words, current_word, max_suggestions)
+
+        # No completions of the prefix, fall back to corrections
+        if len(suggestions) < max_suggestions and current_word:
+            for suggestion in self.get_suggestions(current_word, max_suggestions):
+                if suggestion not in suggestions:
+                    suggestions.append(suggestion)
+                    if len(suggestions) >= max_suggestions:
+                        break
+        return suggestions
 
 # Global instance
 word_suggestion_service = WordSuggestionService()
 
-def get_word_suggestions(current_word: str, max_suggestions: int = 5) -> List[str]:
+def get_word_suggestions(current_word: str, max_suggestions: int = 5, user_lexicon=None) -> List[str]:
     """Convenience function to get word suggestions"""
-    return word_suggestion_service.get_suggestions(current_word, max_suggestions)
+    return word_suggestion_service.get_suggestions(current_word, max_suggestions, user_lexicon)
 
-def get_predictions_from_letters(letter_sequence: str, max_predictions: int = 5) -> List[str]:
+def get_predictions_from_letters(letter_sequence: str, max_predictions: int = 5, user_lexicon=None) -> List[str]:
     """Convenience function to get predictions from letter sequence"""
-    return word_suggestion_service.get_predictions_from_letters(letter_sequence, max_predictions)
+    return word_suggestion_service.get_predictions_from_letters(letter_sequence, max_predictions, user_lexicon)
 
 if __name__ == "__main__":
     # Test the service